@@ -0,0 +1,338 @@
+"""データベース性能計測スクリプト
+
+一時ディレクトリにダミーデータを投入したデータベースを作成し、
+主要なクエリの実行計画や処理時間を計測する。
+
+使い方:
+    python benchmark.py plans [--projects 20000]
+    python benchmark.py search [--projects 20000]
+    python benchmark.py connection [--projects 20000]
+    python benchmark.py chart [--projects 20000]
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+
+from models import Database
+
+
+# 計測対象となる主要クエリ（名前, SQL, パラメータ）
+HOT_QUERIES = [
+    ("案件: 取引先で絞り込み",
+     "SELECT * FROM projects p WHERE p.client_id = ?", (3,)),
+    ("案件: サービスで絞り込み",
+     "SELECT * FROM projects p WHERE p.service_id = ?", (2,)),
+    ("案件: 状態と完了日で絞り込み",
+     "SELECT * FROM projects p WHERE p.status = ? AND p.completion_date >= ? AND p.completion_date <= ?",
+     ("完了", "2025-04-01", "2025-04-30")),
+    ("作業員: 担当案件の検索",
+     "SELECT project_id FROM project_workers WHERE worker_id = ?", (5,)),
+    ("写真: 案件の写真一覧",
+     "SELECT * FROM project_photos WHERE project_id = ? ORDER BY created_at", (10,)),
+    ("業務指示書: 次の番号",
+     "SELECT MAX(order_number) FROM work_orders WHERE order_number >= ? AND order_number < ?",
+     ("202505-", "202505.")),
+]
+
+# 接続プロファイル導入前の SQLite 既定設定
+LEGACY_CONNECTION_PROFILE = {
+    'journal_mode': 'DELETE',
+    'synchronous': 'FULL',
+    'mmap_size': 0,
+    'cache_size': -2000,
+    'temp_store': 'DEFAULT',
+    'foreign_keys': False,
+}
+
+# v1 の移行で作成されるインデックス
+V1_INDEXES = [
+    "idx_projects_client_id",
+    "idx_projects_service_id",
+    "idx_projects_status_completion",
+    "idx_project_workers_worker_id",
+    "idx_project_photos_project_created",
+    "idx_work_orders_order_number",
+]
+
+
+def seed_database(db, project_count):
+    """ダミーデータを投入する"""
+    random.seed(0)
+    statuses = ["作業前", "作業中", "完了", "キャンセル"]
+
+    db.cursor.executemany(
+        "INSERT INTO clients (name) VALUES (?)",
+        [(f"取引先{i}",) for i in range(1, 51)]
+    )
+    db.cursor.executemany(
+        "INSERT INTO services (name) VALUES (?)",
+        [(f"サービス{i}",) for i in range(1, 11)]
+    )
+    db.cursor.executemany(
+        "INSERT INTO workers (name) VALUES (?)",
+        [(f"作業員{i}",) for i in range(1, 31)]
+    )
+
+    projects = []
+    for i in range(1, project_count + 1):
+        year = random.choice([2024, 2025, 2026])
+        month = random.randint(1, 12)
+        day = random.randint(1, 28)
+        date = f"{year}-{month:02d}-{day:02d}"
+        projects.append((
+            random.randint(1, 50), random.randint(1, 10), f"案件{i}",
+            f"現場住所{i}", random.randint(1, 100) * 10000,
+            random.choice(statuses), date, date, date,
+            1 if random.random() < 0.05 else 0,
+            f"{date} 09:00:00"
+        ))
+    db.cursor.executemany(
+        """INSERT INTO projects (client_id, service_id, title, site_address, price,
+                                 status, start_date, end_date, completion_date,
+                                 has_trouble, created_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        projects
+    )
+
+    project_workers = set()
+    for project_id in range(1, project_count + 1):
+        for _ in range(random.randint(1, 3)):
+            project_workers.add((project_id, random.randint(1, 30)))
+    db.cursor.executemany(
+        "INSERT INTO project_workers (project_id, worker_id) VALUES (?, ?)",
+        sorted(project_workers)
+    )
+
+    db.cursor.executemany(
+        "INSERT INTO project_photos (project_id, photo_path) VALUES (?, ?)",
+        [(random.randint(1, project_count), f"photo_{i}.jpg") for i in range(project_count)]
+    )
+    db.cursor.executemany(
+        "INSERT INTO work_orders (order_number, site_name) VALUES (?, ?)",
+        [(f"2025{(i % 12) + 1:02d}-{i:04d}", f"現場{i}") for i in range(1, min(project_count, 9999) + 1)]
+    )
+    db.conn.commit()
+    db.cursor.execute("ANALYZE")
+
+
+def create_benchmark_database(directory, project_count, file_name="benchmark.db", profile=None):
+    """計測用データベースを作成する"""
+    db = Database(os.path.join(directory, file_name), profile=profile)
+    seed_database(db, project_count)
+    return db
+
+
+def time_query(db, query, values, repeat=20):
+    """クエリの平均実行時間（ミリ秒）を計測する"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        db.cursor.execute(query, values).fetchall()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def print_query_plans(db):
+    """主要クエリの実行計画と実行時間を表示する"""
+    for name, query, values in HOT_QUERIES:
+        plan = db.cursor.execute(f"EXPLAIN QUERY PLAN {query}", values).fetchall()
+        elapsed = time_query(db, query, values)
+        print(f"  {name} ({elapsed:.2f} ms)")
+        for row in plan:
+            print(f"      {row[3]}")
+
+
+def benchmark_plans(directory, project_count):
+    """インデックス移行前後の実行計画を比較する"""
+    db = create_benchmark_database(directory, project_count)
+
+    # 移行前の状態を再現する
+    for index_name in V1_INDEXES:
+        db.cursor.execute(f"DROP INDEX IF EXISTS {index_name}")
+    db.cursor.execute("PRAGMA user_version = 0")
+    db.conn.commit()
+
+    print(f"=== 移行前 (案件 {project_count} 件) ===")
+    print_query_plans(db)
+
+    db.apply_migrations()
+    db.cursor.execute("ANALYZE")
+
+    print(f"=== 移行後 (スキーマ v{db.get_schema_version()}) ===")
+    print_query_plans(db)
+
+    db.close()
+
+
+def benchmark_search(directory, project_count):
+    """LIKE による部分一致検索と全文検索インデックスの処理時間を比較する"""
+    db = create_benchmark_database(directory, project_count)
+    print(f"=== 案件検索 (案件 {project_count} 件, 全文検索インデックス: "
+          f"{'あり' if db.has_search_index('projects') else 'なし'}) ===")
+
+    for text in ["案件123", "現場住所99", "存在しない文字列"]:
+        like_query = ("SELECT id FROM projects p WHERE "
+                      "p.title LIKE ? OR p.description LIKE ? OR p.site_address LIKE ?")
+        like_elapsed = time_query(db, like_query, (f"%{text}%",) * 3)
+
+        condition, values = db.search_condition('projects', text, alias='p')
+        search_elapsed = time_query(db, f"SELECT id FROM projects p WHERE {condition}", values)
+
+        print(f"  「{text}」 LIKE: {like_elapsed:.2f} ms / 検索インデックス: {search_elapsed:.2f} ms")
+
+    db.close()
+
+
+def measure_commit_latency(db, count=200):
+    """1件ずつ登録してコミットした時の平均時間（ミリ秒）を計測する"""
+    start = time.perf_counter()
+    for i in range(count):
+        db.cursor.execute("INSERT INTO clients (name) VALUES (?)", (f"計測用取引先{i}",))
+        db.conn.commit()
+    return (time.perf_counter() - start) / count * 1000
+
+
+def measure_read_concurrency(db_path, profile, duration=2.0, reader_count=2):
+    """書き込みを続けている間に、別の接続から読み込める回数を計測する
+
+    Returns:
+        (1秒あたりの読み込み回数, 1秒あたりのコミット回数, 読み込み失敗回数)
+    """
+    stop = threading.Event()
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def writer():
+        db = Database(db_path, init_schema=False, profile=profile)
+        while not stop.is_set():
+            db.cursor.executemany(
+                "UPDATE projects SET price = price + 1 WHERE id = ?",
+                [(random.randint(1, 1000),) for _ in range(50)]
+            )
+            db.conn.commit()
+            with lock:
+                counts["writes"] += 1
+        db.close()
+
+    def reader():
+        db = Database(db_path, init_schema=False, profile=profile)
+        db.conn.execute("PRAGMA busy_timeout = 0")
+        while not stop.is_set():
+            try:
+                db.cursor.execute(
+                    "SELECT COUNT(*), SUM(price) FROM projects WHERE client_id = ?",
+                    (random.randint(1, 50),)
+                ).fetchone()
+                with lock:
+                    counts["reads"] += 1
+            except Exception:
+                # ロック待ちで読み込めなかった
+                with lock:
+                    counts["errors"] += 1
+        db.close()
+
+    threads = [threading.Thread(target=writer)]
+    threads += [threading.Thread(target=reader) for _ in range(reader_count)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return counts["reads"] / duration, counts["writes"] / duration, counts["errors"]
+
+
+def benchmark_connection(directory, project_count):
+    """接続プロファイル導入前後のコミット時間と読み込みの同時実行性を比較する"""
+    profiles = [
+        ("導入前 (rollback journal, synchronous=FULL)", "legacy.db", LEGACY_CONNECTION_PROFILE),
+        ("導入後 (既定の接続プロファイル)", "tuned.db", None),
+    ]
+
+    for label, file_name, profile in profiles:
+        db = create_benchmark_database(directory, project_count, file_name, profile)
+        print(f"=== {label} ===")
+        db.check_connection_settings()
+
+        latency = measure_commit_latency(db)
+        print(f"  1件登録 + コミット: {latency:.2f} ms")
+
+        reads, writes, errors = measure_read_concurrency(db.db_path, profile)
+        print(f"  書き込み中の読み込み: {reads:.0f} 回/秒 (コミット {writes:.0f} 回/秒, ロックで失敗 {errors} 回)")
+        db.close()
+
+
+def load_yearly_comparison_legacy(db, current_year, compare_year):
+    """年度比較グラフのデータを従来の方法（目標13回 + 売上2回の問い合わせ）で取得する"""
+    # キャッシュを通さずに元のメソッドを呼び出す
+    get_sales_target = Database.get_sales_target.__wrapped__
+    yearly_target = get_sales_target(db, current_year, 0)
+    monthly_targets = [get_sales_target(db, current_year, month) for month in range(1, 13)]
+    sales = []
+    for year in (current_year, compare_year):
+        sales.append(db.execute_query(
+            "SELECT month, SUM(total_price) as total_amount FROM monthly_sales_rollup "
+            "WHERE year = ? GROUP BY month ORDER BY month", (year,)))
+    return yearly_target, monthly_targets, sales
+
+
+def benchmark_chart(directory, project_count):
+    """案件数を増やしながら年度比較グラフのデータ取得時間を計測する"""
+    current_year, compare_year = 2025, 2024
+    get_yearly_comparison = Database.get_yearly_comparison.__wrapped__
+    repeat = 50
+
+    print(f"=== 年度比較グラフの更新 ({current_year}年度 / {compare_year}年度) ===")
+    for count in sorted({max(project_count // 20, 1), max(project_count // 4, 1), project_count}):
+        db = create_benchmark_database(directory, count, f"chart_{count}.db")
+        db.set_sales_targets(current_year, {month: 1000000.0 * (month or 12) for month in range(13)})
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            load_yearly_comparison_legacy(db, current_year, compare_year)
+        legacy = (time.perf_counter() - start) / repeat * 1000
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            get_yearly_comparison(db, current_year, compare_year)
+        single = (time.perf_counter() - start) / repeat * 1000
+
+        # 2回目以降の表示（キャッシュから取得）
+        Database.clear_query_cache()
+        db.get_yearly_comparison(current_year, compare_year)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            db.get_yearly_comparison(current_year, compare_year)
+        cached = (time.perf_counter() - start) / repeat * 1000
+
+        print(f"  案件 {count:>6} 件: 従来 (15回) {legacy:.3f} ms / 1回の問い合わせ {single:.3f} ms / "
+              f"キャッシュ {cached:.3f} ms")
+        db.close()
+
+
+BENCHMARKS = {
+    "plans": benchmark_plans,
+    "search": benchmark_search,
+    "connection": benchmark_connection,
+    "chart": benchmark_chart,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="データベース性能計測")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS.keys()))
+    parser.add_argument("--projects", type=int, default=20000, help="投入する案件数")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        BENCHMARKS[args.benchmark](directory, args.projects)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+from collections import OrderedDict
+
+import matplotlib
+import matplotlib.style
+matplotlib.use('QtAgg')
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
+from matplotlib.figure import Figure
+import mplcursors  # ホバー表示用モジュール
+
+from PyQt6.QtWidgets import QStackedWidget, QLabel, QSizePolicy
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QImage, QPixmap
+
+# グラフの背景色
+FIGURE_FACE_COLOR = '#F5F5F7'
+
+# 画像として描画する時の基準DPI（画面の拡大率を掛けて使う）
+FIGURE_DPI = 100
+
+# 描画済み画像のキャッシュに保持する最大件数
+CHART_IMAGE_CACHE_SIZE = 32
+
+# ウィジェットの大きさが決まる前に描画する時の大きさ（ピクセル）
+DEFAULT_RENDER_SIZE = (800, 500)
+
+# グラフスタイルを設定（Figure の作成前に1度だけ行う）
+matplotlib.style.use('ggplot')
+
+# フォントの設定
+matplotlib.rcParams['font.family'] = 'sans-serif'
+matplotlib.rcParams['font.sans-serif'] = ['Meiryo', 'Yu Gothic', 'Noto Sans CJK JP']
+
+class MatplotlibCanvas(FigureCanvasQTAgg):
+    """MatplotlibをQtに統合するためのキャンバスクラス"""
+    def __init__(self, figure=None, parent=None, dpi=FIGURE_DPI):
+        if figure is None:
+            self.figure = Figure(figsize=(5, 4), dpi=dpi)
+            self.figure.patch.set_facecolor(FIGURE_FACE_COLOR)  # 背景色
+        else:
+            self.figure = figure
+
+        super().__init__(self.figure)
+        self.setParent(parent)
+
+
+def render_chart_image(build, size, device_pixel_ratio=1.0):
+    """グラフを Agg バックエンドで描画して QImage にする（ワーカースレッドから呼び出せる）
+
+    Args:
+        build: Figure を受け取ってグラフを作成する関数
+        size: 画像の大きさ（論理ピクセルの (幅, 高さ)）
+        device_pixel_ratio: 画面の拡大率
+
+    Returns:
+        描画した QImage
+
+    Figure とキャンバスは呼び出しごとに作成し、スレッド間で共有しないため、
+    GUI スレッドの描画とは排他制御せずに並行して描画できる。
+    """
+    width, height = size
+    dpi = FIGURE_DPI * device_pixel_ratio
+
+    figure = Figure(figsize=(width / FIGURE_DPI, height / FIGURE_DPI), dpi=dpi)
+    figure.patch.set_facecolor(FIGURE_FACE_COLOR)
+    canvas = FigureCanvasAgg(figure)
+    build(figure)
+    figure.tight_layout()
+    canvas.draw()
+
+    buffer = canvas.buffer_rgba()
+    image = QImage(bytes(buffer), buffer.shape[1], buffer.shape[0],
+                   QImage.Format.Format_RGBA8888).copy()
+
+    image.setDevicePixelRatio(device_pixel_ratio)
+    return image
+
+
+class ChartImageCache:
+    """描画済みのグラフ画像を保持する LRU キャッシュ
+
+    キーは (グラフの種類, 年度, データの更新世代, 大きさ) などの組で、
+    値は (画像, ホバー表示用のデータ) の組。
+    """
+
+    def __init__(self, max_size=CHART_IMAGE_CACHE_SIZE):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """キャッシュから取得する（無い場合は None）"""
+        item = self._items.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return item
+
+    def put(self, key, image, data):
+        """キャッシュに保存する"""
+        self._items[key] = (image, data)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def clear(self):
+        """キャッシュを空にする"""
+        self._items.clear()
+
+
+# 統計タブの全てのグラフで共有する画像キャッシュ
+chart_image_cache = ChartImageCache()
+
+
+class ChartView(QStackedWidget):
+    """描画済みのグラフ画像を表示するウィジェット
+
+    通常はワーカースレッドで描画した画像を表示し、ホバー表示のあるグラフに
+    マウスが乗った時に初めて同じグラフを操作可能なキャンバスに作成する。
+    ホバー表示の無いグラフは画像のまま表示し、キャンバスも作成しない。
+    ホバー表示は現在表示しているグラフにだけ設定する。
+    """
+
+    # 大きさが変わった時に発行する（再描画の要求用、連続した変更はまとめる）
+    resized = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self.image_label = QLabel("読み込み中...")
+        self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.image_label.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Ignored)
+        self.image_label.setStyleSheet(f"background-color: {FIGURE_FACE_COLOR};")
+        self.addWidget(self.image_label)
+
+        # ホバー表示用のキャンバス（初めて必要になった時に作成する）
+        self.canvas = None
+
+        self.image = None
+        self.image_size = None
+        self._build = None
+        self._live = False
+        self._cursor = None
+
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(300)
+        self._resize_timer.timeout.connect(self.resized)
+
+        self.setMouseTracking(True)
+
+    def render_size(self):
+        """画像を描画する大きさ（論理ピクセル）"""
+        if self.isVisible() and self.width() > 1 and self.height() > 1:
+            return (self.width(), self.height())
+        return DEFAULT_RENDER_SIZE
+
+    def show_image(self, image, build):
+        """描画済みの画像を表示する
+
+        Args:
+            image: 表示する画像
+            build: ホバー表示用のキャンバスにグラフを作成する関数。
+                   Figure を受け取り、ホバー対象 (アーティストのリスト, 表示処理) を返す。
+                   ホバー表示の無いグラフは None を渡す（画像のまま表示する）
+        """
+        self.image = image
+        self.image_size = self.render_size()
+        self._build = build
+        self._live = False
+        self._remove_cursor()
+
+        self._update_pixmap()
+        self.setCurrentWidget(self.image_label)
+
+    def _update_pixmap(self):
+        if self.image is None:
+            return
+        pixmap = QPixmap.fromImage(self.image)
+        if self.image_size != self.render_size():
+            # 再描画が届くまでは拡大・縮小して表示する
+            pixmap = pixmap.scaled(
+                self.size() * pixmap.devicePixelRatio(),
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation
+            )
+        self.image_label.setPixmap(pixmap)
+
+    def _remove_cursor(self):
+        """前回のグラフに設定したホバー表示を取り除く"""
+        if self._cursor is not None:
+            self._cursor.remove()
+            self._cursor = None
+
+    def show_live(self):
+        """表示中のグラフを操作可能なキャンバスで作成し、ホバー表示を有効にする"""
+        if self._build is None:
+            return
+        if not self._live:
+            if self.canvas is None:
+                self.canvas = MatplotlibCanvas()
+                self.addWidget(self.canvas)
+
+            figure = self.canvas.figure
+            figure.clear()
+            hover = self._build(figure)
+            if hover is None:
+                # ホバー対象が無ければ画像の表示のままにする
+                self._build = None
+                return
+            figure.tight_layout()
+            self.canvas.draw()
+
+            artists, on_hover = hover
+            self._cursor = mplcursors.cursor(artists, hover=True)
+            self._cursor.connect("add", on_hover)
+            self._live = True
+
+        self.setCurrentWidget(self.canvas)
+
+    def enterEvent(self, event):
+        """マウスが乗った時にホバー表示用のキャンバスに切り替える"""
+        super().enterEvent(event)
+        self.show_live()
+
+    def resizeEvent(self, event):
+        """大きさが変わった時の処理"""
+        super().resizeEvent(event)
+        if self.currentWidget() is self.image_label:
+            self._update_pixmap()
+        if self.image is not None:
+            self._resize_timer.start()
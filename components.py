@@ -3,10 +3,14 @@ from PyQt6.QtWidgets import (
     QLineEdit, QTextEdit, QComboBox, QDateEdit, QTableWidget,
     QTableWidgetItem, QAbstractItemView, QHeaderView, QCheckBox,
     QDialog, QMessageBox, QGroupBox, QFormLayout, QSpinBox,
-    QDialogButtonBox, QListWidget, QListWidgetItem, QSizePolicy
+    QDialogButtonBox, QListWidget, QListWidgetItem, QSizePolicy, QTableView
+)
+from PyQt6.QtCore import (
+    Qt, QDate, pyqtSignal, QAbstractTableModel, QModelIndex,
+    QObject, QTimer, QSignalBlocker
 )
-from PyQt6.QtCore import Qt, QDate, pyqtSignal
 from PyQt6.QtGui import QIcon, QFont, QPixmap
+from contextlib import contextmanager
 
 from styles import StyleManager
 
@@ -174,10 +178,11 @@ class EnhancedTable(QTableWidget):
         """テーブルにデータをセットする"""
         self.setRowCount(0)  # テーブルをクリア
 
+        headers = self.horizontalHeaderLabels()
         for row_idx, row_data in enumerate(data):
             self.insertRow(row_idx)
 
-            for col_idx, header in enumerate(self.horizontalHeaderLabels()):
+            for col_idx, header in enumerate(headers):
                 if header in row_data:
                     item = QTableWidgetItem(str(row_data[header]))
 
@@ -222,6 +227,445 @@ class EnhancedTable(QTableWidget):
         return [self.horizontalHeaderItem(i).text() for i in range(self.columnCount())]
 
 
+class TableModel(QAbstractTableModel):
+    """行データを遅延表示するテーブルモデル
+
+    各列は「行データから値を取り出す関数」として保持し、表示文字列は
+    ビューから要求された時にだけ生成する。行はfetchMoreで一定件数ずつ公開する。
+    ページ取得関数（set_pager）を設定した場合は、スクロールに応じて
+    データベースから次のページを読み込む。非同期のページ取得関数（set_async_pager）を
+    設定した場合は、結果が届いた時点で行を追加する。
+    """
+
+    firstPageLoaded = pyqtSignal()  # 非同期読み込みで最初のページが届いた時に発行
+
+    def __init__(self, headers, batch_size=200, parent=None):
+        super().__init__(parent)
+        self.headers = list(headers)
+        self.batch_size = batch_size
+        self.rows = []
+        self.accessors = [self._key_accessor(header) for header in self.headers]
+        self.loaded_count = 0
+        # ページ取得関数と次のページのカーソル
+        self.pager = None
+        self.async_pager = None
+        self.next_cursor = None
+        # 非同期読み込み中かどうかと、古い読み込み結果を捨てるための世代番号
+        self.page_pending = False
+        self.generation = 0
+
+    @staticmethod
+    def _key_accessor(key):
+        """辞書のキーで値を取り出す関数を作成する"""
+        return lambda row: row.get(key)
+
+    def set_rows(self, rows, columns=None):
+        """行データと列の取り出し方を設定する
+
+        Args:
+            rows: 行データ（辞書など）のリスト
+            columns: ヘッダー名 -> キー名または関数 の辞書。省略時はヘッダー名をキーとして使う
+        """
+        self.beginResetModel()
+        self.rows = rows if isinstance(rows, list) else list(rows)
+        self.pager = None
+        self._reset_async_pager()
+        self.next_cursor = None
+        self._set_columns(columns)
+        self.loaded_count = min(self.batch_size, len(self.rows))
+        self.endResetModel()
+
+    def set_pager(self, pager, columns=None):
+        """ページ取得関数を設定し、最初のページを読み込む
+
+        Args:
+            pager: カーソルを受け取り (行のリスト, 次のカーソル) を返す関数。
+                   最初のページはカーソル None で呼ばれ、次のカーソルが None なら最終ページ
+            columns: set_rows と同じ
+        """
+        rows, next_cursor = pager(None)
+
+        self.beginResetModel()
+        self.rows = list(rows)
+        self.pager = pager
+        self._reset_async_pager()
+        self.next_cursor = next_cursor
+        self._set_columns(columns)
+        self.loaded_count = len(self.rows)
+        self.endResetModel()
+
+    def set_async_pager(self, request_page, columns=None):
+        """非同期のページ取得関数を設定し、最初のページの読み込みを開始する
+
+        Args:
+            request_page: (カーソル, 受け取り関数) を受け取り、読み込みを開始する関数。
+                          読み込み完了時に 受け取り関数(行のリスト, 次のカーソル) を呼ぶこと
+            columns: set_rows と同じ
+        """
+        self.beginResetModel()
+        self.rows = []
+        self.pager = None
+        self._reset_async_pager()
+        self.async_pager = request_page
+        self.next_cursor = None
+        self._set_columns(columns)
+        self.loaded_count = 0
+        self.endResetModel()
+
+        self._request_page(None)
+
+    def _reset_async_pager(self):
+        """非同期読み込みを打ち切り、届いていない結果を無効にする"""
+        self.async_pager = None
+        self.page_pending = False
+        self.generation += 1
+
+    def _request_page(self, cursor):
+        """次のページの非同期読み込みを開始する"""
+        generation = self.generation
+        self.page_pending = True
+        self.async_pager(
+            cursor,
+            lambda rows, next_cursor: self._receive_page(generation, rows, next_cursor)
+        )
+
+    def _receive_page(self, generation, rows, next_cursor):
+        """非同期で読み込んだページを追加する"""
+        if generation != self.generation:
+            # 条件が変わった後に届いた古い結果は捨てる
+            return
+
+        first_page = not self.rows
+        self.page_pending = False
+        self.rows.extend(rows)
+        self.next_cursor = next_cursor
+        self._publish_rows(self.batch_size if not first_page else len(self.rows))
+
+        if first_page:
+            self.firstPageLoaded.emit()
+
+    def _publish_rows(self, limit):
+        """読み込み済みの行をビューに公開する"""
+        count = min(limit, len(self.rows) - self.loaded_count)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.loaded_count, self.loaded_count + count - 1)
+        self.loaded_count += count
+        self.endInsertRows()
+
+    def _set_columns(self, columns):
+        """列ごとの値の取り出し方を設定する"""
+        columns = columns or {}
+        self.accessors = []
+        for header in self.headers:
+            accessor = columns.get(header, header)
+            if not callable(accessor):
+                accessor = self._key_accessor(accessor)
+            self.accessors.append(accessor)
+
+    def is_fully_loaded(self):
+        """全ての行が読み込み済みかどうか"""
+        return (self.next_cursor is None and not self.page_pending
+                and self.loaded_count >= len(self.rows))
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self.loaded_count
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.headers)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return not self.is_fully_loaded()
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+
+        # 公開済みの行を使い切った場合は次のページを読み込む
+        if self.loaded_count >= len(self.rows) and self.next_cursor is not None:
+            if self.async_pager:
+                # 結果が届いた時点で行を追加する
+                if not self.page_pending:
+                    self._request_page(self.next_cursor)
+                return
+            if self.pager:
+                rows, self.next_cursor = self.pager(self.next_cursor)
+                self.rows.extend(rows)
+
+        self._publish_rows(self.batch_size)
+
+    def value(self, row, column):
+        """セルの元の値を取得する"""
+        return self.accessors[column](self.rows[row])
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            value = self.value(index.row(), index.column())
+            return "" if value is None else str(value)
+        if role == Qt.ItemDataRole.UserRole:
+            return self.value(index.row(), index.column())
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return None
+
+    def filter_rows(self, predicate):
+        """読み込み済みの行を条件で絞り込む（全件読み込み済みの場合のみ）
+
+        Returns:
+            絞り込みを行ったかどうか
+        """
+        if not self.is_fully_loaded():
+            return False
+
+        self.beginResetModel()
+        self.rows = [row for row in self.rows if predicate(row)]
+        self.loaded_count = min(self.batch_size, len(self.rows))
+        self.endResetModel()
+        return True
+
+    def row_data(self, row):
+        """指定行のデータをヘッダー名をキーとした辞書で取得する"""
+        return {header: self.value(row, col) for col, header in enumerate(self.headers)}
+
+
+class FilterController(QObject):
+    """フィルター変更をまとめて1回の検索にするコントローラー
+
+    監視対象のシグナルが続けて発行されても、最後の変更から一定時間後に
+    一度だけ検索関数を呼ぶ。また、前回の検索条件を記録しておき、
+    検索テキストを書き足しただけの変更（前回の結果の絞り込み）かどうかを判定する。
+    """
+
+    # 最後の変更から検索を実行するまでの待ち時間（ミリ秒）
+    DEBOUNCE_MS = 250
+
+    # SQLiteのLIKEと同じく、ASCII文字だけ大文字小文字を区別しない
+    _ASCII_LOWER = str.maketrans(
+        "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz"
+    )
+
+    def __init__(self, apply, delay=DEBOUNCE_MS, parent=None):
+        super().__init__(parent)
+        self.apply = apply
+        self.last_filter = None
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay)
+        self.timer.timeout.connect(self.apply_now)
+
+    def watch(self, *signals):
+        """シグナルの発行を検索のきっかけとして登録する"""
+        for signal in signals:
+            signal.connect(self.schedule)
+
+    def schedule(self, *args):
+        """検索を予約する（待ち時間内の変更は1回にまとめる）"""
+        self.timer.start()
+
+    def apply_now(self, *args):
+        """予約を取り消して直ちに検索する"""
+        self.timer.stop()
+        self.apply()
+
+    def cancel(self):
+        """予約中の検索を取り消す"""
+        self.timer.stop()
+
+    @contextmanager
+    def blocked(self, *widgets):
+        """ウィジェットのシグナルを止めた状態で処理する（リセット時など）"""
+        blockers = [QSignalBlocker(widget) for widget in widgets]
+        try:
+            yield
+        finally:
+            for blocker in blockers:
+                blocker.unblock()
+            self.timer.stop()
+
+    def remember(self, key, search_text):
+        """表示中の結果の検索条件を記録する
+
+        Args:
+            key: 検索テキスト以外の条件（状態・並び順など）をまとめた値
+            search_text: 検索テキスト
+        """
+        self.last_filter = (key, search_text)
+
+    def forget(self):
+        """記録した検索条件を破棄する（条件と異なる行を表示した時など）"""
+        self.last_filter = None
+
+    def narrows(self, key, search_text):
+        """前回の結果を検索テキストで絞り込むだけで済む変更かどうか"""
+        if self.last_filter is None:
+            return False
+
+        last_key, last_text = self.last_filter
+        if key != last_key or search_text == last_text:
+            return False
+
+        # ワイルドカードを含む場合は部分一致の包含関係が成り立たない
+        if "%" in search_text or "_" in search_text:
+            return False
+
+        # 全文検索（FTS5）は全角英字などASCII以外の文字も大文字小文字を区別しないため、
+        # そのような文字を含む場合はメモリ上の判定と結果が異なる。問い合わせ直す
+        if not self.foldable(search_text):
+            return False
+
+        return self.fold(last_text) in self.fold(search_text)
+
+    @staticmethod
+    def foldable(text):
+        """LIKE と全文検索のどちらでも fold と同じ大文字小文字の扱いになる文字だけかどうか
+
+        ASCII 文字と、大文字小文字の区別が無い文字（ひらがな・漢字など）だけなら True。
+        """
+        return all(ch.isascii() or (ch.lower() == ch and ch.upper() == ch) for ch in text)
+
+    @classmethod
+    def fold(cls, text):
+        """大文字小文字を区別しない比較用に変換する"""
+        return ("" if text is None else str(text)).translate(cls._ASCII_LOWER)
+
+    @classmethod
+    def matches(cls, search_text, *values):
+        """いずれかの値が検索テキストを含むかどうか（LIKE '%text%' と同じ判定）"""
+        needle = cls.fold(search_text)
+        return any(needle in cls.fold(value) for value in values if value is not None)
+
+
+class EnhancedTableView(QTableView):
+    """大量の行を扱うためのモデル/ビュー方式のテーブル
+
+    EnhancedTable と同じ操作（set_data, get_selected_row_data など）を提供する。
+    """
+
+    doubleClicked = pyqtSignal(int)  # 行のインデックスを送信
+    dataLoaded = pyqtSignal()  # 非同期読み込みで最初のページを表示した時に発行
+
+    # 列幅の自動調整で計測する行数の上限
+    RESIZE_PRECISION = 100
+
+    def __init__(self, headers, batch_size=200):
+        super().__init__()
+
+        self.table_model = TableModel(headers, batch_size, self)
+        self.table_model.firstPageLoaded.connect(self._on_first_page_loaded)
+        self.setModel(self.table_model)
+
+        # テーブル設定
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.verticalHeader().setVisible(False)
+        self.horizontalHeader().setStretchLastSection(True)
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        self.horizontalHeader().setResizeContentsPrecision(self.RESIZE_PRECISION)
+
+        # テーブルの幅を最大限に拡張する
+        self.setSizePolicy(
+            QSizePolicy.Policy.Expanding,
+            QSizePolicy.Policy.Expanding
+        )
+
+        # スタイル適用
+        StyleManager.style_table(self)
+
+    def mouseDoubleClickEvent(self, event):
+        """項目のダブルクリック時の処理"""
+        super().mouseDoubleClickEvent(event)
+        index = self.indexAt(event.position().toPoint())
+        if index.isValid():
+            self.doubleClicked.emit(index.row())
+
+    def set_data(self, data, id_column=None):
+        """テーブルにデータをセットする（ヘッダー名をキーとした辞書のリスト）"""
+        self.set_rows(data)
+
+    def set_rows(self, rows, columns=None):
+        """行データと列の取り出し方を指定してテーブルにセットする"""
+        self.table_model.set_rows(rows, columns)
+
+        # 列幅調整（先頭の一部の行だけを計測する）
+        self.resizeColumnsToContents()
+
+    def set_pager(self, pager, columns=None):
+        """ページ取得関数を指定してテーブルにセットする（残りはスクロールに応じて読み込む）"""
+        self.table_model.set_pager(pager, columns)
+
+        # 列幅調整（先頭の一部の行だけを計測する）
+        self.resizeColumnsToContents()
+
+    def set_async_pager(self, request_page, columns=None):
+        """非同期のページ取得関数を指定してテーブルにセットする
+
+        最初のページが届くと列幅を調整して dataLoaded を発行する。
+        """
+        self.table_model.set_async_pager(request_page, columns)
+
+    def _on_first_page_loaded(self):
+        """最初のページが届いた時の処理"""
+        self.resizeColumnsToContents()
+        self.dataLoaded.emit()
+
+    def get_selected_row_data(self):
+        """選択された行のデータを取得する"""
+        selected_rows = self.selectionModel().selectedRows()
+        if not selected_rows:
+            return None
+
+        return self.table_model.row_data(selected_rows[0].row())
+
+    def clear_selection(self):
+        """選択をクリアする"""
+        self.clearSelection()
+
+    def columnCount(self):
+        """列数を取得する"""
+        return self.table_model.columnCount()
+
+    def horizontalHeaderLabels(self):
+        """ヘッダーラベルのリストを取得する"""
+        return list(self.table_model.headers)
+
+
+class LazyTab(QWidget):
+    """最初に表示された時に中身を作成するタブ用のコンテナ"""
+
+    def __init__(self, factory, parent=None):
+        super().__init__(parent)
+        self._factory = factory
+        self._widget = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+    def is_loaded(self):
+        """中身が作成済みかどうか"""
+        return self._widget is not None
+
+    def widget(self):
+        """中身のウィジェットを取得する（未作成の場合は作成する）"""
+        if self._widget is None:
+            self._widget = self._factory()
+            self.layout().addWidget(self._widget)
+        return self._widget
+
+
 class EnhancedComboBox(QComboBox):
     """拡張機能付きコンボボックス"""
 
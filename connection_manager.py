@@ -0,0 +1,101 @@
+import os
+import threading
+
+from models import Database
+
+
+class ConnectionManager:
+    """データベース接続をプロセス全体で共有・管理するクラス
+
+    データベースファイルごとに1つのインスタンスを持ち、GUIスレッド用の
+    Database を1度だけ作成する（スキーマの準備もこの時に1度だけ行う）。
+    バックグラウンドのワーカースレッドにはスレッドごとの接続を渡し、
+    終了時に全ての接続をまとめて閉じる。
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def get(cls, db_path='tc_management.db'):
+        """データベースファイルに対応する接続マネージャーを取得する"""
+        key = os.path.abspath(db_path)
+        with cls._instances_lock:
+            manager = cls._instances.get(key)
+            if manager is None:
+                manager = cls(db_path)
+                cls._instances[key] = manager
+            return manager
+
+    @classmethod
+    def close_all(cls):
+        """全ての接続マネージャーの接続を閉じる"""
+        with cls._instances_lock:
+            managers = list(cls._instances.values())
+            cls._instances.clear()
+        for manager in managers:
+            manager.close()
+
+    def __init__(self, db_path='tc_management.db'):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._main_db = None
+        self._main_thread = None
+        self._schema_ready = False
+        self._local = threading.local()
+        self._thread_databases = []
+
+    def open(self):
+        """GUIスレッド用の共有 Database を開く（スキーマの準備は行わない）"""
+        with self._lock:
+            if self._main_db is None:
+                self._main_db = Database(self.db_path, init_schema=False)
+                self._main_thread = threading.get_ident()
+                self._schema_ready = False
+            return self._main_db
+
+    def ensure_schema(self):
+        """共有 Database のスキーマを準備する（プロセスで1度だけ行う）"""
+        db = self.open()
+        with self._lock:
+            if not self._schema_ready:
+                db.ensure_schema()
+                self._schema_ready = True
+        return db
+
+    def database(self):
+        """GUIスレッド用の共有 Database を取得する（初回のみ作成・スキーマ準備する）"""
+        return self.ensure_schema()
+
+    def thread_database(self):
+        """現在のワーカースレッド専用の Database を取得する"""
+        db = getattr(self._local, 'db', None)
+        if db is None or db.conn is None:
+            # スキーマの準備は共有 Database の作成時に済ませる
+            self.database()
+            db = Database(self.db_path, init_schema=False, check_same_thread=False)
+            self._local.db = db
+            with self._lock:
+                self._thread_databases.append(db)
+        return db
+
+    def connection(self):
+        """呼び出し元のスレッドで使える Database を取得する"""
+        db = self.database()
+        if threading.get_ident() == self._main_thread:
+            return db
+        return self.thread_database()
+
+    def close(self):
+        """共有 Database とワーカー用の接続を全て閉じる"""
+        with self._lock:
+            databases, self._thread_databases = self._thread_databases, []
+            main_db, self._main_db = self._main_db, None
+            self._main_thread = None
+            self._schema_ready = False
+
+        for db in databases:
+            db.close()
+        # 最後に閉じる接続で WAL の内容がデータベース本体に反映される
+        if main_db is not None:
+            main_db.close()
@@ -1,12 +1,167 @@
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QScrollArea,
-    QWidget, QPushButton, QFileDialog, QMessageBox, QGridLayout
+    QPushButton, QFileDialog, QMessageBox, QListView,
+    QStyledItemDelegate, QStyle, QAbstractItemView
 )
-from PyQt6.QtCore import Qt, QSize
-from PyQt6.QtGui import QPixmap, QImage
+from PyQt6.QtCore import Qt, QSize, QRect, QTimer, QAbstractListModel, QModelIndex
+from PyQt6.QtGui import QPixmap, QColor, QPen
 
 import os
 import shutil
+from collections import OrderedDict
+
+from thumbnail_cache import thumbnail_cache, ThumbnailLoader, PhotoImageLoader
+
+# サムネイルの表示サイズ（枠線と余白を含む）
+THUMBNAIL_WIDTH = 100
+THUMBNAIL_HEIGHT = 100
+
+# サムネイルの枠線と余白の幅
+THUMBNAIL_MARGIN = 4
+
+# サムネイル一覧のモデルでメモリに保持するサムネイルの数
+THUMBNAIL_MODEL_CACHE_SIZE = 300
+
+# 表示中の写真の前後に先読みする枚数
+PREFETCH_COUNT = 1
+
+
+class PhotoThumbnailModel(QAbstractListModel):
+    """写真のサムネイル一覧のモデル
+
+    サムネイルはビューが表示のために要求した時に初めて読み込みを依頼し、
+    読み込んだものは件数を制限した LRU に保持する。表示されない写真の
+    サムネイルは読み込まず、メモリにも残さない。
+    """
+
+    # 写真データ（辞書）を取得するためのロール
+    PhotoRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, loader, parent=None):
+        super().__init__(parent)
+        self.loader = loader
+        self.photos = []
+        self._rows = {}  # 元画像のパス -> 行番号のリスト
+        self._pixmaps = OrderedDict()  # 元画像のパス -> サムネイル
+
+        thumbnail_size = self.thumbnail_size()
+        self._placeholder = QPixmap(thumbnail_size)
+        self._placeholder.fill(Qt.GlobalColor.lightGray)
+        self._broken = QPixmap(thumbnail_size)
+        self._broken.fill(Qt.GlobalColor.gray)
+
+        self.loader.thumbnailReady.connect(self.on_thumbnail_ready)
+
+    @staticmethod
+    def thumbnail_size():
+        """枠線と余白を除いたサムネイル画像の大きさ"""
+        return QSize(THUMBNAIL_WIDTH - THUMBNAIL_MARGIN * 2, THUMBNAIL_HEIGHT - THUMBNAIL_MARGIN * 2)
+
+    def set_photos(self, photos):
+        """表示する写真を設定する"""
+        self.beginResetModel()
+        self.loader.cancel()
+        self.photos = list(photos)
+        self._rows = {}
+        for row, photo in enumerate(self.photos):
+            self._rows.setdefault(photo['photo_path'], []).append(row)
+        self.endResetModel()
+
+    def remove_rows(self, rows):
+        """指定した行の写真を一覧から取り除く（他の行のサムネイルはそのまま使う）"""
+        rows = sorted(set(rows))
+        # 連続した行はまとめて、後ろの行から削除する
+        ranges = []
+        for row in rows:
+            if ranges and ranges[-1][1] == row - 1:
+                ranges[-1][1] = row
+            else:
+                ranges.append([row, row])
+
+        for first, last in reversed(ranges):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for photo in self.photos[first:last + 1]:
+                self._pixmaps.pop(photo['photo_path'], None)
+            del self.photos[first:last + 1]
+            self.endRemoveRows()
+
+        self._rows = {}
+        for row, photo in enumerate(self.photos):
+            self._rows.setdefault(photo['photo_path'], []).append(row)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.photos)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self.photos):
+            return None
+
+        photo = self.photos[index.row()]
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self.thumbnail(photo['photo_path'])
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return os.path.basename(photo['photo_path'])
+        if role == self.PhotoRole:
+            return photo
+        return None
+
+    def thumbnail(self, image_path):
+        """サムネイルを取得する（未読み込みなら読み込みを依頼して仮の画像を返す）"""
+        pixmap = self._pixmaps.get(image_path)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(image_path)
+            return pixmap
+
+        self.loader.request([image_path], ThumbnailLoader.PRIORITY_VISIBLE)
+        return self._placeholder
+
+    def on_thumbnail_ready(self, image_path, image):
+        """読み込みが終わったサムネイルを保持して、該当する行を再描画させる"""
+        rows = self._rows.get(image_path)
+        if not rows:
+            return
+
+        if image.isNull():
+            pixmap = self._broken
+        else:
+            pixmap = QPixmap.fromImage(image).scaled(
+                self.thumbnail_size(),
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation
+            )
+
+        self._pixmaps[image_path] = pixmap
+        while len(self._pixmaps) > THUMBNAIL_MODEL_CACHE_SIZE:
+            self._pixmaps.popitem(last=False)
+
+        for row in rows:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+
+class PhotoThumbnailDelegate(QStyledItemDelegate):
+    """サムネイルを中央に描画し、選択中のものを青い枠で囲むデリゲート"""
+
+    def paint(self, painter, option, index):
+        painter.save()
+
+        # サムネイルはモデルで枠内に収まる大きさに縮小済み
+        pixmap = index.data(Qt.ItemDataRole.DecorationRole)
+        if pixmap is not None:
+            target = QRect(0, 0, pixmap.width(), pixmap.height())
+            target.moveCenter(option.rect.center())
+            painter.drawPixmap(target, pixmap)
+
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.setPen(QPen(QColor("blue"), 2))
+            painter.drawRect(option.rect.adjusted(1, 1, -1, -1))
+
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        return QSize(THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT)
 
 
 class PhotoViewerDialog(QDialog):
@@ -19,6 +174,20 @@ class PhotoViewerDialog(QDialog):
         self.project_id = project_id
         self.photos = []
         self.current_index = 0
+        # サムネイルは表示される分だけバックグラウンドで読み込み、終わったものから表示する
+        self.thumbnail_loader = ThumbnailLoader(parent=self)
+        self.thumbnail_model = PhotoThumbnailModel(self.thumbnail_loader, self)
+        # 大きな画像は表示サイズに縮小して読み込み、前後の写真を先読みする
+        self.image_loader = PhotoImageLoader(parent=self)
+        self.image_loader.imageReady.connect(self.on_image_ready)
+        self.displayed_path = None
+        self._removing_rows = False
+
+        # 大きさが変わった時は、変更が落ち着いてから新しい大きさで読み込み直す
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(200)
+        self.resize_timer.timeout.connect(lambda: self.show_photo(self.current_index))
 
         self.setWindowTitle("案件写真ビューアー")
         self.setMinimumWidth(800)
@@ -43,18 +212,23 @@ class PhotoViewerDialog(QDialog):
 
         main_layout.addWidget(scroll_area)
 
-        # サムネイルエリア
-        self.thumbnail_widget = QWidget()
-        self.thumbnail_layout = QGridLayout(self.thumbnail_widget)
-        self.thumbnail_layout.setContentsMargins(10, 10, 10, 10)
-        self.thumbnail_layout.setSpacing(10)
-
-        thumbnail_scroll = QScrollArea()
-        thumbnail_scroll.setWidget(self.thumbnail_widget)
-        thumbnail_scroll.setWidgetResizable(True)
-        thumbnail_scroll.setMaximumHeight(150)
-
-        main_layout.addWidget(thumbnail_scroll)
+        # サムネイルエリア（表示範囲の分だけ描画する一覧）
+        self.thumbnail_view = QListView()
+        self.thumbnail_view.setViewMode(QListView.ViewMode.IconMode)
+        self.thumbnail_view.setMovement(QListView.Movement.Static)
+        self.thumbnail_view.setResizeMode(QListView.ResizeMode.Adjust)
+        self.thumbnail_view.setUniformItemSizes(True)
+        self.thumbnail_view.setSpacing(5)
+        self.thumbnail_view.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.thumbnail_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.thumbnail_view.setMaximumHeight(150)
+        self.thumbnail_view.setModel(self.thumbnail_model)
+        self.thumbnail_view.setItemDelegate(PhotoThumbnailDelegate(self.thumbnail_view))
+        self.thumbnail_view.selectionModel().currentChanged.connect(self.on_current_thumbnail_changed)
+        # スクロールで表示範囲から外れたサムネイルの読み込みは取り消す
+        self.thumbnail_view.verticalScrollBar().valueChanged.connect(self.thumbnail_loader.cancel_queued)
+
+        main_layout.addWidget(self.thumbnail_view)
 
         # 操作ボタン
         button_layout = QHBoxLayout()
@@ -74,7 +248,7 @@ class PhotoViewerDialog(QDialog):
         button_layout.addWidget(self.export_button)
 
         self.delete_button = QPushButton("削除")
-        self.delete_button.clicked.connect(self.delete_current_photo)
+        self.delete_button.clicked.connect(self.delete_selected_photos)
         button_layout.addWidget(self.delete_button)
 
         self.close_button = QPushButton("閉じる")
@@ -85,54 +259,45 @@ class PhotoViewerDialog(QDialog):
 
     def load_photos(self):
         """写真データを読み込む"""
-        self.photos = self.db.get_project_photos(self.project_id)
-
-        # サムネイル表示をクリア
-        for i in reversed(range(self.thumbnail_layout.count())):
-            self.thumbnail_layout.itemAt(i).widget().setParent(None)
-
-        # サムネイルを表示
-        for i, photo in enumerate(self.photos):
-            thumbnail = self.create_thumbnail(photo['photo_path'], 100, 100)
-            thumbnail.setObjectName(f"thumbnail_{i}")
-            thumbnail.mousePressEvent = lambda event, idx=i: self.select_photo(idx)
-
-            row = i // 6
-            col = i % 6
-            self.thumbnail_layout.addWidget(thumbnail, row, col)
+        # サムネイル一覧を更新（サムネイルは表示される時に読み込まれる）
+        # 写真リストはモデルと共有し、削除時はモデルの行を取り除くだけにする
+        self.thumbnail_model.set_photos(self.db.get_project_photos(self.project_id))
+        self.photos = self.thumbnail_model.photos
 
         # 最初の写真を表示
         if self.photos:
             self.show_photo(0)
         else:
-            self.image_label.setText("写真がありません")
-            self.prev_button.setEnabled(False)
-            self.next_button.setEnabled(False)
-            self.delete_button.setEnabled(False)
-            self.export_button.setEnabled(False)
-
-    def create_thumbnail(self, image_path, width, height):
-        """サムネイルを作成する"""
-        label = QLabel()
-        pixmap = QPixmap(image_path)
-        if not pixmap.isNull():
-            pixmap = pixmap.scaled(width, height, Qt.AspectRatioMode.KeepAspectRatio)
-        else:
-            pixmap = QPixmap(width, height)
-            pixmap.fill(Qt.GlobalColor.gray)
-
-        label.setPixmap(pixmap)
-        label.setFixedSize(width, height)
-        label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        label.setStyleSheet("border: 2px solid transparent; padding: 2px;")
-
-        return label
+            self.show_no_photos()
+
+    def show_no_photos(self):
+        """写真が無い時の表示にする"""
+        self.displayed_path = None
+        self.image_label.setText("写真がありません")
+        self.prev_button.setEnabled(False)
+        self.next_button.setEnabled(False)
+        self.delete_button.setEnabled(False)
+        self.export_button.setEnabled(False)
+
+    def done(self, result):
+        """ダイアログを閉じる時にサムネイルと写真の読み込みを止める"""
+        self.thumbnail_loader.shutdown()
+        self.image_loader.shutdown()
+        super().done(result)
 
     def select_photo(self, index):
         """写真を選択する"""
         if 0 <= index < len(self.photos):
             self.show_photo(index)
 
+    def on_current_thumbnail_changed(self, current, previous):
+        """サムネイル一覧で選択された写真を表示する"""
+        # 行の削除中は削除前の行番号で通知されるため無視する
+        if self._removing_rows:
+            return
+        if current.isValid() and current.row() != self.current_index:
+            self.select_photo(current.row())
+
     def show_photo(self, index):
         """写真を表示する"""
         if not self.photos or index >= len(self.photos):
@@ -140,37 +305,64 @@ class PhotoViewerDialog(QDialog):
 
         self.current_index = index
 
-        # すべてのサムネイルの境界線をリセット
-        for i in range(self.thumbnail_layout.count()):
-            widget = self.thumbnail_layout.itemAt(i).widget()
-            if widget:
-                widget.setStyleSheet("border: 2px solid transparent; padding: 2px;")
-
         # 選択中のサムネイルを強調表示
-        selected_widget = self.thumbnail_widget.findChild(QLabel, f"thumbnail_{index}")
-        if selected_widget:
-            selected_widget.setStyleSheet("border: 2px solid blue; padding: 2px;")
+        model_index = self.thumbnail_model.index(index)
+        if self.thumbnail_view.currentIndex() != model_index:
+            self.thumbnail_view.setCurrentIndex(model_index)
+        self.thumbnail_view.scrollTo(model_index)
 
-        # 大きな画像を表示
+        # 大きな画像を表示（読み込み済みでなければバックグラウンドで読み込む）
         photo_path = self.photos[index]['photo_path']
-        pixmap = QPixmap(photo_path)
-
-        if not pixmap.isNull():
-            # ラベルのサイズに合わせて画像をリサイズ
-            max_size = self.image_label.size()
-            scaled_pixmap = pixmap.scaled(
-                max_size,
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            )
-            self.image_label.setPixmap(scaled_pixmap)
-        else:
-            self.image_label.setText("画像を読み込めませんでした")
+        width, height = self.image_display_size()
+        pixmap = self.image_loader.get(photo_path, width, height)
+        if pixmap is not None:
+            self.set_main_pixmap(photo_path, pixmap)
+        elif self.displayed_path != photo_path:
+            # 同じ写真を大きさを変えて読み込み直す間は、今の画像を表示しておく
+            self.displayed_path = None
+            self.image_label.setText("読み込み中...")
+
+        neighbours = [self.photos[i]['photo_path']
+                      for offset in range(1, PREFETCH_COUNT + 1)
+                      for i in (index + offset, index - offset)
+                      if 0 <= i < len(self.photos)]
+        self.image_loader.request(photo_path, width, height, prefetch_paths=neighbours)
 
         # ボタンの有効/無効を更新
         self.prev_button.setEnabled(index > 0)
         self.next_button.setEnabled(index < len(self.photos) - 1)
 
+    def image_display_size(self):
+        """大きな画像を読み込む大きさ（画面の拡大率を考慮した実ピクセル）"""
+        ratio = self.devicePixelRatioF()
+        size = self.image_label.size()
+        return (max(1, round(size.width() * ratio)), max(1, round(size.height() * ratio)))
+
+    def set_main_pixmap(self, image_path, pixmap):
+        """読み込んだ大きな画像を表示する"""
+        pixmap.setDevicePixelRatio(self.devicePixelRatioF())
+        self.image_label.setPixmap(pixmap)
+        self.displayed_path = image_path
+
+    def on_image_ready(self, image_path, pixmap):
+        """読み込みが終わった大きな画像が表示中の写真なら表示する"""
+        if not self.photos or self.current_index >= len(self.photos):
+            return
+        if self.photos[self.current_index]['photo_path'] != image_path:
+            return
+
+        if pixmap.isNull():
+            self.displayed_path = None
+            self.image_label.setText("画像を読み込めませんでした")
+        else:
+            self.set_main_pixmap(image_path, pixmap)
+
+    def resizeEvent(self, event):
+        """大きさが変わった時の処理"""
+        super().resizeEvent(event)
+        if self.photos:
+            self.resize_timer.start()
+
     def show_previous_photo(self):
         """前の写真を表示する"""
         if self.current_index > 0:
@@ -181,16 +373,25 @@ class PhotoViewerDialog(QDialog):
         if self.current_index < len(self.photos) - 1:
             self.show_photo(self.current_index + 1)
 
-    def delete_current_photo(self):
-        """現在表示中の写真を削除する"""
+    def delete_selected_photos(self):
+        """選択中の写真を削除する（複数選択されている場合はまとめて削除する）"""
         if not self.photos or self.current_index >= len(self.photos):
             return
 
+        rows = sorted(index.row() for index in self.thumbnail_view.selectionModel().selectedIndexes())
+        if not rows:
+            rows = [self.current_index]
+
+        if len(rows) == 1:
+            message = "この写真を削除してもよろしいですか？"
+        else:
+            message = f"選択した{len(rows)}枚の写真を削除してもよろしいですか？"
+
         # 確認ダイアログ
         reply = QMessageBox.question(
             self,
             "確認",
-            "この写真を削除してもよろしいですか？",
+            message,
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
             QMessageBox.StandardButton.No
         )
@@ -198,31 +399,34 @@ class PhotoViewerDialog(QDialog):
         if reply != QMessageBox.StandardButton.Yes:
             return
 
-        # 写真ID取得
-        photo_id = self.photos[self.current_index]['id']
-        photo_path = self.photos[self.current_index]['photo_path']
+        photos = [self.photos[row] for row in rows]
 
-        # データベースから削除
-        self.db.delete_project_photo(photo_id)
+        # データベースから削除（選択した写真を1回のコミットでまとめて削除）
+        self.db.delete_project_photos([photo['id'] for photo in photos])
 
-        # ファイルも削除
-        try:
-            if os.path.exists(photo_path):
-                os.remove(photo_path)
-        except Exception as e:
-            print(f"ファイル削除エラー: {e}")
+        # サムネイルとファイルも削除
+        for photo in photos:
+            photo_path = photo['photo_path']
+            thumbnail_cache.remove(photo_path)
+            self.image_loader.remove(photo_path)
+            try:
+                if os.path.exists(photo_path):
+                    os.remove(photo_path)
+            except Exception as e:
+                print(f"ファイル削除エラー: {e}")
 
-        # 写真リストを更新
-        self.photos.pop(self.current_index)
+        # 一覧から削除した行だけを取り除く（写真の再読み込みはしない）
+        self._removing_rows = True
+        try:
+            self.thumbnail_model.remove_rows(rows)
+        finally:
+            self._removing_rows = False
 
         # 表示を更新
         if self.photos:
-            # 新しいインデックスの計算
-            new_index = min(self.current_index, len(self.photos) - 1)
-            self.load_photos()
-            self.show_photo(new_index)
+            self.show_photo(min(rows[0], len(self.photos) - 1))
         else:
-            self.load_photos()
+            self.show_no_photos()
 
     def export_photos(self):
         """写真をエクスポートする"""
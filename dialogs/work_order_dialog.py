@@ -13,14 +13,6 @@ import sys
 import datetime
 import tempfile
 import webbrowser
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.lib.units import mm
-from reportlab.platypus.tables import TableStyle
-from reportlab.platypus import Table
-from reportlab.lib import colors
 
 # 循環インポートを避けるため、型チェック用の文字列を定義
 WORK_ORDERS_TAB_CLASS = 'WorkOrdersTab'
@@ -700,6 +692,16 @@ class WorkOrderDialog(QDialog):
 
     def generate_pdf(self, filename=None):
         """PDFを生成する"""
+        # reportlab は読み込みに時間がかかるため、PDF生成時に読み込む
+        from reportlab.pdfgen import canvas
+        from reportlab.lib.pagesizes import A4
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.ttfonts import TTFont
+        from reportlab.lib.units import mm
+        from reportlab.platypus.tables import TableStyle
+        from reportlab.platypus import Table
+        from reportlab.lib import colors
+
         # フォントの登録
         font_path = os.path.join("fonts", "ipaexg.ttf")
 
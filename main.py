@@ -1,13 +1,15 @@
+from startup import profiler
 import os
 import sys
-import time
 from PyQt6.QtWidgets import QApplication
-from PyQt6.QtCore import QTimer, QEventLoop
-from main_window import process_login, show_splash_screen, MainWindow
+from main_window import start_application, show_splash_screen
 from styles import StyleManager
+from connection_manager import ConnectionManager
 
 def main():
     """アプリケーションのメインエントリーポイント"""
+    profiler.mark("モジュール読み込み")
+
     # リソースディレクトリを確認し、存在しなければ作成
     if not os.path.exists("resources"):
         os.makedirs("resources")
@@ -22,48 +24,25 @@ def main():
     # スタイル適用
     StyleManager.apply_styles(app)
 
+    # 終了時に全てのデータベース接続を閉じる
+    app.aboutToQuit.connect(ConnectionManager.close_all)
+
     # スプラッシュスクリーン表示
     splash = show_splash_screen()
 
-    # 少し待機してからログインダイアログを表示 - シグナル/スロットをダイレクト接続に変更
-    print("ログインダイアログを表示します...")
-
     # メインウィンドウ参照を保持するグローバル変数
     global main_window
     main_window = None
 
-    # リトライカウンターを設定
-    retry_count = 0
-    max_retries = 3
-
-    # ログイン処理を直接呼び出す
-    time.sleep(1)  # スプラッシュ画面表示のため少し待機
-
-    while retry_count < max_retries:
-        try:
-            # ログイン処理を直接呼び出す
-            process_login(app, splash)
-
-            # アプリケーションのイベントループを開始
-            print("アプリケーションのイベントループを開始します...")
-
-            # メインイベントループ開始
-            return_code = app.exec()
-            print(f"アプリケーションのイベントループが終了しました: {return_code}")
-            sys.exit(return_code)
-
-        except Exception as e:
-            retry_count += 1
-            print(f"エラーが発生しました（試行 {retry_count}/{max_retries}）: {str(e)}")
-            import traceback
-            traceback.print_exc()
-
-            if retry_count >= max_retries:
-                print("最大リトライ回数に達しました。アプリケーションを終了します。")
-                sys.exit(1)
+    # 起動処理（データベースの準備ができ次第ログインダイアログを表示する）
+    print("起動処理を開始します...")
+    start_application(app, splash)
 
-            print(f"{2**retry_count}秒後に再試行します...")
-            time.sleep(2**retry_count)  # 指数バックオフで待機時間を増やす
+    # アプリケーションのイベントループを開始
+    print("アプリケーションのイベントループを開始します...")
+    return_code = app.exec()
+    print(f"アプリケーションのイベントループが終了しました: {return_code}")
+    sys.exit(return_code)
 
 if __name__ == "__main__":
     try:
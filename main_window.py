@@ -1,20 +1,16 @@
-import sys
-import os
+from startup import profiler
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QTabWidget, QWidget, QVBoxLayout,
     QHBoxLayout, QLabel, QPushButton, QMessageBox, QSplashScreen, QProgressBar
 )
 from PyQt6.QtGui import QPixmap, QFont, QIcon
-from PyQt6.QtCore import Qt, QTimer, QEventLoop
+from PyQt6.QtCore import Qt, QTimer, QEventLoop, QObject, pyqtSignal
 
-from models import Database
+from connection_manager import ConnectionManager
+from models import SEARCH_INDEXES
+from query_executor import QueryExecutor
 from styles import StyleManager
-from tabs.clients_tab import ClientsTab
-from tabs.workers_tab import WorkersTab
-from tabs.services_tab import ServicesTab
-from tabs.projects_tab import ProjectsTab
-from tabs.work_orders_tab import WorkOrdersTab
-from tabs.statistics_tab import StatisticsTab
+from components import LazyTab
 
 # グローバル変数でウィンドウ参照を保持
 main_window = None
@@ -28,8 +24,13 @@ class MainWindow(QMainWindow):
         # ユーザー情報を保存
         self.user_info = user_info or {"user_id": "unknown", "user_level": "user"}
 
-        # データベース初期化
-        self.db = Database()
+        # データベース接続（ログイン時に開いた共有接続を使う）
+        self.connections = ConnectionManager.get()
+        self.db = self.connections.database()
+        # 接続設定（WALなど）が有効になっているか確認する
+        self.db.check_connection_settings()
+        # 一覧・統計の読み込み用（GUIスレッドを止めないようバックグラウンドで実行する）
+        self.query_executor = QueryExecutor(self.db.db_path, parent=self)
 
         # UIセットアップ
         self.setup_ui()
@@ -89,32 +90,25 @@ class MainWindow(QMainWindow):
         self.tab_widget = QTabWidget()
         StyleManager.style_tabs(self.tab_widget)
 
-        # 各タブの作成
-        self.clients_tab = ClientsTab(self.db)
-        self.workers_tab = WorkersTab(self.db)
-        self.services_tab = ServicesTab(self.db)
-        self.projects_tab = ProjectsTab(self.db)
-        self.work_orders_tab = WorkOrdersTab(self.db)
-
-        # タブの追加
-        self.tab_widget.addTab(self.projects_tab, "案件管理")
+        # タブの追加（各タブは最初に表示された時に作成する）
+        self.add_lazy_tab('projects_tab', "案件管理", self.create_projects_tab)
 
         # 管理者のみがアクセスできるタブを設定
         if self.user_info['user_level'] == 'admin':
-            self.tab_widget.addTab(self.clients_tab, "取引先マスター")
-            self.tab_widget.addTab(self.workers_tab, "作業員マスター")
-            self.tab_widget.addTab(self.services_tab, "サービスマスター")
-            self.tab_widget.addTab(self.work_orders_tab, "業務指示書")
+            self.add_lazy_tab('clients_tab', "取引先マスター", self.create_clients_tab)
+            self.add_lazy_tab('workers_tab', "作業員マスター", self.create_workers_tab)
+            self.add_lazy_tab('services_tab', "サービスマスター", self.create_services_tab)
+            self.add_lazy_tab('work_orders_tab', "業務指示書", self.create_work_orders_tab)
 
             # 統計情報タブ
-            self.statistics_tab = StatisticsTab(self.db)
-            self.tab_widget.addTab(self.statistics_tab, "統計情報")
-
-            # プロジェクトデータ変更時に統計情報タブを更新するシグナル接続
-            self.projects_tab.projectsChanged.connect(self.update_statistics)
+            self.add_lazy_tab('statistics_tab', "統計情報", self.create_statistics_tab)
         else:
             # 一般ユーザーの場合は業務指示書タブのみ追加
-            self.tab_widget.addTab(self.work_orders_tab, "業務指示書")
+            self.add_lazy_tab('work_orders_tab', "業務指示書", self.create_work_orders_tab)
+
+        # 最初のタブを作成し、以降はタブの切り替え時に作成する
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
+        self.on_tab_changed(self.tab_widget.currentIndex())
 
         main_layout.addWidget(self.tab_widget)
 
@@ -139,6 +133,59 @@ class MainWindow(QMainWindow):
         # メインウィジェットを設定
         self.setCentralWidget(main_widget)
 
+    def add_lazy_tab(self, attr_name, title, factory):
+        """最初に表示された時に作成するタブを追加する
+
+        作成したタブは attr_name の属性として保持する（作成前は属性が存在しない）。
+        """
+        def build():
+            with profiler.phase(f"タブ作成: {title}"):
+                tab = factory()
+            setattr(self, attr_name, tab)
+            return tab
+
+        self.tab_widget.addTab(LazyTab(build), title)
+
+    def on_tab_changed(self, index):
+        """表示されたタブが未作成なら作成する"""
+        container = self.tab_widget.widget(index)
+        if isinstance(container, LazyTab) and not container.is_loaded():
+            container.widget()
+
+    def create_projects_tab(self):
+        """案件管理タブを作成する"""
+        from tabs.projects_tab import ProjectsTab
+        tab = ProjectsTab(self.db, self.query_executor)
+        if self.user_info['user_level'] == 'admin':
+            # プロジェクトデータ変更時に統計情報タブを更新するシグナル接続
+            tab.projectsChanged.connect(self.update_statistics)
+        return tab
+
+    def create_clients_tab(self):
+        """取引先マスタータブを作成する"""
+        from tabs.clients_tab import ClientsTab
+        return ClientsTab(self.db)
+
+    def create_workers_tab(self):
+        """作業員マスタータブを作成する"""
+        from tabs.workers_tab import WorkersTab
+        return WorkersTab(self.db)
+
+    def create_services_tab(self):
+        """サービスマスタータブを作成する"""
+        from tabs.services_tab import ServicesTab
+        return ServicesTab(self.db)
+
+    def create_work_orders_tab(self):
+        """業務指示書タブを作成する"""
+        from tabs.work_orders_tab import WorkOrdersTab
+        return WorkOrdersTab(self.db, self.query_executor)
+
+    def create_statistics_tab(self):
+        """統計情報タブを作成する（matplotlib はこの時に読み込まれる）"""
+        from tabs.statistics_tab import StatisticsTab
+        return StatisticsTab(self.db, self.query_executor)
+
     def closeEvent(self, event):
         """アプリケーション終了時の処理"""
         reply = QMessageBox.question(
@@ -150,8 +197,9 @@ class MainWindow(QMainWindow):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            # データベース接続を閉じる
-            self.db.close()
+            # バックグラウンドの問い合わせを止め、データベース接続を閉じる
+            self.query_executor.shutdown()
+            self.connections.close()
             event.accept()
         else:
             event.ignore()
@@ -159,12 +207,11 @@ class MainWindow(QMainWindow):
     def update_statistics(self):
         """統計情報タブのデータを更新する"""
         if hasattr(self, 'statistics_tab'):
-            # 現在表示されているタブのデータを更新
-            if hasattr(self.statistics_tab, 'update_all_stats'):
-                self.statistics_tab.update_all_stats()
+            # 統計ウィジェットを要更新にする（再計算は表示時に行われる）
+            self.statistics_tab.invalidate()
 
             # 現在の選択タブが統計タブの場合は画面を更新
-            if self.tab_widget.currentWidget() == self.statistics_tab:
+            if self.statistics_tab.isVisible():
                 self.status_label.setText("統計情報を更新しました")
 
 
@@ -192,44 +239,110 @@ def show_splash_screen():
 
     splash.show()
 
-    # 進行状況を更新する関数
-    def update_splash_message(message):
-        splash.showMessage(
-            message,
-            Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignCenter,
-            Qt.GlobalColor.white
-        )
-        # メッセージ更新後にイベントを処理して表示を確実に更新
-        QApplication.processEvents()
-
-    # 少し待機して初期化ステップを表示
-    timer = QTimer()
-    timer.singleShot(300, lambda: update_splash_message("データベース初期化中..."))
-    timer.singleShot(600, lambda: update_splash_message("モジュール読み込み中..."))
-    timer.singleShot(900, lambda: update_splash_message("インターフェース準備中..."))
-
     return splash
 
 
-def main():
-    """アプリケーションのメインエントリーポイント"""
-    # リソースディレクトリを確認し、存在しなければ作成
-    if not os.path.exists("resources"):
-        os.makedirs("resources")
-
-    # アプリケーション初期化
-    app = QApplication(sys.argv)
-
-    # スタイル適用
-    StyleManager.apply_styles(app)
-
-    # スプラッシュスクリーン表示
-    splash = show_splash_screen()
+class StartupPipeline(QObject):
+    """起動処理を段階ごとに実行し、実際の進行状況をスプラッシュ画面に表示するクラス
+
+    各段階はイベントループから1つずつ呼び出すため、段階の間に画面が更新される。
+    固定の待ち時間は設けず、全段階が終わった時点で finished を発行する
+    （スプラッシュ画面は finished を受け取るまで表示したままにする）。
+    各段階の所要時間は startup.profiler に記録する。
+    """
+
+    finished = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(self, splash, connections, parent=None):
+        super().__init__(parent)
+        self.splash = splash
+        self.connections = connections
+
+        # (スプラッシュに表示するメッセージ, 計測名, 処理)
+        self.steps = [
+            ("データベースを開いています...", "データベース接続", self.open_database),
+            ("データベースを更新しています...", "スキーマ準備・移行", self.prepare_schema),
+            ("マスターデータを読み込んでいます...", "マスターデータ読み込み", self.preload_master_data),
+            ("キャッシュを準備しています...", "キャッシュ準備", self.warm_caches),
+        ]
+        self._index = 0
+
+    def start(self):
+        """起動処理を開始する"""
+        QTimer.singleShot(0, self._run_next_step)
+
+    def show_progress(self, message):
+        """スプラッシュ画面に進行状況を表示する"""
+        self.splash.showMessage(
+            f"{message} ({self._index + 1}/{len(self.steps)})",
+            Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignCenter,
+            Qt.GlobalColor.white
+        )
 
-    # 少し待機してからログインダイアログを表示
-    QTimer.singleShot(1000, lambda: process_login(app, splash))
+    def _run_next_step(self):
+        """次の段階を実行する"""
+        if self._index >= len(self.steps):
+            self.finished.emit()
+            return
+
+        message, phase_name, step = self.steps[self._index]
+        self.show_progress(message)
+        try:
+            with profiler.phase(phase_name):
+                step()
+        except Exception as e:
+            print(f"起動処理中にエラーが発生しました（{phase_name}）: {str(e)}")
+            import traceback
+            traceback.print_exc()
 
-    sys.exit(app.exec())
+            reply = QMessageBox.question(
+                None,
+                "起動エラー",
+                f"起動処理中にエラーが発生しました: {str(e)}\n\n再試行しますか？",
+                QMessageBox.StandardButton.Retry | QMessageBox.StandardButton.Cancel,
+                QMessageBox.StandardButton.Retry
+            )
+            if reply == QMessageBox.StandardButton.Retry:
+                # 失敗した段階からやり直す
+                QTimer.singleShot(0, self._run_next_step)
+            else:
+                self.failed.emit(str(e))
+            return
+
+        self._index += 1
+        QTimer.singleShot(0, self._run_next_step)
+
+    def open_database(self):
+        """共有のデータベース接続を開く"""
+        self.connections.open()
+
+    def prepare_schema(self):
+        """テーブル作成とスキーマ移行を行う（最新の場合は省略される）"""
+        self.connections.ensure_schema()
+
+    def preload_master_data(self):
+        """取引先・サービス・作業員のマスターデータをキャッシュに読み込む"""
+        db = self.connections.database()
+        db.get_clients()
+        db.get_services()
+        db.get_workers()
+
+    def warm_caches(self):
+        """検索インデックスの有無と列名のキャッシュを準備する"""
+        db = self.connections.database()
+        for table in SEARCH_INDEXES:
+            db.has_search_index(table)
+            db.get_table_columns(table)
+
+
+def start_application(app, splash):
+    """起動処理を開始し、全ての段階が終わったらログインダイアログを表示する"""
+    pipeline = StartupPipeline(splash, ConnectionManager.get(), parent=app)
+    pipeline.finished.connect(lambda: process_login(app, splash))
+    pipeline.failed.connect(lambda message: app.exit(1))
+    pipeline.start()
+    return pipeline
 
 
 def process_login(app, splash):
@@ -239,8 +352,8 @@ def process_login(app, splash):
 
     print("===== ログイン処理を開始します =====")
 
-    # Database初期化
-    db = Database()
+    # Database初期化（プロセスで1度だけ開き、メインウィンドウと共有する）
+    db = ConnectionManager.get().database()
 
     # グローバル変数でウィンドウ参照を保持（ガベージコレクションされないように）
     global main_window
@@ -262,7 +375,8 @@ def process_login(app, splash):
             # メインウィンドウ初期化（ユーザー情報を渡す）
             print("メインウィンドウを初期化します...")
             try:
-                main_window = MainWindow(user_info)
+                with profiler.phase("メインウィンドウ作成"):
+                    main_window = MainWindow(user_info)
                 print("メインウィンドウの表示を試みます...")
                 main_window.setWindowTitle(f"株式会社ティーシー 業務管理システム - ユーザー: {user_info['user_id']}")
                 main_window.show()
@@ -274,6 +388,7 @@ def process_login(app, splash):
 
                 # イベントループを一時的に処理して表示を確実にする
                 app.processEvents()
+                profiler.report()
 
                 return  # ループを終了
             except Exception as e:
@@ -307,6 +422,3 @@ def process_login(app, splash):
                 return  # ループを終了
             # Noの場合はループが継続し、ログインダイアログが再表示される
 
-
-if __name__ == "__main__":
-    main()
@@ -1,39 +1,232 @@
 import sqlite3
 import os
+import copy
 import datetime
+import functools
 import hashlib
 import secrets
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from typing import List, Tuple, Dict, Any, Optional
 
+# スキーマバージョン（PRAGMA user_version に保存される）
+SCHEMA_VERSION = 6
+
+# 全文検索インデックス（テーブル名 -> (FTS5テーブル名, 対象列)）
+SEARCH_INDEXES = {
+    'projects': ('projects_fts', ('title', 'description', 'site_address')),
+    'work_orders': ('work_orders_fts', ('order_number', 'site_name', 'work_details', 'memo')),
+    'clients': ('clients_fts', ('name',)),
+    'workers': ('workers_fts', ('name',)),
+    'services': ('services_fts', ('name',)),
+}
+
+# trigram トークナイザーで全文検索できる最短の文字数（これより短い場合は LIKE で検索する）
+# trigram は3文字単位の索引のため、1〜2文字の検索（短い人名など）は索引を使えず、
+# LIKE による部分一致（全件走査）になる。前方一致にすれば索引を使えるが、
+# 部分一致で検索できなくなるため採用していない。
+# また読み（かな・漢字の表記揺れ）の違いは索引では吸収しない（読みの辞書が必要なため）。
+FTS_MIN_QUERY_LENGTH = 3
+
+# メモリ上にキャッシュするマスターデータのテーブル
+MASTER_TABLES = ('clients', 'services', 'workers')
+
+# トリガーで更新される集計テーブル（元テーブル -> 集計テーブル）
+# 元テーブルへの書き込みで集計テーブルの更新世代も進める
+DERIVED_TABLES = {
+    'projects': ('monthly_sales_rollup',),
+}
+
+# 問い合わせ結果キャッシュに保持する最大件数（超えた場合は最も古く使われた結果から破棄する）
+QUERY_CACHE_SIZE = 256
+
+# IN 句に1度に渡すパラメータの数（古い SQLite の上限 999 を超えないようにする）
+SQL_IN_CHUNK_SIZE = 500
+
+# パスワードリセットフラグ - Trueにすると起動時にパスワードをリセットして初期状態に戻す
+RESET_PASSWORDS = True
+
+# 接続時に設定する PRAGMA（値が None の項目は設定しない）
+DEFAULT_CONNECTION_PROFILE = {
+    # 読み込みと書き込みを同時に行えるよう WAL モードにする
+    'journal_mode': 'WAL',
+    # WAL モードではコミット毎の fsync を省略しても破損しない（電源断時に直前のコミットが失われる可能性のみ）
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    # 負の値は KiB 単位（約64MB）
+    'cache_size': -64000,
+    'temp_store': 'MEMORY',
+    # 参照されている行の削除は delete_project などで関連データを先に処理する
+    'foreign_keys': True,
+}
+
+# PRAGMA が返す数値と設定名の対応
+_PRAGMA_VALUE_NAMES = {
+    'synchronous': {0: 'OFF', 1: 'NORMAL', 2: 'FULL', 3: 'EXTRA'},
+    'temp_store': {0: 'DEFAULT', 1: 'FILE', 2: 'MEMORY'},
+}
+
+def cached_query(*tables: str):
+    """問い合わせ結果をキャッシュするデコレーター
+
+    キャッシュのキーはメソッド名・引数・参照するテーブルの更新世代からなり、
+    テーブルに書き込みがあると古い結果は使われなくなる（LRU で破棄される）。
+    呼び出し元が変更してもキャッシュに影響しないよう、結果の複製を返す。
+
+    Args:
+        tables: メソッドが参照するテーブル
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.has_uncommitted_changes(*tables):
+                # 未コミットの変更が見える接続の結果は他から使われないようキャッシュしない
+                return method(self, *args, **kwargs)
+
+            # 世代はコミット後に進めるため、問い合わせより先に読めば古い結果が新しい世代で保存されない
+            generations = tuple(self.table_generation(table) for table in tables)
+            key = (os.path.abspath(self.db_path), method.__name__, args,
+                   tuple(sorted(kwargs.items())), generations)
+            try:
+                found, result = self._query_cache_get(key)
+            except TypeError:
+                # ハッシュできない引数の場合はキャッシュしない
+                return method(self, *args, **kwargs)
+
+            if not found:
+                result = method(self, *args, **kwargs)
+                self._query_cache_put(key, result)
+            return copy.deepcopy(result)
+
+        wrapper.cached_tables = tables
+        return wrapper
+    return decorator
+
+
 class Database:
-    def __init__(self, db_path: str = 'tc_management.db'):
-        """データベース接続を初期化する"""
+    # テーブルの更新世代（(データベースファイルの絶対パス, テーブル名) -> 世代）
+    # 同じファイルを開いている全ての Database で共有し、書き込みの度に進める
+    _table_generations = {}
+    _generations_lock = threading.Lock()
+
+    # 問い合わせ結果のキャッシュ（cached_query で使用する。全ての Database で共有する）
+    _query_cache = OrderedDict()
+    _query_cache_lock = threading.Lock()
+    _query_cache_hits = 0
+    _query_cache_misses = 0
+    def __init__(self, db_path: str = 'tc_management.db', init_schema: bool = True,
+                 check_same_thread: bool = True, profile: Optional[Dict[str, Any]] = None):
+        """データベース接続を初期化する
+
+        Args:
+            db_path: データベースファイルのパス
+            init_schema: テーブル作成とスキーマ移行を行うかどうか
+            check_same_thread: 作成したスレッド以外からの接続利用を禁止するかどうか
+            profile: 既定の接続プロファイル（DEFAULT_CONNECTION_PROFILE）を上書きする設定
+        """
         self.db_path = db_path
+        self.check_same_thread = check_same_thread
+        self.profile = {**DEFAULT_CONNECTION_PROFILE, **(profile or {})}
         self.conn = None
         self.cursor = None
+        # 全文検索インデックスが使えるかどうか（テーブル名 -> bool）
+        self._search_index_available = {}
+        # transaction() の入れ子の深さ（0 の時は書き込みごとにコミットする）
+        self._transaction_depth = 0
+        # テーブルの列名のキャッシュ（テーブル名 -> 列名のタプル）
+        self._table_columns_cache = {}
+        # マスターデータのキャッシュ（テーブル名 -> (世代, 行のリスト)）
+        self._master_cache = {}
+        # 変更してまだコミットしていないテーブル（コミット・取り消しの後に世代を進める）
+        self._uncommitted_tables = set()
         self.connect()
-        self.create_tables()
+        if init_schema:
+            self.ensure_schema()
 
     def connect(self) -> None:
         """データベースに接続する"""
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=self.check_same_thread)
             self.conn.row_factory = sqlite3.Row
             self.cursor = self.conn.cursor()
+            self.apply_connection_profile()
         except sqlite3.Error as e:
             print(f"データベースへの接続エラー: {e}")
             raise
 
+    def apply_connection_profile(self) -> None:
+        """接続プロファイルの PRAGMA を設定する"""
+        for name, value in self.profile.items():
+            if value is None:
+                continue
+            # PRAGMAはパラメータを受け付けないため、検証した値を直接埋め込む
+            self.cursor.execute(f"PRAGMA {name} = {self._pragma_literal(name, value)}")
+
+    @staticmethod
+    def _pragma_literal(name: str, value: Any) -> str:
+        """PRAGMA に埋め込む値を検証して文字列にする"""
+        if name not in DEFAULT_CONNECTION_PROFILE:
+            raise ValueError(f"未対応の接続設定です: {name}")
+        if isinstance(value, bool):
+            return "ON" if value else "OFF"
+        if isinstance(value, int):
+            return str(int(value))
+        if isinstance(value, str) and value.isalpha():
+            return value.upper()
+        raise ValueError(f"不正な接続設定値です: {name}={value!r}")
+
+    def get_connection_settings(self) -> Dict[str, Any]:
+        """現在の接続で有効な PRAGMA の値を取得する"""
+        settings = {}
+        for name in DEFAULT_CONNECTION_PROFILE:
+            value = self.cursor.execute(f"PRAGMA {name}").fetchone()[0]
+            if name in _PRAGMA_VALUE_NAMES:
+                value = _PRAGMA_VALUE_NAMES[name].get(value, value)
+            elif name == 'foreign_keys':
+                value = bool(value)
+            elif isinstance(value, str):
+                value = value.upper()
+            settings[name] = value
+        return settings
+
+    def check_connection_settings(self) -> List[Tuple[str, Any, Any]]:
+        """接続設定がプロファイル通りか確認し、現在の設定を表示する
+
+        Returns:
+            プロファイルと異なる設定の (名前, 指定値, 実際の値) のリスト
+        """
+        settings = self.get_connection_settings()
+        print("データベース接続設定: " + ", ".join(f"{name}={value}" for name, value in settings.items()))
+
+        mismatches = []
+        for name, expected in self.profile.items():
+            if expected is None:
+                continue
+            if isinstance(expected, str):
+                expected = expected.upper()
+            actual = settings.get(name)
+            # mmap_size はビルド時の上限で切り詰められることがある
+            if name == 'mmap_size' and expected and actual:
+                continue
+            if actual != expected:
+                mismatches.append((name, expected, actual))
+
+        for name, expected, actual in mismatches:
+            # ネットワークドライブ上では WAL にできない場合などがある
+            print(f"警告: 接続設定 {name} が指定値 {expected} ではなく {actual} になっています")
+
+        return mismatches
+
     def close(self) -> None:
         """データベース接続を閉じる"""
         if self.conn:
             self.conn.close()
+            self.conn = None
+            self.cursor = None
 
     def create_tables(self) -> None:
         """必要なテーブルを作成する"""
-        # パスワードリセットフラグ - trueにするとパスワードをリセットして初期状態に戻す
-        reset_passwords = True
-
         # 取引先テーブル
         self.cursor.execute('''
         CREATE TABLE IF NOT EXISTS clients (
@@ -70,11 +263,7 @@ class Database:
         ''')
         
         # 既存のworkersテーブルに緊急連絡先住所フィールドを追加（存在しない場合のみ）
-        try:
-            self.cursor.execute('ALTER TABLE workers ADD COLUMN emergency_address TEXT')
-        except sqlite3.OperationalError:
-            # カラムが既に存在する場合は無視
-            pass
+        self._add_column_if_missing('workers', 'emergency_address', 'TEXT')
 
         # サービスマスターテーブル
         self.cursor.execute('''
@@ -213,10 +402,32 @@ class Database:
         )
         ''')
 
-        # パスワードテーブルの修正
+    def ensure_schema(self) -> None:
+        """スキーマを準備する
+
+        user_version が最新の場合はテーブル作成と移行を省略する。
+        パスワードテーブルはリセット設定（RESET_PASSWORDS）に従って毎回準備する。
+        """
+        if self.get_schema_version() < SCHEMA_VERSION:
+            self.create_tables()
+            self.apply_migrations()
+        elif not all(self.has_search_index(table) for table in SEARCH_INDEXES):
+            # v5 の移行時に FTS5 が使えなかった場合は、SQLite の更新後にここで作成する
+            try:
+                self.create_search_indexes()
+                self._commit()
+            except sqlite3.Error as e:
+                print(f"全文検索インデックスの作成エラー: {e}")
+                self._rollback()
+                raise
+
+        self.setup_password_table()
+
+    def setup_password_table(self, reset: bool = RESET_PASSWORDS) -> None:
+        """パスワードテーブルを準備する（存在しない場合は初期ユーザーを作成する）"""
         try:
             # パスワードリセットフラグがtrueの場合、既存のテーブルを削除
-            if reset_passwords:
+            if reset:
                 print("パスワードテーブルをリセットします")
                 self.cursor.execute("DROP TABLE IF EXISTS user_passwords")
                 self.conn.commit()
@@ -282,6 +493,446 @@ class Database:
             print(f"パスワードテーブルの処理中にエラー: {e}")
             raise
 
+    def get_schema_version(self) -> int:
+        """現在のスキーマバージョンを取得する"""
+        self.cursor.execute("PRAGMA user_version")
+        return self.cursor.fetchone()[0]
+
+    def apply_migrations(self) -> None:
+        """PRAGMA user_version に基づいて未適用のスキーマ移行を順に適用する"""
+        current_version = self.get_schema_version()
+        if current_version >= SCHEMA_VERSION:
+            return
+
+        migrations = [
+            (1, self._migrate_v1_indexes),
+            (2, self._migrate_v2_effective_date),
+            (3, self._migrate_v3_monthly_sales_rollup),
+            (4, self._migrate_v4_paging_indexes),
+            (5, self._migrate_v5_search_index),
+            (6, self._migrate_v6_sort_indexes),
+        ]
+
+        for version, migration in migrations:
+            if version <= current_version:
+                continue
+
+            try:
+                print(f"スキーマ移行を適用します: v{version}")
+                migration()
+                # PRAGMAはパラメータを受け付けないため整数を直接埋め込む
+                self.cursor.execute(f"PRAGMA user_version = {int(version)}")
+                self._commit()
+            except sqlite3.Error as e:
+                print(f"スキーマ移行エラー (v{version}): {e}")
+                self._rollback()
+                raise
+
+    def _migrate_v1_indexes(self) -> None:
+        """v1: 検索・絞り込みで頻繁に使われる列にインデックスを作成する"""
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_projects_client_id ON projects (client_id)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_projects_service_id ON projects (service_id)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_projects_status_completion ON projects (status, completion_date)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_project_workers_worker_id ON project_workers (worker_id)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_project_photos_project_created ON project_photos (project_id, created_at)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_work_orders_order_number ON work_orders (order_number)")
+
+    def _migrate_v2_effective_date(self) -> None:
+        """v2: 統計の集計基準日（完了日、なければ登録日）の年月を保持する列を追加する"""
+        self._add_column_if_missing('projects', 'effective_year', 'INTEGER')
+        self._add_column_if_missing('projects', 'effective_month', 'INTEGER')
+
+        # 既存データの年月を設定
+        self.cursor.execute('''
+        UPDATE projects SET
+            effective_year = CAST(strftime('%Y', COALESCE(completion_date, created_at)) AS INTEGER),
+            effective_month = CAST(strftime('%m', COALESCE(completion_date, created_at)) AS INTEGER)
+        ''')
+
+        self.cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_projects_effective ON projects (effective_year, effective_month)"
+        )
+
+        # 登録・更新時に年月を同期するトリガー
+        self.cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_projects_effective_date_insert
+        AFTER INSERT ON projects
+        BEGIN
+            UPDATE projects SET
+                effective_year = CAST(strftime('%Y', COALESCE(NEW.completion_date, NEW.created_at)) AS INTEGER),
+                effective_month = CAST(strftime('%m', COALESCE(NEW.completion_date, NEW.created_at)) AS INTEGER)
+            WHERE id = NEW.id;
+        END
+        ''')
+        self.cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_projects_effective_date_update
+        AFTER UPDATE OF completion_date, created_at ON projects
+        BEGIN
+            UPDATE projects SET
+                effective_year = CAST(strftime('%Y', COALESCE(NEW.completion_date, NEW.created_at)) AS INTEGER),
+                effective_month = CAST(strftime('%m', COALESCE(NEW.completion_date, NEW.created_at)) AS INTEGER)
+            WHERE id = NEW.id;
+        END
+        ''')
+
+    def _migrate_v3_monthly_sales_rollup(self) -> None:
+        """v3: 年月・取引先・サービス単位の売上集計テーブルを作成する"""
+        self.cursor.execute('''
+        CREATE TABLE IF NOT EXISTS monthly_sales_rollup (
+            year INTEGER NOT NULL,
+            month INTEGER NOT NULL,
+            client_id INTEGER NOT NULL,
+            service_id INTEGER NOT NULL,
+            total_price REAL NOT NULL DEFAULT 0,
+            project_count INTEGER NOT NULL DEFAULT 0,
+            trouble_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (year, month, client_id, service_id)
+        )
+        ''')
+
+        # 案件の登録・更新・削除に合わせて集計値を増減するトリガー
+        # （effective_year の同期トリガーとの実行順に依存しないよう、年月は NEW/OLD から直接求める）
+        def add_rollup(row: str) -> str:
+            year = f"CAST(strftime('%Y', COALESCE({row}.completion_date, {row}.created_at)) AS INTEGER)"
+            month = f"CAST(strftime('%m', COALESCE({row}.completion_date, {row}.created_at)) AS INTEGER)"
+            return f'''
+            INSERT OR IGNORE INTO monthly_sales_rollup (year, month, client_id, service_id)
+            SELECT {year}, {month}, {row}.client_id, {row}.service_id
+            WHERE {year} IS NOT NULL;
+            UPDATE monthly_sales_rollup SET
+                total_price = total_price + {row}.price,
+                project_count = project_count + 1,
+                trouble_count = trouble_count + (CASE WHEN {row}.has_trouble = 1 THEN 1 ELSE 0 END)
+            WHERE year = {year} AND month = {month}
+              AND client_id = {row}.client_id AND service_id = {row}.service_id;
+            '''
+
+        def subtract_rollup(row: str) -> str:
+            year = f"CAST(strftime('%Y', COALESCE({row}.completion_date, {row}.created_at)) AS INTEGER)"
+            month = f"CAST(strftime('%m', COALESCE({row}.completion_date, {row}.created_at)) AS INTEGER)"
+            return f'''
+            UPDATE monthly_sales_rollup SET
+                total_price = total_price - {row}.price,
+                project_count = project_count - 1,
+                trouble_count = trouble_count - (CASE WHEN {row}.has_trouble = 1 THEN 1 ELSE 0 END)
+            WHERE year = {year} AND month = {month}
+              AND client_id = {row}.client_id AND service_id = {row}.service_id;
+            DELETE FROM monthly_sales_rollup
+            WHERE year = {year} AND month = {month}
+              AND client_id = {row}.client_id AND service_id = {row}.service_id
+              AND project_count <= 0;
+            '''
+
+        self.cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_projects_rollup_insert
+        AFTER INSERT ON projects
+        BEGIN
+            {add_rollup("NEW")}
+        END
+        ''')
+        self.cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_projects_rollup_update
+        AFTER UPDATE OF client_id, service_id, price, has_trouble, completion_date, created_at ON projects
+        BEGIN
+            {subtract_rollup("OLD")}
+            {add_rollup("NEW")}
+        END
+        ''')
+        self.cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_projects_rollup_delete
+        AFTER DELETE ON projects
+        BEGIN
+            {subtract_rollup("OLD")}
+        END
+        ''')
+
+        self.rebuild_sales_rollup(commit=False)
+
+    def _migrate_v4_paging_indexes(self) -> None:
+        """v4: 一覧のキーセットページング（作成日時 + ID順）用のインデックスを作成する"""
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_projects_created_at ON projects (created_at, id)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_work_orders_created_at ON work_orders (created_at, id)")
+
+    def _migrate_v5_search_index(self) -> None:
+        """v5: 全文検索用の FTS5 インデックス（trigram トークナイザー）を作成する"""
+        # 古いデータベースには MEMO 列がないため、索引対象の列を先に揃える
+        self._add_column_if_missing('work_orders', 'memo', 'TEXT')
+        self.create_search_indexes()
+
+    def _migrate_v6_sort_indexes(self) -> None:
+        """v6: 案件一覧の並び替え（金額・件名 + ID順）のキーセットページング用のインデックスを作成する"""
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_projects_price ON projects (price, id)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_projects_title ON projects (title, id)")
+
+    def create_search_indexes(self) -> bool:
+        """全文検索用の FTS5 インデックスと同期用のトリガーを作成する（作成済みのものは作り直さない）
+
+        FTS5 や trigram トークナイザーが使えない SQLite では作成せずに False を返す
+        （検索は LIKE のままになり、次回の起動時に ensure_schema() で再度作成を試みる）。
+        """
+        for table, (fts_table, columns) in SEARCH_INDEXES.items():
+            column_list = ", ".join(columns)
+            try:
+                # 本文は元テーブルから参照する（external content）
+                self.cursor.execute(f'''
+                CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5(
+                    {column_list}, content='{table}', content_rowid='id', tokenize='trigram'
+                )
+                ''')
+            except sqlite3.OperationalError as e:
+                # FTS5 や trigram トークナイザーが使えない SQLite では LIKE 検索のままにする
+                print(f"全文検索インデックスを作成できません（LIKE検索を使用します）: {e}")
+                self._search_index_available.clear()
+                return False
+
+            new_values = ", ".join(f"NEW.{column}" for column in columns)
+            old_values = ", ".join(f"OLD.{column}" for column in columns)
+
+            # 元テーブルの変更に合わせてインデックスを更新するトリガー
+            self.cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_fts_insert
+            AFTER INSERT ON {table}
+            BEGIN
+                INSERT INTO {fts_table} (rowid, {column_list}) VALUES (NEW.id, {new_values});
+            END
+            ''')
+            self.cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_fts_update
+            AFTER UPDATE OF {column_list} ON {table}
+            BEGIN
+                INSERT INTO {fts_table} ({fts_table}, rowid, {column_list}) VALUES ('delete', OLD.id, {old_values});
+                INSERT INTO {fts_table} (rowid, {column_list}) VALUES (NEW.id, {new_values});
+            END
+            ''')
+            self.cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_fts_delete
+            AFTER DELETE ON {table}
+            BEGIN
+                INSERT INTO {fts_table} ({fts_table}, rowid, {column_list}) VALUES ('delete', OLD.id, {old_values});
+            END
+            ''')
+
+            # 既存データでインデックスを作成する
+            self.cursor.execute(f"INSERT INTO {fts_table} ({fts_table}) VALUES ('rebuild')")
+
+        self._search_index_available.clear()
+        return True
+
+    def rebuild_sales_rollup(self, commit: bool = True) -> None:
+        """売上集計テーブルを案件データから作り直す"""
+        self.cursor.execute("DELETE FROM monthly_sales_rollup")
+        self.cursor.execute('''
+        INSERT INTO monthly_sales_rollup
+            (year, month, client_id, service_id, total_price, project_count, trouble_count)
+        SELECT
+            effective_year,
+            effective_month,
+            client_id,
+            service_id,
+            SUM(price),
+            COUNT(*),
+            SUM(CASE WHEN has_trouble = 1 THEN 1 ELSE 0 END)
+        FROM projects
+        WHERE effective_year IS NOT NULL
+        GROUP BY effective_year, effective_month, client_id, service_id
+        ''')
+        self.mark_tables_changed('monthly_sales_rollup')
+        if commit:
+            self._commit()
+
+    def _add_column_if_missing(self, table: str, column: str, definition: str) -> None:
+        """カラムが存在しない場合のみ追加する"""
+        self.cursor.execute(f"PRAGMA table_info({table})")
+        existing_columns = [row['name'] for row in self.cursor.fetchall()]
+        if column not in existing_columns:
+            self.cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            self._table_columns_cache.pop(table, None)
+
+    def get_table_columns(self, table: str) -> Tuple[str, ...]:
+        """テーブルの列名を取得する（PRAGMA table_info の結果をキャッシュする）"""
+        if table not in self._table_columns_cache:
+            self.cursor.execute(f"PRAGMA table_info({table})")
+            columns = tuple(row['name'] for row in self.cursor.fetchall())
+            if not columns:
+                raise ValueError(f"テーブルが存在しません: {table}")
+            self._table_columns_cache[table] = columns
+        return self._table_columns_cache[table]
+
+    def _bulk_columns(self, table: str, rows: List[Dict[str, Any]]) -> List[str]:
+        """一括処理する行の列名を検証して取得する（全ての行が同じキーを持つこと）"""
+        columns = list(rows[0].keys())
+        unknown = [column for column in columns if column not in self.get_table_columns(table)]
+        if unknown:
+            raise ValueError(f"{table} に存在しない列です: {', '.join(unknown)}")
+        for row in rows:
+            if len(row) != len(columns) or any(column not in row for column in columns):
+                raise ValueError("一括処理する行のキーが揃っていません")
+        return columns
+
+    @contextmanager
+    def transaction(self):
+        """複数の書き込みを1回のコミットにまとめる
+
+        ブロック内の insert/update/delete などはコミットせず、ブロックを正常に
+        抜けた時にまとめてコミットし、例外が発生した場合はすべて取り消す。
+        入れ子にした場合は SAVEPOINT を使い、内側のブロックの例外では
+        内側の変更だけを取り消す（例外はそのまま呼び出し元に伝わる）。
+        ブロックの外でコミットされていない変更が残っている場合は、無関係な変更を
+        まとめてコミット・取り消ししないよう sqlite3.ProgrammingError を送出する。
+
+        使用例:
+            with db.transaction():
+                db.update('projects', data, "id = ?", (project_id,))
+                db.delete('project_workers', "project_id = ?", (project_id,))
+        """
+        depth = self._transaction_depth
+        savepoint = f"sp_{depth}"
+
+        if depth == 0:
+            if self.conn.in_transaction:
+                raise sqlite3.ProgrammingError("コミットされていない変更があるためトランザクションを開始できません")
+            # 書き込みロックを先に確保して、途中でのロック待ち失敗を防ぐ
+            self.cursor.execute("BEGIN IMMEDIATE")
+        else:
+            self.cursor.execute(f"SAVEPOINT {savepoint}")
+
+        self._transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._transaction_depth = depth
+            if depth == 0:
+                self.conn.rollback()
+                # 取り消し前の内容をキャッシュしている可能性があるため世代を進める
+                self._publish_table_changes()
+            else:
+                # 外側のトランザクションが終わった時にまとめて世代を進める
+                self.cursor.execute(f"ROLLBACK TO {savepoint}")
+                self.cursor.execute(f"RELEASE {savepoint}")
+            raise
+
+        self._transaction_depth = depth
+        if depth == 0:
+            try:
+                self.conn.commit()
+            except sqlite3.Error as e:
+                print(f"コミットエラー: {e}")
+                self.conn.rollback()
+                raise
+            finally:
+                # コミット（または取り消し）が終わってから世代を進める
+                self._publish_table_changes()
+        else:
+            self.cursor.execute(f"RELEASE {savepoint}")
+
+    def in_transaction(self) -> bool:
+        """transaction() のブロック内かどうか"""
+        return self._transaction_depth > 0
+
+    def _generation_key(self, table: str) -> Tuple[str, str]:
+        return (os.path.abspath(self.db_path), table)
+
+    def table_generation(self, table: str) -> int:
+        """テーブルの更新世代を取得する（書き込みの度に増える）"""
+        with self._generations_lock:
+            return self._table_generations.get(self._generation_key(table), 0)
+
+    def query_generation(self, method_name: str) -> Tuple[int, ...]:
+        """cached_query を付けたメソッドが参照するテーブルの更新世代を取得する"""
+        tables = getattr(type(self), method_name).cached_tables
+        return tuple(self.table_generation(table) for table in tables)
+
+    def mark_tables_changed(self, *tables: str) -> None:
+        """テーブルの変更を記録し、そのテーブルのキャッシュを無効にする
+
+        コミット前の変更は記録だけ行い、コミット・取り消しの後で世代を進める。
+        コミット前に世代を進めると、他のスレッドがその間に読んだ変更前の
+        結果が新しい世代のキャッシュとして残ってしまうため。
+        """
+        if self._transaction_depth > 0 or (self.conn is not None and self.conn.in_transaction):
+            self._uncommitted_tables.update(tables)
+        else:
+            self._bump_generations(tables)
+
+    def has_uncommitted_changes(self, *tables: str) -> bool:
+        """テーブルにこの接続のコミット前の変更があるかどうか"""
+        if not self._uncommitted_tables:
+            return False
+        return not self._with_derived_tables(tables).isdisjoint(
+            self._with_derived_tables(self._uncommitted_tables))
+
+    def _publish_table_changes(self) -> None:
+        """コミット・取り消しの後に、変更を記録したテーブルの世代を進める"""
+        tables = self._uncommitted_tables
+        self._uncommitted_tables = set()
+        self._bump_generations(tables)
+
+    @staticmethod
+    def _with_derived_tables(tables) -> set:
+        """テーブルとその集計テーブルの集合"""
+        changed = set(tables)
+        for table in tables:
+            changed.update(DERIVED_TABLES.get(table, ()))
+        return changed
+
+    def _bump_generations(self, tables) -> None:
+        """テーブルの更新世代を進める"""
+        with self._generations_lock:
+            for table in self._with_derived_tables(tables):
+                key = self._generation_key(table)
+                self._table_generations[key] = self._table_generations.get(key, 0) + 1
+
+    def _query_cache_get(self, key: Tuple) -> Tuple[bool, Any]:
+        """キャッシュから結果を取得する（(見つかったかどうか, 結果) を返す）"""
+        cls = Database
+        with cls._query_cache_lock:
+            if key in cls._query_cache:
+                cls._query_cache.move_to_end(key)
+                cls._query_cache_hits += 1
+                return True, cls._query_cache[key]
+            cls._query_cache_misses += 1
+            return False, None
+
+    def _query_cache_put(self, key: Tuple, result: Any) -> None:
+        """結果をキャッシュに保存する"""
+        cls = Database
+        with cls._query_cache_lock:
+            cls._query_cache[key] = result
+            cls._query_cache.move_to_end(key)
+            while len(cls._query_cache) > QUERY_CACHE_SIZE:
+                cls._query_cache.popitem(last=False)
+
+    @classmethod
+    def query_cache_info(cls) -> Dict[str, int]:
+        """問い合わせ結果キャッシュのヒット数・ミス数・件数を取得する"""
+        with cls._query_cache_lock:
+            return {
+                'hits': cls._query_cache_hits,
+                'misses': cls._query_cache_misses,
+                'size': len(cls._query_cache),
+                'max_size': QUERY_CACHE_SIZE,
+            }
+
+    @classmethod
+    def clear_query_cache(cls) -> None:
+        """問い合わせ結果キャッシュを空にし、ヒット数・ミス数を0に戻す"""
+        with cls._query_cache_lock:
+            cls._query_cache.clear()
+            cls._query_cache_hits = 0
+            cls._query_cache_misses = 0
+
+    def _commit(self) -> None:
+        """トランザクション外であればコミットし、変更したテーブルの世代を進める"""
+        if self._transaction_depth == 0:
+            self.conn.commit()
+            self._publish_table_changes()
+
+    def _rollback(self) -> None:
+        """トランザクション外であればロールバックする（ブロック内では transaction() に任せる）"""
+        if self._transaction_depth == 0:
+            self.conn.rollback()
+            self._publish_table_changes()
+
     def insert(self, table: str, data: Dict[str, Any]) -> int:
         """データをテーブルに挿入する"""
         columns = ', '.join(data.keys())
@@ -292,11 +943,12 @@ class Database:
 
         try:
             self.cursor.execute(query, values)
-            self.conn.commit()
+            self.mark_tables_changed(table)
+            self._commit()
             return self.cursor.lastrowid
         except sqlite3.Error as e:
             print(f"挿入エラー: {e}")
-            self.conn.rollback()
+            self._rollback()
             raise
 
     def update(self, table: str, data: Dict[str, Any], condition: str, values: Tuple) -> None:
@@ -308,10 +960,11 @@ class Database:
 
         try:
             self.cursor.execute(query, all_values)
-            self.conn.commit()
+            self.mark_tables_changed(table)
+            self._commit()
         except sqlite3.Error as e:
             print(f"更新エラー: {e}")
-            self.conn.rollback()
+            self._rollback()
             raise
 
     def delete(self, table: str, condition: str, values: Tuple) -> None:
@@ -320,10 +973,108 @@ class Database:
 
         try:
             self.cursor.execute(query, values)
-            self.conn.commit()
+            self.mark_tables_changed(table)
+            self._commit()
         except sqlite3.Error as e:
             print(f"削除エラー: {e}")
-            self.conn.rollback()
+            self._rollback()
+            raise
+
+    def insert_many(self, table: str, rows: List[Dict[str, Any]]) -> int:
+        """複数の行をまとめて挿入する
+
+        Returns:
+            挿入した行数
+        """
+        if not rows:
+            return 0
+
+        columns = self._bulk_columns(table, rows)
+        placeholders = ', '.join(['?' for _ in columns])
+        query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+        try:
+            self.cursor.executemany(query, [tuple(row[column] for column in columns) for row in rows])
+            self.mark_tables_changed(table)
+            self._commit()
+            return self.cursor.rowcount
+        except sqlite3.Error as e:
+            print(f"一括挿入エラー: {e}")
+            self._rollback()
+            raise
+
+    def upsert_many(self, table: str, rows: List[Dict[str, Any]], conflict_columns: Tuple[str, ...],
+                    update_columns: Optional[Tuple[str, ...]] = None) -> int:
+        """複数の行をまとめて挿入し、一意制約が重複する行は更新する
+
+        Args:
+            table: テーブル名
+            rows: 挿入する行（全ての行が同じキーを持つこと）
+            conflict_columns: 重複を判定する一意制約の列
+            update_columns: 重複時に更新する列（省略時は conflict_columns 以外の全ての列。
+                            空のタプルを指定した場合は重複行を何もせずに残す）
+
+        Returns:
+            挿入・更新した行数
+        """
+        if not rows:
+            return 0
+
+        columns = self._bulk_columns(table, rows)
+        if update_columns is None:
+            update_columns = [column for column in columns if column not in conflict_columns]
+
+        placeholders = ', '.join(['?' for _ in columns])
+        query = (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) "
+                 f"ON CONFLICT ({', '.join(conflict_columns)}) ")
+
+        if update_columns:
+            assignments = [f"{column} = excluded.{column}" for column in update_columns]
+            if 'updated_at' in self.get_table_columns(table) and 'updated_at' not in update_columns:
+                assignments.append("updated_at = CURRENT_TIMESTAMP")
+            query += "DO UPDATE SET " + ', '.join(assignments)
+        else:
+            query += "DO NOTHING"
+
+        try:
+            self.cursor.executemany(query, [tuple(row[column] for column in columns) for row in rows])
+            self.mark_tables_changed(table)
+            self._commit()
+            return self.cursor.rowcount
+        except sqlite3.Error as e:
+            print(f"一括登録エラー: {e}")
+            self._rollback()
+            raise
+
+    def delete_many(self, table: str, key_columns: Tuple[str, ...], keys: List[Tuple]) -> int:
+        """キーが一致する複数の行をまとめて削除する
+
+        Args:
+            table: テーブル名
+            key_columns: 行を特定する列
+            keys: 削除する行のキーの値（key_columns と同じ順のタプル）のリスト
+
+        Returns:
+            削除した行数
+        """
+        if not keys:
+            return 0
+
+        unknown = [column for column in key_columns if column not in self.get_table_columns(table)]
+        if unknown:
+            raise ValueError(f"{table} に存在しない列です: {', '.join(unknown)}")
+
+        condition = ' AND '.join(f"{column} = ?" for column in key_columns)
+        query = f"DELETE FROM {table} WHERE {condition}"
+
+        try:
+            self.cursor.executemany(query, [tuple(key) for key in keys])
+            self.mark_tables_changed(table)
+            self._commit()
+            return self.cursor.rowcount
+        except sqlite3.Error as e:
+            print(f"一括削除エラー: {e}")
+            self._rollback()
             raise
 
     def select(self, table: str, columns: str = "*", condition: str = "", values: Tuple = ()) -> List[Dict]:
@@ -350,48 +1101,282 @@ class Database:
             print(f"クエリ実行エラー: {e}")
             raise
 
+    def has_search_index(self, table: str) -> bool:
+        """テーブルの全文検索インデックスが使えるかどうか"""
+        if table not in self._search_index_available:
+            fts_table = SEARCH_INDEXES[table][0]
+            try:
+                # 作成後に trigram 非対応の SQLite で開いた場合もここで失敗する
+                self.cursor.execute(f"SELECT rowid FROM {fts_table} LIMIT 0")
+                available = True
+            except sqlite3.OperationalError:
+                available = False
+            self._search_index_available[table] = available
+        return self._search_index_available[table]
+
+    def _use_search_index(self, table: str, text: str) -> bool:
+        """検索テキストを全文検索インデックスで検索できるかどうか"""
+        return len(text) >= FTS_MIN_QUERY_LENGTH and self.has_search_index(table)
+
+    @staticmethod
+    def _match_expression(text: str, columns: Tuple[str, ...]) -> str:
+        """検索テキストを指定列の部分一致として検索する MATCH 式を作成する"""
+        phrase = '"' + text.replace('"', '""') + '"'
+        return "{" + " ".join(columns) + "} : " + phrase
+
+    def search_condition(self, table: str, text: str, alias: str = None,
+                         columns: Tuple[str, ...] = None) -> Tuple[str, Tuple]:
+        """検索テキストを含む行に絞り込むWHERE条件を作成する
+
+        3文字以上の場合は全文検索インデックスを使い、それより短い場合や
+        インデックスが使えない場合は LIKE による部分一致で検索する。
+
+        Args:
+            table: 検索対象のテーブル名（SEARCH_INDEXES のキー）
+            text: 検索テキスト
+            alias: クエリ中のテーブルの別名
+            columns: 検索する列（省略時はインデックスの全対象列）
+
+        Returns:
+            (条件文字列, パラメータ)
+        """
+        fts_table, indexed_columns = SEARCH_INDEXES[table]
+        columns = tuple(columns or indexed_columns)
+        prefix = f"{alias}." if alias else ""
+
+        if self._use_search_index(table, text):
+            return (
+                f"{prefix}id IN (SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH ?)",
+                (self._match_expression(text, columns),)
+            )
+
+        condition = " OR ".join(f"{prefix}{column} LIKE ?" for column in columns)
+        return f"({condition})", tuple(f"%{text}%" for _ in columns)
+
+    def search(self, table: str, text: str, limit: int = None) -> List[Dict]:
+        """検索テキストを含む行を関連度の高い順に取得する
+
+        全文検索インデックスを使う場合は bm25 の順位、LIKE で検索する場合は
+        先頭の対象列の完全一致・前方一致・部分一致の順に並べる。
+        """
+        fts_table, columns = SEARCH_INDEXES[table]
+
+        if self._use_search_index(table, text):
+            query = f'''
+            SELECT t.* FROM {fts_table}
+            JOIN {table} t ON t.id = {fts_table}.rowid
+            WHERE {fts_table} MATCH ?
+            ORDER BY {fts_table}.rank
+            '''
+            values = (self._match_expression(text, columns),)
+        else:
+            condition, values = self.search_condition(table, text)
+            query = f'''
+            SELECT * FROM {table}
+            WHERE {condition}
+            ORDER BY CASE WHEN {columns[0]} = ? THEN 0 WHEN {columns[0]} LIKE ? THEN 1 ELSE 2 END, id
+            '''
+            values += (text, f"{text}%")
+
+        if limit is not None:
+            query += " LIMIT ?"
+            values += (int(limit),)
+
+        return self.execute_query(query, values)
+
     # 特定のテーブルに関するメソッド
+    def get_master_data(self, table: str) -> List[Dict]:
+        """マスターデータ（名前順）を取得する
+
+        テーブルの更新世代が変わるまではメモリ上のキャッシュから返す。
+        呼び出し元が変更してもキャッシュに影響しないよう、各行の複製を返す。
+        """
+        if table not in MASTER_TABLES:
+            raise ValueError(f"マスターデータのテーブルではありません: {table}")
+
+        if self.has_uncommitted_changes(table):
+            # コミット前の変更が見える結果はキャッシュしない
+            return self.select(table, condition="1 ORDER BY name")
+
+        # 世代はコミット後に進めるため、問い合わせより先に読んでおく
+        generation = self.table_generation(table)
+        cached = self._master_cache.get(table)
+        if cached is None or cached[0] != generation:
+            rows = self.select(table, condition="1 ORDER BY name")
+            cached = (generation, rows)
+            self._master_cache[table] = cached
+
+        return [dict(row) for row in cached[1]]
+
     def get_clients(self) -> List[Dict]:
         """すべての取引先を取得する"""
-        return self.select('clients', condition="1 ORDER BY name")
+        return self.get_master_data('clients')
 
     def get_workers(self) -> List[Dict]:
         """すべての作業員を取得する"""
-        return self.select('workers', condition="1 ORDER BY name")
+        return self.get_master_data('workers')
 
     def get_services(self) -> List[Dict]:
         """すべてのサービスを取得する"""
-        return self.select('services', condition="1 ORDER BY name")
-
-    def get_projects(self, condition: str = "", values: Tuple = (), sort_column: str = "created_at", sort_order: str = "DESC") -> List[Dict]:
-        """案件を取得する"""
-        query = """
+        return self.get_master_data('services')
+
+    def delete_client(self, client_id: int) -> None:
+        """取引先とその案件を削除する"""
+        with self.transaction():
+            self.delete_projects("client_id = ?", (client_id,))
+            self.delete('clients', "id = ?", (client_id,))
+
+    def delete_service(self, service_id: int) -> None:
+        """サービスとその案件を削除する"""
+        with self.transaction():
+            self.delete_projects("service_id = ?", (service_id,))
+            self.delete('services', "id = ?", (service_id,))
+
+    def delete_worker(self, worker_id: int) -> None:
+        """作業員を削除する（案件・業務指示書からの参照は外して残す）"""
+        with self.transaction():
+            self.delete('project_workers', "worker_id = ?", (worker_id,))
+            self.update('projects', {'trouble_worker_id': None}, "trouble_worker_id = ?", (worker_id,))
+            self.update('work_orders', {'manager_id': None}, "manager_id = ?", (worker_id,))
+            self.update('work_orders', {'creator_id': None}, "creator_id = ?", (worker_id,))
+            self.delete('workers', "id = ?", (worker_id,))
+
+    # 案件一覧で並び替えに使用できる列
+    PROJECT_SORT_COLUMNS = ["created_at", "title", "price", "status", "start_date", "end_date", "completion_date"]
+
+    # NULLを含みうる並び替え列（キーセットページングでは NULL の行を別の区間として取得する）
+    NULLABLE_PROJECT_SORT_COLUMNS = ["start_date", "end_date", "completion_date"]
+
+    def _projects_base_query(self, include_workers: bool = False) -> str:
+        """案件取得用のSELECT文（WHERE句より前）を作成する"""
+        worker_names_column = ""
+        if include_workers:
+            worker_names_column = """,
+               (SELECT GROUP_CONCAT(pw_w.name, ', ')
+                FROM project_workers pw
+                JOIN workers pw_w ON pw.worker_id = pw_w.id
+                WHERE pw.project_id = p.id) as worker_names"""
+
+        return f"""
         SELECT p.*, c.name as client_name, s.name as service_name,
-               w.name as trouble_worker_name
+               w.name as trouble_worker_name{worker_names_column}
         FROM projects p
         JOIN clients c ON p.client_id = c.id
         JOIN services s ON p.service_id = s.id
         LEFT JOIN workers w ON p.trouble_worker_id = w.id
         """
 
-        if condition:
-            query += f" WHERE {condition}"
-
-        # ソートパラメータを安全に使用するためのリスト
-        allowed_columns = ["created_at", "title", "price", "status", "start_date", "end_date", "completion_date"]
-        allowed_orders = ["ASC", "DESC"]
-
-        # パラメータの検証
-        if sort_column not in allowed_columns:
+    def _validate_project_sort(self, sort_column: str, sort_order: str) -> Tuple[str, str]:
+        """並び替えパラメータを検証する（不正な値はデフォルト値に置き換える）"""
+        if sort_column not in self.PROJECT_SORT_COLUMNS:
             sort_column = "created_at"  # デフォルト値
 
-        if sort_order not in allowed_orders:
+        if sort_order not in ["ASC", "DESC"]:
             sort_order = "DESC"  # デフォルト値
 
+        return sort_column, sort_order
+
+    def get_projects(self, condition: str = "", values: Tuple = (), sort_column: str = "created_at", sort_order: str = "DESC",
+                     include_workers: bool = False) -> List[Dict]:
+        """案件を取得する
+
+        include_workers が True の場合、担当作業員名をカンマ区切りで集約した
+        worker_names 列を付加する（一覧表示で行ごとの問い合わせを避けるため）
+        """
+        query = self._projects_base_query(include_workers)
+
+        if condition:
+            query += f" WHERE {condition}"
+
+        sort_column, sort_order = self._validate_project_sort(sort_column, sort_order)
         query += f" ORDER BY p.{sort_column} {sort_order}"
 
         return self.execute_query(query, values)
 
+    def get_projects_page(self, condition: str = "", values: Tuple = (), sort_column: str = "created_at",
+                          sort_order: str = "DESC", after: Optional[Tuple] = None, limit: int = 200,
+                          include_workers: bool = False) -> Tuple[List[Dict], Optional[Tuple]]:
+        """案件を1ページ分取得する（並び替え列とIDによるキーセットページング）
+
+        Args:
+            after: 前のページの最終行を表すカーソル。最初のページは None
+            limit: 1ページの件数
+
+        Returns:
+            (案件のリスト, 次のページのカーソル。最後のページの場合は None)
+        """
+        sort_column, sort_order = self._validate_project_sort(sort_column, sort_order)
+
+        base_query = self._projects_base_query(include_workers)
+        rows = []
+        # 1件多く取得して次のページの有無を判定する
+        for range_condition, range_params in self._project_page_ranges(sort_column, sort_order, after):
+            conditions = [f"({part})" for part in (condition, range_condition) if part]
+            query = base_query
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+            query += f" ORDER BY p.{sort_column} {sort_order}, p.id {sort_order} LIMIT ?"
+            params = tuple(values) + range_params + (limit + 1 - len(rows),)
+            rows.extend(self.execute_query(query, params))
+            if len(rows) > limit:
+                break
+
+        if len(rows) <= limit:
+            return rows, None
+
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, (last[sort_column], last['id'])
+
+    def _project_page_ranges(self, sort_column: str, sort_order: str,
+                             after: Optional[Tuple]) -> List[Tuple[str, Tuple]]:
+        """カーソルより後の行を表す条件を、並び順に区間ごとに返す
+
+        並び替え列をそのまま比較してインデックスで範囲を絞り込めるようにする。
+        NULL は行値の比較に一致しないため、NULL を含みうる列では NULL の行を
+        別の区間にする（SQLite では NULL は昇順で先頭、降順で末尾に並ぶ）。
+        """
+        column = f"p.{sort_column}"
+        operator = "<" if sort_order == "DESC" else ">"
+
+        if sort_column not in self.NULLABLE_PROJECT_SORT_COLUMNS:
+            if after is None:
+                return [("", ())]
+            return [(f"({column}, p.id) {operator} (?, ?)", tuple(after))]
+
+        null_range = (f"{column} IS NULL", ())
+        value_range = (f"{column} IS NOT NULL", ())
+        if after is not None:
+            sort_value, last_id = after
+            if sort_value is None:
+                null_range = (f"{column} IS NULL AND p.id {operator} ?", (last_id,))
+                # NULL の区間の途中から再開する場合、降順では値のある行は取得済み
+                if sort_order == "DESC":
+                    return [null_range]
+            else:
+                value_range = (f"({column}, p.id) {operator} (?, ?)", (sort_value, last_id))
+                # 値のある区間の途中から再開する場合、昇順では NULL の行は取得済み
+                if sort_order == "ASC":
+                    return [value_range]
+
+        if sort_order == "DESC":
+            return [value_range, null_range]
+        return [null_range, value_range]
+
+    def iter_projects(self, condition: str = "", values: Tuple = (), sort_column: str = "created_at",
+                      sort_order: str = "DESC", page_size: int = 200, include_workers: bool = False):
+        """案件をページ単位で順に返すジェネレーター"""
+        cursor = None
+        while True:
+            rows, cursor = self.get_projects_page(
+                condition, values, sort_column, sort_order,
+                after=cursor, limit=page_size, include_workers=include_workers
+            )
+            if rows:
+                yield rows
+            if cursor is None:
+                return
+
     def get_projects_by_date_range(self, start_date: str, end_date: str) -> List[Dict]:
         """日付範囲で案件を取得する"""
         condition = "(p.start_date BETWEEN ? AND ?) OR (p.end_date BETWEEN ? AND ?) OR (? BETWEEN p.start_date AND p.end_date) OR (? BETWEEN p.start_date AND p.end_date)"
@@ -409,20 +1394,56 @@ class Database:
         return self.execute_query(query, (project_id,))
 
     def add_project_worker(self, project_id: int, worker_id: int) -> None:
-        """案件に作業員を追加する"""
-        try:
-            self.insert('project_workers', {
-                'project_id': project_id,
-                'worker_id': worker_id
-            })
-        except sqlite3.IntegrityError:
-            # 既に存在する場合は無視
-            pass
+        """案件に作業員を追加する（既に存在する場合は何もしない）"""
+        self.upsert_many(
+            'project_workers',
+            [{'project_id': project_id, 'worker_id': worker_id}],
+            conflict_columns=('project_id', 'worker_id'),
+            update_columns=()
+        )
+
+    def set_project_workers(self, project_id: int, worker_ids: List[int]) -> None:
+        """案件の担当作業員を指定した作業員に置き換える"""
+        with self.transaction():
+            # 書き込みロックを確保してから現在の担当作業員を読み込む（差分が古い内容にならないように）
+            current_ids = {
+                row['worker_id']
+                for row in self.select('project_workers', 'worker_id', 'project_id = ?', (project_id,))
+            }
+
+            # 外れた作業員だけを削除し、新しく追加された作業員だけを登録する
+            self.delete_many(
+                'project_workers', ('project_id', 'worker_id'),
+                [(project_id, worker_id) for worker_id in current_ids - set(worker_ids)]
+            )
+            self.upsert_many(
+                'project_workers',
+                [{'project_id': project_id, 'worker_id': worker_id} for worker_id in worker_ids],
+                conflict_columns=('project_id', 'worker_id'),
+                update_columns=()
+            )
 
     def remove_project_worker(self, project_id: int, worker_id: int) -> None:
         """案件から作業員を削除する"""
         self.delete('project_workers', 'project_id = ? AND worker_id = ?', (project_id, worker_id))
 
+    @cached_query('clients', 'monthly_sales_rollup')
+    def delete_project(self, project_id: int) -> None:
+        """案件を関連データとともに削除する"""
+        self.delete_projects("id = ?", (project_id,))
+
+    def delete_projects(self, condition: str, values: Tuple) -> None:
+        """条件に一致する案件を関連データとともに削除する
+
+        担当作業員と写真の登録は削除し、業務指示書は案件との関連だけを外して残す。
+        """
+        projects = f"IN (SELECT id FROM projects WHERE {condition})"
+        with self.transaction():
+            self.delete('project_workers', f"project_id {projects}", values)
+            self.delete('project_photos', f"project_id {projects}", values)
+            self.update('work_orders', {'project_id': None}, f"project_id {projects}", values)
+            self.delete('projects', condition, values)
+
     def get_monthly_stats_by_client(self, year: int = None) -> List[Dict]:
         """取引先ごとの月別統計を取得する"""
         if year is None:
@@ -432,18 +1453,19 @@ class Database:
         SELECT
             c.id as client_id,
             c.name as client_name,
-            strftime('%m', COALESCE(p.completion_date, p.created_at)) as month,
-            SUM(p.price) as total_amount,
-            COUNT(p.id) as project_count
-        FROM projects p
-        JOIN clients c ON p.client_id = c.id
-        WHERE strftime('%Y', COALESCE(p.completion_date, p.created_at)) = ?
+            printf('%02d', r.month) as month,
+            SUM(r.total_price) as total_amount,
+            SUM(r.project_count) as project_count
+        FROM monthly_sales_rollup r
+        JOIN clients c ON r.client_id = c.id
+        WHERE r.year = ?
         GROUP BY c.id, month
         ORDER BY c.name, month
         """
 
-        return self.execute_query(query, (str(year),))
+        return self.execute_query(query, (int(year),))
 
+    @cached_query('clients', 'monthly_sales_rollup')
     def get_total_stats_by_client(self, year: int = None) -> List[Dict]:
         """取引先ごとの年間総計統計を取得する"""
         if year is None:
@@ -453,17 +1475,18 @@ class Database:
         SELECT
             c.id as client_id,
             c.name as client_name,
-            SUM(p.price) as total_amount,
-            COUNT(p.id) as project_count
-        FROM projects p
-        JOIN clients c ON p.client_id = c.id
-        WHERE strftime('%Y', COALESCE(p.completion_date, p.created_at)) = ?
+            SUM(r.total_price) as total_amount,
+            SUM(r.project_count) as project_count
+        FROM monthly_sales_rollup r
+        JOIN clients c ON r.client_id = c.id
+        WHERE r.year = ?
         GROUP BY c.id
         ORDER BY total_amount DESC
         """
 
-        return self.execute_query(query, (str(year),))
+        return self.execute_query(query, (int(year),))
 
+    @cached_query('services', 'monthly_sales_rollup')
     def get_total_stats_by_service(self, year: int = None) -> List[Dict]:
         """サービスごとの年間総計統計を取得する"""
         if year is None:
@@ -473,17 +1496,18 @@ class Database:
         SELECT
             s.id as service_id,
             s.name as service_name,
-            SUM(p.price) as total_amount,
-            COUNT(p.id) as project_count
-        FROM projects p
-        JOIN services s ON p.service_id = s.id
-        WHERE strftime('%Y', COALESCE(p.completion_date, p.created_at)) = ?
+            SUM(r.total_price) as total_amount,
+            SUM(r.project_count) as project_count
+        FROM monthly_sales_rollup r
+        JOIN services s ON r.service_id = s.id
+        WHERE r.year = ?
         GROUP BY s.id
         ORDER BY total_amount DESC
         """
 
-        return self.execute_query(query, (str(year),))
+        return self.execute_query(query, (int(year),))
 
+    @cached_query('clients', 'monthly_sales_rollup')
     def get_monthly_stats_by_client_for_month(self, year: int = None, month: int = None) -> List[Dict]:
         """特定の月の取引先ごとの統計を取得する"""
         if year is None:
@@ -491,24 +1515,23 @@ class Database:
         if month is None:
             month = datetime.datetime.now().month
 
-        month_str = f"{month:02d}"
-
         query = """
         SELECT
             c.id as client_id,
             c.name as client_name,
-            SUM(p.price) as total_amount,
-            COUNT(p.id) as project_count
-        FROM projects p
-        JOIN clients c ON p.client_id = c.id
-        WHERE strftime('%Y', COALESCE(p.completion_date, p.created_at)) = ?
-        AND strftime('%m', COALESCE(p.completion_date, p.created_at)) = ?
+            SUM(r.total_price) as total_amount,
+            SUM(r.project_count) as project_count
+        FROM monthly_sales_rollup r
+        JOIN clients c ON r.client_id = c.id
+        WHERE r.year = ?
+        AND r.month = ?
         GROUP BY c.id
         ORDER BY total_amount DESC
         """
 
-        return self.execute_query(query, (str(year), month_str))
+        return self.execute_query(query, (int(year), int(month)))
 
+    @cached_query('services', 'monthly_sales_rollup')
     def get_monthly_stats_by_service_for_month(self, year: int = None, month: int = None) -> List[Dict]:
         """指定月のサービス別統計を取得する"""
         if year is None:
@@ -517,69 +1540,120 @@ class Database:
         if month is None:
             month = datetime.datetime.now().month
 
-        month_str = f"{month:02d}"
-
         query = """
         SELECT
             s.id as service_id,
             s.name as service_name,
-            SUM(p.price) as total_amount,
-            COUNT(p.id) as project_count
-        FROM projects p
-        JOIN services s ON p.service_id = s.id
-        WHERE strftime('%Y', COALESCE(p.completion_date, p.created_at)) = ?
-          AND strftime('%m', COALESCE(p.completion_date, p.created_at)) = ?
+            SUM(r.total_price) as total_amount,
+            SUM(r.project_count) as project_count
+        FROM monthly_sales_rollup r
+        JOIN services s ON r.service_id = s.id
+        WHERE r.year = ?
+          AND r.month = ?
         GROUP BY s.id
         ORDER BY total_amount DESC
         """
 
-        return self.execute_query(query, (str(year), month_str))
+        return self.execute_query(query, (int(year), int(month)))
 
     # プロジェクト写真関連のメソッド
     def add_project_photo(self, project_id: int, photo_path: str, description: str = "") -> int:
         """プロジェクトに写真を追加する"""
-        photo_id = self.insert('project_photos', {
-            'project_id': project_id,
-            'photo_path': photo_path,
-            'description': description
-        })
+        # 写真の登録と写真カウントの更新を1回のコミットで行う
+        with self.transaction():
+            photo_id = self.insert('project_photos', {
+                'project_id': project_id,
+                'photo_path': photo_path,
+                'description': description
+            })
 
-        # 写真カウントを更新
-        self.cursor.execute(
-            "UPDATE projects SET has_photos = 1, photo_count = photo_count + 1 WHERE id = ?",
-            (project_id,)
-        )
-        self.conn.commit()
+            # 写真カウントを更新
+            self.cursor.execute(
+                "UPDATE projects SET has_photos = 1, photo_count = photo_count + 1 WHERE id = ?",
+                (project_id,)
+            )
+            self.mark_tables_changed('projects')
 
         return photo_id
 
+    def add_project_photos(self, project_id: int, photo_paths: List[str]) -> int:
+        """プロジェクトに複数の写真をまとめて追加する
+
+        Returns:
+            追加した写真の枚数
+        """
+        if not photo_paths:
+            return 0
+
+        with self.transaction():
+            count = self.insert_many('project_photos', [
+                {'project_id': project_id, 'photo_path': photo_path, 'description': ""}
+                for photo_path in photo_paths
+            ])
+
+            # 写真カウントを更新
+            self.cursor.execute(
+                "UPDATE projects SET has_photos = 1, photo_count = photo_count + ? WHERE id = ?",
+                (count, project_id)
+            )
+            self.mark_tables_changed('projects')
+
+        return count
+
     def get_project_photos(self, project_id: int) -> List[Dict]:
         """プロジェクトの写真を取得する"""
         return self.select('project_photos', condition="project_id = ? ORDER BY created_at", values=(project_id,))
 
     def delete_project_photo(self, photo_id: int) -> None:
         """プロジェクトの写真を削除する"""
-        # 写真情報を取得
-        photo = self.select('project_photos', condition="id = ?", values=(photo_id,))
-        if not photo:
-            return
+        self.delete_project_photos([photo_id])
 
-        project_id = photo[0]['project_id']
+    def delete_project_photos(self, photo_ids: List[int]) -> int:
+        """複数のプロジェクト写真をまとめて削除する
 
-        # 写真を削除
-        self.delete('project_photos', 'id = ?', (photo_id,))
+        写真の削除とプロジェクトの写真情報の更新を1回のコミットで行う。
+        写真数は残りの写真を数え直さず、削除した枚数だけ減らす。
 
-        # 残りの写真数を取得
-        remaining = self.select('project_photos', 'COUNT(*) as count', 'project_id = ?', (project_id,))
-        count = remaining[0]['count'] if remaining else 0
+        Returns:
+            削除した写真の枚数
+        """
+        photo_ids = list(dict.fromkeys(photo_ids))
+        if not photo_ids:
+            return 0
+
+        with self.transaction():
+            # プロジェクトごとに削除する写真の枚数を取得
+            removed = {}
+            for start in range(0, len(photo_ids), SQL_IN_CHUNK_SIZE):
+                chunk = photo_ids[start:start + SQL_IN_CHUNK_SIZE]
+                placeholders = ', '.join(['?' for _ in chunk])
+                rows = self.execute_query(
+                    f"SELECT project_id, COUNT(*) AS count FROM project_photos "
+                    f"WHERE id IN ({placeholders}) GROUP BY project_id",
+                    tuple(chunk)
+                )
+                for row in rows:
+                    removed[row['project_id']] = removed.get(row['project_id'], 0) + row['count']
+
+            if not removed:
+                return 0
+
+            # 写真を削除
+            self.delete_many('project_photos', ('id',), [(photo_id,) for photo_id in photo_ids])
+
+            # プロジェクトの写真情報を更新
+            self.cursor.executemany(
+                """
+                UPDATE projects
+                SET photo_count = MAX(photo_count - ?, 0),
+                    has_photos = CASE WHEN photo_count - ? > 0 THEN 1 ELSE 0 END
+                WHERE id = ?
+                """,
+                [(count, count, project_id) for project_id, count in removed.items()]
+            )
+            self.mark_tables_changed('projects')
 
-        # プロジェクトの写真情報を更新
-        has_photos = 1 if count > 0 else 0
-        self.cursor.execute(
-            "UPDATE projects SET has_photos = ?, photo_count = ? WHERE id = ?",
-            (has_photos, count, project_id)
-        )
-        self.conn.commit()
+        return sum(removed.values())
 
     # パスワード関連のメソッド
     def hash_password(self, password: str, salt: str = None) -> Tuple[str, str]:
@@ -649,6 +1723,7 @@ class Database:
         return "user"  # デフォルトは一般ユーザー
 
     # 追加統計メソッド
+    @cached_query('services', 'monthly_sales_rollup')
     def get_service_stats_for_chart(self, year: int = None) -> List[Dict]:
         """サービス別統計（グラフ用）"""
         if year is None:
@@ -657,17 +1732,18 @@ class Database:
         query = """
         SELECT
             s.name as service_name,
-            SUM(p.price) as total_amount,
-            COUNT(p.id) as project_count
-        FROM projects p
-        JOIN services s ON p.service_id = s.id
-        WHERE strftime('%Y', COALESCE(p.completion_date, p.created_at)) = ?
+            SUM(r.total_price) as total_amount,
+            SUM(r.project_count) as project_count
+        FROM monthly_sales_rollup r
+        JOIN services s ON r.service_id = s.id
+        WHERE r.year = ?
         GROUP BY s.id
         ORDER BY total_amount DESC
         """
 
-        return self.execute_query(query, (str(year),))
+        return self.execute_query(query, (int(year),))
 
+    @cached_query('projects')
     def get_price_statistics(self, year: int = None) -> Dict:
         """価格統計を取得する"""
         if year is None:
@@ -681,10 +1757,10 @@ class Database:
             SUM(price) as total_price,
             COUNT(*) as total_count
         FROM projects
-        WHERE strftime('%Y', COALESCE(completion_date, created_at)) = ?
+        WHERE effective_year = ?
         """
 
-        result = self.execute_query(query, (str(year),))
+        result = self.execute_query(query, (int(year),))
         return result[0] if result else {
             'average_price': 0,
             'min_price': 0,
@@ -693,6 +1769,7 @@ class Database:
             'total_count': 0
         }
 
+    @cached_query('workers', 'project_workers', 'projects')
     def get_trouble_statistics_by_worker(self, year: int = None) -> List[Dict]:
         """作業員別トラブル統計"""
         if year is None:
@@ -709,13 +1786,14 @@ class Database:
         FROM workers w
         LEFT JOIN project_workers pw ON w.id = pw.worker_id
         LEFT JOIN projects p ON pw.project_id = p.id
-        WHERE strftime('%Y', COALESCE(p.completion_date, p.created_at)) = ? OR p.id IS NULL
+        WHERE p.effective_year = ? OR p.id IS NULL
         GROUP BY w.id
         ORDER BY trouble_rate DESC
         """
 
-        return self.execute_query(query, (str(year),))
+        return self.execute_query(query, (int(year),))
 
+    @cached_query('clients', 'monthly_sales_rollup')
     def get_trouble_statistics_by_client(self, year: int = None) -> List[Dict]:
         """取引先別トラブル統計"""
         if year is None:
@@ -725,62 +1803,63 @@ class Database:
         SELECT
             c.id as client_id,
             c.name as client_name,
-            COUNT(CASE WHEN p.has_trouble = 1 THEN 1 END) as trouble_count,
-            COUNT(p.id) as project_count,
-            CAST(COUNT(CASE WHEN p.has_trouble = 1 THEN 1 END) AS FLOAT) /
-            CASE WHEN COUNT(p.id) = 0 THEN 1 ELSE COUNT(p.id) END * 100 as trouble_rate
+            IFNULL(SUM(r.trouble_count), 0) as trouble_count,
+            IFNULL(SUM(r.project_count), 0) as project_count,
+            CAST(IFNULL(SUM(r.trouble_count), 0) AS FLOAT) /
+            CASE WHEN IFNULL(SUM(r.project_count), 0) = 0 THEN 1 ELSE SUM(r.project_count) END * 100 as trouble_rate
         FROM clients c
-        LEFT JOIN projects p ON c.id = p.client_id
-        WHERE strftime('%Y', COALESCE(p.completion_date, p.created_at)) = ? OR p.id IS NULL
+        LEFT JOIN monthly_sales_rollup r ON c.id = r.client_id
+        WHERE r.year = ? OR r.client_id IS NULL
         GROUP BY c.id
         ORDER BY trouble_rate DESC
         """
 
-        return self.execute_query(query, (str(year),))
-
-    def get_yearly_comparison_data(self, current_year: int, compare_year: int) -> Dict:
-        """年度間比較データを取得する"""
-        # 現在年度のデータ
-        current_year_query = """
-        SELECT
-            strftime('%m', COALESCE(completion_date, created_at)) as month,
-            SUM(price) as total_amount
-        FROM projects
-        WHERE strftime('%Y', COALESCE(completion_date, created_at)) = ?
-        GROUP BY month
-        ORDER BY month
-        """
+        return self.execute_query(query, (int(year),))
 
-        current_year_data = self.execute_query(current_year_query, (str(current_year),))
+    @cached_query('monthly_sales_rollup', 'sales_targets')
+    def get_yearly_comparison(self, current_year: int, compare_year: int) -> Dict:
+        """年度間比較データと売上目標を1回の問い合わせで取得する
 
-        # 比較年度のデータ
-        compare_year_query = """
-        SELECT
-            strftime('%m', COALESCE(completion_date, created_at)) as month,
-            SUM(price) as total_amount
-        FROM projects
-        WHERE strftime('%Y', COALESCE(completion_date, created_at)) = ?
-        GROUP BY month
-        ORDER BY month
+        Returns:
+            get_yearly_comparison_data の結果に、現在年度の年間目標（yearly_target）と
+            月別目標（monthly_targets）を加えた辞書
         """
+        current_year = int(current_year)
+        compare_year = int(compare_year)
 
-        compare_year_data = self.execute_query(compare_year_query, (str(compare_year),))
-
-        # 月ごとのデータを整形
-        months = [f"{i:02d}" for i in range(1, 13)]
+        # 両年度の月別売上と現在年度の目標（month = 0 は年間目標）をまとめて取得する
+        query = """
+        SELECT 'sales' as kind, year, month, SUM(total_price) as amount
+        FROM monthly_sales_rollup
+        WHERE year IN (?, ?)
+        GROUP BY year, month
+        UNION ALL
+        SELECT 'target' as kind, year, month, target_amount as amount
+        FROM sales_targets
+        WHERE year = ?
+        """
 
-        current_dict = {item['month']: item['total_amount'] for item in current_year_data}
-        compare_dict = {item['month']: item['total_amount'] for item in compare_year_data}
+        amounts = {}
+        for row in self.execute_query(query, (current_year, compare_year, current_year)):
+            amounts[(row['kind'], row['year'], row['month'])] = row['amount'] or 0
 
-        result = {
-            'months': months,
+        months = range(1, 13)
+        return {
+            'months': [f"{month:02d}" for month in months],
             'current_year': current_year,
             'compare_year': compare_year,
-            'current_data': [current_dict.get(month, 0) for month in months],
-            'compare_data': [compare_dict.get(month, 0) for month in months]
+            'current_data': [amounts.get(('sales', current_year, month), 0) for month in months],
+            'compare_data': [amounts.get(('sales', compare_year, month), 0) for month in months],
+            'yearly_target': amounts.get(('target', current_year, 0), 0.0),
+            'monthly_targets': [amounts.get(('target', current_year, month), 0.0) for month in months],
         }
 
-        return result
+    def get_yearly_comparison_data(self, current_year: int, compare_year: int) -> Dict:
+        """年度間比較データを取得する"""
+        data = self.get_yearly_comparison(current_year, compare_year)
+        del data['yearly_target']
+        del data['monthly_targets']
+        return data
 
     # 業務指示書関連のメソッド
     def save_work_order(self, order_data: Dict[str, Any]) -> int:
@@ -795,9 +1874,9 @@ class Database:
             # 新規の業務指示書を挿入
             return self.insert('work_orders', order_data)
 
-    def get_work_orders(self, condition: str = "", values: Tuple = ()) -> List[Dict]:
-        """業務指示書を取得する"""
-        query = """
+    def _work_orders_base_query(self) -> str:
+        """業務指示書取得用のSELECT文（WHERE句より前）を作成する"""
+        return """
         SELECT
             wo.*,
             p.title as project_title,
@@ -811,6 +1890,10 @@ class Database:
         LEFT JOIN workers cr ON wo.creator_id = cr.id
         """
 
+    def get_work_orders(self, condition: str = "", values: Tuple = ()) -> List[Dict]:
+        """業務指示書を取得する"""
+        query = self._work_orders_base_query()
+
         if condition:
             query += f" WHERE {condition}"
 
@@ -818,6 +1901,46 @@ class Database:
 
         return self.execute_query(query, values)
 
+    def get_work_orders_page(self, condition: str = "", values: Tuple = (), after: Optional[Tuple] = None,
+                             limit: int = 200) -> Tuple[List[Dict], Optional[Tuple]]:
+        """業務指示書を1ページ分取得する（作成日時とIDによるキーセットページング）
+
+        Returns:
+            (業務指示書のリスト, 次のページのカーソル。最後のページの場合は None)
+        """
+        conditions = []
+        params = list(values)
+        if condition:
+            conditions.append(f"({condition})")
+        if after is not None:
+            conditions.append("(wo.created_at, wo.id) < (?, ?)")
+            params.extend(after)
+
+        query = self._work_orders_base_query()
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY wo.created_at DESC, wo.id DESC LIMIT ?"
+
+        # 1件多く取得して次のページの有無を判定する
+        params.append(limit + 1)
+        rows = self.execute_query(query, tuple(params))
+
+        if len(rows) <= limit:
+            return rows, None
+
+        rows = rows[:limit]
+        return rows, (rows[-1]['created_at'], rows[-1]['id'])
+
+    def iter_work_orders(self, condition: str = "", values: Tuple = (), page_size: int = 200):
+        """業務指示書をページ単位で順に返すジェネレーター"""
+        cursor = None
+        while True:
+            rows, cursor = self.get_work_orders_page(condition, values, after=cursor, limit=page_size)
+            if rows:
+                yield rows
+            if cursor is None:
+                return
+
     def get_work_order(self, order_id: int) -> Optional[Dict]:
         """業務指示書を取得する"""
         orders = self.get_work_orders("wo.id = ?", (order_id,))
@@ -834,13 +1957,15 @@ class Database:
         year_month = now.strftime("%Y%m")
 
         # 該当年月の最大番号を取得
+        # LIKEではインデックスが使われないため、「YYYYMM-」で始まる番号を範囲条件で検索する
+        # （'.' は '-' の次の文字のため、桁数や末尾に関わらず前方一致と同じ結果になる）
         query = """
         SELECT MAX(order_number) as max_number
         FROM work_orders
-        WHERE order_number LIKE ?
+        WHERE order_number >= ? AND order_number < ?
         """
 
-        result = self.execute_query(query, (f"{year_month}%",))
+        result = self.execute_query(query, (f"{year_month}-", f"{year_month}."))
 
         if result and result[0]['max_number']:
             # 既存の番号から連番部分を取得して+1
@@ -856,6 +1981,7 @@ class Database:
         return new_number
 
     # 売上目標関連のメソッド
+    @cached_query('sales_targets')
     def get_sales_target(self, year: int, month: int = 0) -> float:
         """指定年度・月の売上目標を取得する"""
         result = self.select('sales_targets', 'target_amount', 'year = ? AND month = ?', (year, month))
@@ -865,30 +1991,30 @@ class Database:
 
     def set_sales_target(self, year: int, month: int, target_amount: float) -> bool:
         """売上目標を設定する"""
+        return self.set_sales_targets(year, {month: target_amount})
+
+    def set_sales_targets(self, year: int, targets: Dict[int, float]) -> bool:
+        """複数の月の売上目標をまとめて設定する
+
+        Args:
+            year: 年度
+            targets: 月（0は年間目標、1-12は各月の目標） -> 目標金額 の辞書
+        """
         try:
-            # 既存の目標があるか確認
-            existing = self.select('sales_targets', 'id', 'year = ? AND month = ?', (year, month))
-
-            if existing:
-                # 既存の目標を更新
-                self.update(
-                    'sales_targets',
-                    {'target_amount': target_amount},
-                    'year = ? AND month = ?',
-                    (year, month)
-                )
-            else:
-                # 新規目標を挿入
-                self.insert('sales_targets', {
-                    'year': year,
-                    'month': month,
-                    'target_amount': target_amount
-                })
+            self.upsert_many(
+                'sales_targets',
+                [
+                    {'year': year, 'month': month, 'target_amount': target_amount}
+                    for month, target_amount in targets.items()
+                ],
+                conflict_columns=('year', 'month')
+            )
             return True
         except Exception as e:
             print(f"売上目標設定エラー: {e}")
             return False
 
+    @cached_query('sales_targets')
     def get_all_sales_targets(self, year: int) -> dict:
         """指定年度の全ての売上目標を取得する"""
         results = self.select('sales_targets', condition='year = ? ORDER BY month', values=(year,))
@@ -0,0 +1,169 @@
+import threading
+import itertools
+import sqlite3
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from connection_manager import ConnectionManager
+
+
+class _QueryTask(QRunnable):
+    """スレッドプール上で1件の問い合わせを実行するタスク"""
+
+    def __init__(self, executor, request_id, func, args, kwargs):
+        super().__init__()
+        self.executor = executor
+        self.request_id = request_id
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        # 実行前に新しい問い合わせで置き換えられていれば何もしない
+        if self.executor.is_superseded(self.request_id):
+            return
+
+        db = self.executor.thread_database()
+        self.executor._mark_running(self.request_id, db)
+        result = None
+        error = None
+        try:
+            result = self.func(db, *self.args, **self.kwargs)
+        except Exception as e:
+            error = e
+        finally:
+            self.executor._mark_finished(self.request_id)
+
+        try:
+            self.executor._result_ready.emit(self.request_id, result, error)
+        except RuntimeError:
+            # 終了処理で QueryExecutor が先に破棄された場合は結果を捨てる
+            pass
+
+
+class QueryExecutor(QObject):
+    """データベースへの問い合わせをバックグラウンドスレッドで実行するクラス
+
+    各ワーカースレッドは専用の接続を持ち、結果はQtのシグナル経由で
+    GUIスレッドのコールバックに渡される。同じキーで新しい問い合わせを
+    投入すると、古い問い合わせは中断され、その結果は破棄される。
+    """
+
+    # (リクエストID, 結果, 例外) - ワーカースレッドから発行される
+    _result_ready = pyqtSignal(int, object, object)
+
+    def __init__(self, db_path, max_threads=2, parent=None):
+        super().__init__(parent)
+
+        self.db_path = db_path
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        # スレッドを使い回して接続を維持する
+        self.pool.setExpiryTimeout(-1)
+
+        self._lock = threading.Lock()
+        self._request_ids = itertools.count(1)
+        self._latest = {}      # キー -> 最新のリクエストID
+        self._pending = {}     # リクエストID -> (キー, コールバック, エラーコールバック)
+        self._running = {}     # リクエストID -> 実行中の接続
+        # ワーカースレッドの接続は接続マネージャーが管理する
+        self.connections = ConnectionManager.get(db_path)
+
+        self._result_ready.connect(self._on_result_ready)
+
+    def submit(self, key, func, *args, callback=None, error_callback=None, **kwargs):
+        """問い合わせを投入する
+
+        Args:
+            key: 問い合わせの種類を表すキー。同じキーの古い問い合わせは中断される
+            func: ワーカースレッドの Database を第1引数に受け取る関数、
+                  または Database のメソッド名
+            callback: 結果を受け取る関数（GUIスレッドで呼ばれる）
+            error_callback: 例外を受け取る関数（GUIスレッドで呼ばれる）
+
+        Returns:
+            リクエストID
+        """
+        if isinstance(func, str):
+            method_name = func
+            func = lambda db, *a, **kw: getattr(db, method_name)(*a, **kw)
+
+        request_id = next(self._request_ids)
+        with self._lock:
+            previous_id = self._latest.get(key)
+            self._latest[key] = request_id
+            self._pending[request_id] = (key, callback, error_callback)
+
+            # 置き換えられた問い合わせが実行中なら中断する
+            if previous_id is not None:
+                self._pending.pop(previous_id, None)
+                previous_db = self._running.get(previous_id)
+                if previous_db is not None:
+                    previous_db.conn.interrupt()
+
+        self.pool.start(_QueryTask(self, request_id, func, args, kwargs))
+        return request_id
+
+    def cancel(self, key):
+        """指定キーの問い合わせを取り消す"""
+        with self._lock:
+            request_id = self._latest.pop(key, None)
+            if request_id is None:
+                return
+            self._pending.pop(request_id, None)
+            running_db = self._running.get(request_id)
+            if running_db is not None:
+                running_db.conn.interrupt()
+
+    def is_superseded(self, request_id):
+        """問い合わせが取り消し・置き換え済みかどうか"""
+        with self._lock:
+            return request_id not in self._pending
+
+    def thread_database(self):
+        """現在のワーカースレッド専用の Database を取得する"""
+        return self.connections.thread_database()
+
+    def _mark_running(self, request_id, db):
+        with self._lock:
+            if request_id in self._pending:
+                self._running[request_id] = db
+
+    def _mark_finished(self, request_id):
+        with self._lock:
+            self._running.pop(request_id, None)
+
+    def _on_result_ready(self, request_id, result, error):
+        """問い合わせ結果をGUIスレッドで受け取る"""
+        with self._lock:
+            entry = self._pending.pop(request_id, None)
+            if entry is None:
+                # 置き換え済みの問い合わせの結果は破棄する
+                return
+            key, callback, error_callback = entry
+            if self._latest.get(key) == request_id:
+                del self._latest[key]
+
+        if error is not None:
+            if error_callback:
+                error_callback(error)
+            elif not (isinstance(error, sqlite3.OperationalError) and str(error) == "interrupted"):
+                print(f"バックグラウンド問い合わせエラー: {error}")
+            return
+
+        if callback:
+            callback(result)
+
+    def shutdown(self):
+        """未実行の問い合わせを破棄し、実行中の問い合わせの終了を待つ
+
+        接続は接続マネージャー（ConnectionManager.close）が閉じる。
+        """
+        with self._lock:
+            self._pending.clear()
+            self._latest.clear()
+            for db in self._running.values():
+                db.conn.interrupt()
+
+        self.pool.clear()
+        self.pool.waitForDone()
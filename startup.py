@@ -0,0 +1,67 @@
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """起動処理のフェーズごとの所要時間を計測するクラス
+
+    mark() は前回の計測点からの経過時間を、phase() はブロック内の処理時間を
+    記録する。phase() は入れ子にでき、内側のフェーズは字下げして表示する。
+    report() 以降に計測したフェーズ（遅延作成したタブなど）はその都度表示する。
+    """
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self._last_mark = self.started_at
+        self.phases = []  # (フェーズ名, 秒, 入れ子の深さ)
+        self.reported = False
+        self._depth = 0
+
+    def _record(self, name, seconds, depth=0):
+        self.phases.append((name, seconds, depth))
+        if self.reported:
+            print(f"起動後の読み込み: {name} {seconds * 1000:.1f} ms")
+
+    def mark(self, name):
+        """前回の計測点からの経過時間をフェーズとして記録する"""
+        now = time.perf_counter()
+        self._record(name, now - self._last_mark, self._depth)
+        self._last_mark = now
+
+    @contextmanager
+    def phase(self, name):
+        """ブロック内の処理時間をフェーズとして記録する"""
+        start = time.perf_counter()
+        depth = self._depth
+        # 内側のフェーズより前に表示されるよう、開始時に枠を確保する
+        index = len(self.phases)
+        self.phases.append((name, 0.0, depth))
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth = depth
+            now = time.perf_counter()
+            seconds = now - start
+            self.phases[index] = (name, seconds, depth)
+            self._last_mark = now
+            if self.reported:
+                print(f"起動後の読み込み: {name} {seconds * 1000:.1f} ms")
+
+    def elapsed(self):
+        """計測開始からの経過時間（秒）"""
+        return time.perf_counter() - self.started_at
+
+    def report(self):
+        """フェーズごとの所要時間を表示する"""
+        print("===== 起動時間の内訳 =====")
+        for name, seconds, depth in self.phases:
+            print(f"  {'  ' * depth}{name}: {seconds * 1000:.1f} ms")
+        # 入れ子のフェーズは外側に含まれるため、最上位のみ合計する
+        total = sum(seconds for _, seconds, depth in self.phases if depth == 0)
+        print(f"  合計: {total * 1000:.1f} ms")
+        self.reported = True
+
+
+# プロセス全体で共有する計測器（最初の import 時点から計測を開始する）
+profiler = StartupProfiler()
@@ -4,7 +4,7 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal
 
-from components import SearchBar, ActionBar, EnhancedTable, ConfirmDialog
+from components import SearchBar, ActionBar, EnhancedTableView, ConfirmDialog
 from styles import StyleManager
 
 
@@ -149,7 +149,7 @@ class ClientsTab(QWidget):
         layout.addWidget(self.action_bar)
 
         # テーブル
-        self.table = EnhancedTable(["ID", "取引先名", "住所", "電話番号", "図面", "書類", "備考"])
+        self.table = EnhancedTableView(["ID", "取引先名", "住所", "電話番号", "図面", "書類", "備考"])
         self.table.setColumnHidden(0, True)  # ID列を非表示
         layout.addWidget(self.table)
 
@@ -174,25 +174,22 @@ class ClientsTab(QWidget):
             self.load_clients()
             return
 
-        clients = self.db.select('clients', condition="name LIKE ?", values=(f"%{search_text}%",))
+        # 関連度の高い順に表示する
+        clients = self.db.search('clients', search_text)
         self.set_table_data(clients)
 
     def set_table_data(self, clients):
         """テーブルにデータをセットする"""
-        # データをテーブル表示用に整形
-        display_data = []
-        for client in clients:
-            display_data.append({
-                "ID": client["id"],
-                "取引先名": client["name"],
-                "住所": client.get("address", "") or "",
-                "電話番号": client.get("phone", "") or "",
-                "図面": "あり" if client.get("has_drawings", 0) == 1 else "なし",
-                "書類": "あり" if client.get("has_documents", 0) == 1 else "なし",
-                "備考": client.get("note", "") or ""
-            })
-
-        self.table.set_data(display_data)
+        # 表示用の値は表示時に各行から取り出す
+        self.table.set_rows(clients, {
+            "ID": "id",
+            "取引先名": "name",
+            "住所": "address",
+            "電話番号": "phone",
+            "図面": lambda client: "あり" if client.get("has_drawings", 0) == 1 else "なし",
+            "書類": lambda client: "あり" if client.get("has_documents", 0) == 1 else "なし",
+            "備考": "note"
+        })
 
     def add_client(self):
         """取引先を追加する"""
@@ -264,8 +261,8 @@ class ClientsTab(QWidget):
                     if not confirm_cascade.exec():
                         return
 
-                # 削除実行
-                self.db.delete('clients', "id = ?", (client_id,))
+                # 関連する案件とともに削除
+                self.db.delete_client(client_id)
                 self.load_clients()
                 QMessageBox.information(self, "成功", "取引先を削除しました。")
             except Exception as e:
@@ -12,8 +12,8 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from components import (
-    SearchBar, ActionBar, EnhancedTable, ConfirmDialog,
-    EnhancedComboBox, DateRangeSelector
+    SearchBar, ActionBar, EnhancedTableView, ConfirmDialog,
+    EnhancedComboBox, DateRangeSelector, FilterController
 )
 from styles import StyleManager
 
@@ -400,6 +400,7 @@ class ProjectDialog(QDialog):
         os.makedirs(save_dir, exist_ok=True)
 
         # 写真をリソースディレクトリにコピー
+        dest_paths = []
         for file_path in files:
             file_name = os.path.basename(file_path)
             dest_path = os.path.join(save_dir, file_name)
@@ -414,12 +415,14 @@ class ProjectDialog(QDialog):
 
             # ファイルコピー
             shutil.copy2(file_path, dest_path)
+            dest_paths.append(dest_path)
 
-            # データベースに写真情報を登録
-            self.db.add_project_photo(self.project_data.get('id'), dest_path)
+        # データベースに写真情報をまとめて登録（1回のコミット）
+        # サムネイルは写真ビューアーでの初回表示時にバックグラウンドで作成する
+        self.db.add_project_photos(self.project_data.get('id'), dest_paths)
 
-        # 写真カウントラベルを更新
-        photo_count = self.db.select('project_photos', 'COUNT(*) as count', 'project_id = ?', (self.project_data.get('id'),))[0]['count']
+        # 写真カウントラベルを更新（写真数は登録時に案件に記録されている）
+        photo_count = self.db.select('projects', 'photo_count', 'id = ?', (self.project_data.get('id'),))[0]['photo_count']
         self.photo_count_label.setText(f"登録済み写真: {photo_count} 枚")
         self.project_data['photo_count'] = photo_count
 
@@ -466,10 +469,12 @@ class ProjectsTab(QWidget):
     # シグナル定義
     projectsChanged = pyqtSignal()  # 案件データが変更された時に発行するシグナル
 
-    def __init__(self, db):
+    def __init__(self, db, query_executor):
         super().__init__()
 
         self.db = db
+        # 一覧の読み込みはメインウィンドウと共有する実行器でバックグラウンドに行う
+        self.query_executor = query_executor
         # ソート設定の初期化
         self.current_sort_column = "created_at"
         self.current_sort_order = "DESC"
@@ -489,7 +494,7 @@ class ProjectsTab(QWidget):
         filter_layout = QHBoxLayout()
 
         # 検索バー
-        self.search_bar = SearchBar("案件タイトルで検索...")
+        self.search_bar = SearchBar("案件タイトル・説明・住所で検索...")
         filter_layout.addWidget(self.search_bar)
 
         # 状態フィルター
@@ -595,7 +600,6 @@ class ProjectsTab(QWidget):
         self.year_combo.setCurrentIndex(0)  # 初期選択を「すべて」に設定
         StyleManager.style_input(self.year_combo)
 
-        self.year_combo.currentIndexChanged.connect(self.apply_filters)
         date_filter_layout.addWidget(self.year_combo)
 
         # 月選択コンボボックス
@@ -613,7 +617,6 @@ class ProjectsTab(QWidget):
 
         # 初期選択を「すべて」にする
         self.month_combo.setCurrentIndex(0)  # インデックス0は「すべて」
-        self.month_combo.currentIndexChanged.connect(self.apply_filters)
         date_filter_layout.addWidget(self.month_combo)
 
         date_filter_group.setLayout(date_filter_layout)
@@ -625,7 +628,7 @@ class ProjectsTab(QWidget):
         layout.addWidget(self.action_bar)
 
         # テーブル
-        self.table = EnhancedTable([
+        self.table = EnhancedTableView([
             "ID", "案件タイトル", "取引先", "サービス", "価格", "状態", "作業日", "担当作業員", "説明"
         ])
         self.table.setColumnHidden(0, True)  # ID列を非表示
@@ -640,38 +643,53 @@ class ProjectsTab(QWidget):
 
         self.setLayout(layout)
 
+        # フィルター変更は短時間の連続変更をまとめて1回だけ検索する
+        self.filter_controller = FilterController(self.apply_filters, parent=self)
+        self.filter_controller.watch(
+            self.search_bar.search_input.textChanged,  # 入力しながら検索
+            self.status_filter_group.buttonClicked,
+            self.client_combo.currentIndexChanged,
+            self.service_combo.currentIndexChanged,
+            self.sort_combo.currentIndexChanged,
+            self.year_combo.currentIndexChanged,
+            self.month_combo.currentIndexChanged
+        )
+
         # シグナル接続
-        self.search_bar.searchClicked.connect(self.apply_filters)
+        self.search_bar.searchClicked.connect(self.filter_controller.apply_now)
         self.search_bar.resetClicked.connect(self.reset_filters)
-        self.status_filter_group.buttonClicked.connect(self.apply_filters)
-        self.year_combo.currentIndexChanged.connect(self.apply_filters)
-        self.month_combo.currentIndexChanged.connect(self.apply_filters)
         self.action_bar.addClicked.connect(self.add_project)
         self.action_bar.editClicked.connect(self.edit_project)
         self.action_bar.deleteClicked.connect(self.delete_project)
         self.table.doubleClicked.connect(lambda row: self.edit_project())
-        # 新しいフィルターと並び替えに関するシグナル接続
-        self.client_combo.currentIndexChanged.connect(self.apply_filters)
-        self.service_combo.currentIndexChanged.connect(self.apply_filters)
-        self.sort_combo.currentIndexChanged.connect(self.apply_filters)
+        self.table.dataLoaded.connect(self.adjust_column_widths)
 
     def load_projects(self, condition="", values=()):
         """案件データをロードする"""
+        # 表示する行が記録済みの検索条件と一致しなくなるため破棄する
+        self.filter_controller.forget()
+
         # 並び替え設定を取得
         sort_column, sort_order = self.current_sort_column, self.current_sort_order
 
         # 条件構築、ORDER BY句は含めない
         # 並び替えは別パラメータとして渡す
-        projects = self.db.get_projects(
-            condition=condition,
-            values=values,
-            sort_column=sort_column,
-            sort_order=sort_order
-        )
-        self.set_table_data(projects)
-
-        # データ変更を通知する（統計情報の更新のため）
-        self.projectsChanged.emit()
+        # 最初のページだけを読み込み、残りはスクロールに応じて読み込む
+        # 新しい条件で読み込むと、実行中の古い読み込みは中断される
+        def request_page(cursor, deliver):
+            self.query_executor.submit(
+                "projects_page",
+                "get_projects_page",
+                condition=condition,
+                values=values,
+                sort_column=sort_column,
+                sort_order=sort_order,
+                after=cursor,
+                include_workers=True,
+                callback=lambda result: deliver(*result)
+            )
+
+        self.table.set_async_pager(request_page, self.table_columns())
 
     def apply_filters(self):
         """フィルターを適用する"""
@@ -706,10 +724,6 @@ class ProjectsTab(QWidget):
         conditions = []
         values = []
 
-        if search_text:
-            conditions.append("p.title LIKE ?")
-            values.append(f"%{search_text}%")
-
         if status:
             conditions.append("p.status = ?")
             values.append(status)
@@ -722,17 +736,18 @@ class ProjectsTab(QWidget):
             conditions.append("p.service_id = ?")
             values.append(selected_service_id)
 
-        # 日付フィルターの条件構築
+        # 日付フィルターの条件構築（時刻付きの完了日も含まれるよう翌月・翌年の初日未満で絞り込む）
         if selected_year and selected_month:
             # 年と月の両方が選択されている場合
-            conditions.append("p.completion_date >= ? AND p.completion_date <= ?")
+            conditions.append("p.completion_date >= ? AND p.completion_date < ?")
             values.append(f"{selected_year}-{selected_month:02d}-01")
-            last_day = QDate(selected_year, selected_month, 1).daysInMonth()
-            values.append(f"{selected_year}-{selected_month:02d}-{last_day:02d}")
+            next_month = QDate(selected_year, selected_month, 1).addMonths(1)
+            values.append(f"{next_month.year()}-{next_month.month():02d}-01")
         elif selected_year:
-            # 年のみが選択されている場合
-            conditions.append("strftime('%Y', p.completion_date) = ?")
-            values.append(str(selected_year))
+            # 年のみが選択されている場合（インデックスが使えるよう範囲条件にする）
+            conditions.append("p.completion_date >= ? AND p.completion_date < ?")
+            values.append(f"{selected_year}-01-01")
+            values.append(f"{selected_year + 1}-01-01")
         elif selected_month:
             # 月のみが選択されている場合
             conditions.append("strftime('%m', p.completion_date) = ?")
@@ -742,62 +757,73 @@ class ProjectsTab(QWidget):
         if sort_data:
             self.current_sort_column, self.current_sort_order = sort_data
 
+        # 検索テキスト以外の条件（前回の結果を絞り込めるかの判定に使う）
+        filter_key = (tuple(conditions), tuple(values), self.current_sort_column, self.current_sort_order)
+
+        # 検索テキストを書き足しただけなら、読み込み済みの結果から絞り込む
+        if (self.filter_controller.narrows(filter_key, search_text)
+                and self.table.table_model.filter_rows(
+                    lambda project: FilterController.matches(
+                        search_text, project['title'], project['description'], project['site_address']))):
+            self.filter_controller.remember(filter_key, search_text)
+            return
+
+        if search_text:
+            search_condition, search_values = self.db.search_condition('projects', search_text, alias='p')
+            conditions.append(search_condition)
+            values.extend(search_values)
+
         # 条件文字列の構築
         condition = " AND ".join(conditions) if conditions else ""
 
         # フィルターを適用
         self.load_projects(condition, tuple(values))
+        self.filter_controller.remember(filter_key, search_text)
 
     def reset_filters(self):
         """フィルターをリセットする"""
-        self.search_bar.search_input.clear()
-        self.status_all.setChecked(True)
-        self.client_combo.setCurrentIndex(0)  # すべての取引先
-        self.service_combo.setCurrentIndex(0)  # すべてのサービス
-        self.sort_combo.setCurrentIndex(0)    # デフォルトソート
-        self.year_combo.setCurrentIndex(0)    # すべて
-        self.month_combo.setCurrentIndex(0)   # すべて
+        # 各項目の変更ごとに検索が走らないようシグナルを止めてまとめてリセットする
+        with self.filter_controller.blocked(
+            self.search_bar.search_input, self.status_filter_group, self.client_combo,
+            self.service_combo, self.sort_combo, self.year_combo, self.month_combo
+        ):
+            self.search_bar.search_input.clear()
+            self.status_all.setChecked(True)
+            self.client_combo.setCurrentIndex(0)  # すべての取引先
+            self.service_combo.setCurrentIndex(0)  # すべてのサービス
+            self.sort_combo.setCurrentIndex(0)    # デフォルトソート
+            self.year_combo.setCurrentIndex(0)    # すべて
+            self.month_combo.setCurrentIndex(0)   # すべて
 
         # ソート設定をリセット
         self.current_sort_column = "created_at"
         self.current_sort_order = "DESC"
 
-        self.load_projects()
+        self.filter_controller.apply_now()
 
-        # データ変更を通知する（統計情報の更新のため）
-        self.projectsChanged.emit()
+    def table_columns(self):
+        """テーブルの各列の値の取り出し方（表示用の値は表示時に各行から取り出す）"""
+        return {
+            "ID": "id",
+            "案件タイトル": "title",
+            "取引先": "client_name",
+            "サービス": "service_name",
+            # 価格表示のフォーマット
+            "価格": lambda project: f"¥ {project['price']:,.0f}" if project['price'] else "",
+            "状態": "status",
+            "作業日": "completion_date",
+            # 担当作業員情報（get_projectsで集約済み）
+            "担当作業員": "worker_names",
+            "説明": "description"
+        }
 
     def set_table_data(self, projects):
         """テーブルにデータをセットする"""
-        # データをテーブル表示用に整形
-        display_data = []
-        for project in projects:
-            # 価格表示のフォーマット
-            price_str = f"¥ {project['price']:,.0f}" if project['price'] else ""
-
-            # 担当作業員情報を取得
-            project_workers = self.db.get_project_workers(project["id"])
-            worker_names = [w["name"] for w in project_workers]
-            worker_str = ", ".join(worker_names) if worker_names else ""
-
-            display_data.append({
-                "ID": project["id"],
-                "案件タイトル": project["title"],
-                "取引先": project["client_name"],
-                "サービス": project["service_name"],
-                "価格": price_str,
-                "状態": project["status"],
-                "作業日": project["completion_date"] or "",
-                "担当作業員": worker_str,
-                "説明": project["description"] or ""
-            })
-
-        self.table.set_data(display_data)
-
-        # 列幅調整
-        self.table.resizeColumnsToContents()
-
-        # 列幅最適化して、テーブル全体が表示領域に合うようにする
+        self.table.set_rows(projects, self.table_columns())
+        self.adjust_column_widths()
+
+    def adjust_column_widths(self):
+        """列幅最適化して、テーブル全体が表示領域に合うようにする"""
         table_width = self.table.width()
         total_column_width = 0
         for i in range(self.table.columnCount()):
@@ -823,13 +849,13 @@ class ProjectsTab(QWidget):
         if dialog.exec():
             project_data = dialog.get_project_data()
             try:
-                # 案件を追加
-                project_id = self.db.insert('projects', project_data)
+                # 案件と作業員との関連をまとめて登録する（途中で失敗した場合はすべて取り消す）
+                with self.db.transaction():
+                    # 案件を追加
+                    project_id = self.db.insert('projects', project_data)
 
-                # 作業員との関連を追加
-                worker_ids = dialog.get_selected_worker_ids()
-                for worker_id in worker_ids:
-                    self.db.add_project_worker(project_id, worker_id)
+                    # 作業員との関連を追加
+                    self.db.set_project_workers(project_id, dialog.get_selected_worker_ids())
 
                 self.load_projects()
                 QMessageBox.information(self, "成功", "案件を登録しました。")
@@ -859,15 +885,13 @@ class ProjectsTab(QWidget):
         if dialog.exec():
             updated_data = dialog.get_project_data()
             try:
-                # 案件を更新
-                self.db.update('projects', updated_data, "id = ?", (project_id,))
+                # 案件と作業員との関連をまとめて更新する（途中で失敗した場合はすべて取り消す）
+                with self.db.transaction():
+                    # 案件を更新
+                    self.db.update('projects', updated_data, "id = ?", (project_id,))
 
-                # 作業員との関連を更新（いったん全部削除して再登録）
-                self.db.delete('project_workers', "project_id = ?", (project_id,))
-
-                worker_ids = dialog.get_selected_worker_ids()
-                for worker_id in worker_ids:
-                    self.db.add_project_worker(project_id, worker_id)
+                    # 作業員との関連を更新（外れた作業員の削除と追加された作業員の登録）
+                    self.db.set_project_workers(project_id, dialog.get_selected_worker_ids())
 
                 self.load_projects()
                 QMessageBox.information(self, "成功", "案件情報を更新しました。")
@@ -894,11 +918,8 @@ class ProjectsTab(QWidget):
         if confirm_dialog.exec():
             project_id = int(selected_data["ID"])
             try:
-                # 作業員との関連を先に削除
-                self.db.delete('project_workers', "project_id = ?", (project_id,))
-
-                # 案件を削除
-                self.db.delete('projects', "id = ?", (project_id,))
+                # 作業員・写真の登録とともに削除する
+                self.db.delete_project(project_id)
 
                 self.load_projects()
                 QMessageBox.information(self, "成功", "案件を削除しました。")
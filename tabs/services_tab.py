@@ -4,7 +4,7 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal
 
-from components import SearchBar, ActionBar, EnhancedTable, ConfirmDialog
+from components import SearchBar, ActionBar, EnhancedTableView, ConfirmDialog
 from styles import StyleManager
 
 
@@ -106,7 +106,7 @@ class ServicesTab(QWidget):
         layout.addWidget(self.action_bar)
 
         # テーブル
-        self.table = EnhancedTable(["ID", "サービス名", "説明"])
+        self.table = EnhancedTableView(["ID", "サービス名", "説明"])
         self.table.setColumnHidden(0, True)  # ID列を非表示
         layout.addWidget(self.table)
 
@@ -131,21 +131,18 @@ class ServicesTab(QWidget):
             self.load_services()
             return
 
-        services = self.db.select('services', condition="name LIKE ?", values=(f"%{search_text}%",))
+        # 関連度の高い順に表示する
+        services = self.db.search('services', search_text)
         self.set_table_data(services)
 
     def set_table_data(self, services):
         """テーブルにデータをセットする"""
-        # データをテーブル表示用に整形
-        display_data = []
-        for service in services:
-            display_data.append({
-                "ID": service["id"],
-                "サービス名": service["name"],
-                "説明": service.get("description", "") or ""
-            })
-
-        self.table.set_data(display_data)
+        # 表示用の値は表示時に各行から取り出す
+        self.table.set_rows(services, {
+            "ID": "id",
+            "サービス名": "name",
+            "説明": "description"
+        })
 
     def add_service(self):
         """サービスを追加する"""
@@ -217,8 +214,8 @@ class ServicesTab(QWidget):
                     if not confirm_cascade.exec():
                         return
 
-                # 削除実行
-                self.db.delete('services', "id = ?", (service_id,))
+                # 関連する案件とともに削除
+                self.db.delete_service(service_id)
                 self.load_services()
                 QMessageBox.information(self, "成功", "サービスを削除しました。")
             except Exception as e:
@@ -7,46 +7,262 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QPainter, QPen, QColor, QFont
-import matplotlib
-matplotlib.use('QtAgg')
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
-from matplotlib.figure import Figure
-import matplotlib.pyplot as plt
+import matplotlib.ticker
 import numpy as np
 import datetime
-import mplcursors  # ホバー表示用モジュール
 
 from styles import StyleManager
 from components import EnhancedTable
+from chart_renderer import ChartView, render_chart_image, chart_image_cache
 
 # 年度リスト（2025年から2035年まで）
 YEARS = list(range(2025, 2036))
 
-class MatplotlibCanvas(FigureCanvasQTAgg):
-    """MatplotlibをQtに統合するためのキャンバスクラス"""
-    def __init__(self, figure=None, parent=None, dpi=100):
-        if figure is None:
-            self.figure = Figure(figsize=(5, 4), dpi=dpi)
-            self.figure.patch.set_facecolor('#F5F5F7')  # 背景色
-        else:
-            self.figure = figure
-
-        super().__init__(self.figure)
-        self.setParent(parent)
-
-        # グラフスタイルを設定
-        plt.style.use('ggplot')
+def build_service_chart(figure, year, service_stats):
+    """サービス別売上の棒グラフを作成する（ワーカースレッドでの画像描画とホバー表示用のキャンバスで共用）"""
+    ax = figure.add_subplot(111)
+
+    # データの準備
+    services = [stat['service_name'] for stat in service_stats]
+    amounts = [stat['total_amount'] for stat in service_stats]
+
+    # サービスが0件の場合、空のグラフを表示
+    if not services:
+        ax.text(0.5, 0.5, 'データがありません', ha='center', va='center', fontsize=12)
+        ax.set_axis_off()
+        return None
+
+    # 棒グラフを描画
+    bars = ax.bar(services, amounts, color=StyleManager.get_chart_colors(len(services)))
+
+    # グラフのスタイル設定
+    ax.set_title(f'{year}年度 サービス別売上', fontsize=14, fontweight='bold')
+    ax.set_xlabel('サービス名', fontsize=12)
+    ax.set_ylabel('売上金額(円)', fontsize=12)
+
+    # Y軸のフォーマット（通貨表示）
+    ax.get_yaxis().set_major_formatter(
+        matplotlib.ticker.FuncFormatter(lambda x, p: f'{int(x):,}円'))
+
+    # X軸ラベルを回転して表示（pyplot の現在の軸ではなく、この軸のラベルに設定する）
+    for label in ax.get_xticklabels():
+        label.set_rotation(45)
+        label.set_horizontalalignment('right')
+
+    # データラベルを表示
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(
+            bar.get_x() + bar.get_width()/2, height + 5,
+            f'{int(height):,}円', ha='center', va='bottom',
+            fontsize=10, rotation=0
+        )
 
-        # フォントの設定
-        plt.rcParams['font.family'] = 'sans-serif'
-        plt.rcParams['font.sans-serif'] = ['Meiryo', 'Yu Gothic', 'Noto Sans CJK JP']
+    return None
+
+
+def build_yearly_comparison_chart(figure, current_year, compare_year, yearly_target, comparison_data, monthly_targets):
+    """年度間比較グラフを作成する（ワーカースレッドでの画像描画とホバー表示用のキャンバスで共用）
+
+    Returns:
+        ホバー表示の対象 (アーティストのリスト, 表示処理)
+    """
+    ax = figure.add_subplot(111)
+
+    # X軸の月ラベル
+    months = ['1月', '2月', '3月', '4月', '5月', '6月', '7月', '8月', '9月', '10月', '11月', '12月']
+    x = np.arange(len(months))
+
+    # 現在年度と比較年度のデータ
+    monthly_data_current = comparison_data['current_data']
+    monthly_data_compare = comparison_data['compare_data']
+
+    # 累計データの計算
+    cumulative_data_current = np.cumsum(monthly_data_current)
+    cumulative_data_compare = np.cumsum(monthly_data_compare)
+
+    # 月別目標が設定されていない場合、年間目標を按分
+    if sum(monthly_targets) <= 0:
+        monthly_targets = [yearly_target / 12] * 12
+
+    # 月別目標の累積値を計算
+    monthly_cumulative_targets = np.cumsum(monthly_targets)
+
+    # データの最大値を取得してY軸の範囲を決定
+    max_value = max(
+        max(cumulative_data_current) if len(cumulative_data_current) > 0 else 0,
+        max(cumulative_data_compare) if len(cumulative_data_compare) > 0 else 0,
+        max(monthly_cumulative_targets) if len(monthly_cumulative_targets) > 0 else yearly_target  # 最大の目標値
+    )
+
+    # 棒グラフ（月別売上）より薄い色で表示
+    bar_width = 0.25  # 棒グラフの幅を小さくして目標バーも表示できるようにする
+    bars_current = ax.bar(x - bar_width, monthly_data_current, bar_width,
+                label=f'{current_year}年度 月別', color='#1F77B4', alpha=0.3)
+    bars_compare = ax.bar(x, monthly_data_compare, bar_width,
+                label=f'{compare_year}年度 月別', color='#FF7F0E', alpha=0.3)
+    # 月別目標を棒グラフで表示
+    bars_target = ax.bar(x + bar_width, monthly_targets, bar_width,
+                label=f'月別目標', color='#FF0000', alpha=0.3)
+
+    # 折れ線グラフ（累計売上）より強調して表示
+    line_current = ax.plot(x, cumulative_data_current, 'o-', linewidth=2.5,
+                 label=f'{current_year}年度 累計', color='#1F77B4')
+    line_compare = ax.plot(x, cumulative_data_compare, 'o--', linewidth=2,
+                 label=f'{compare_year}年度 累計', color='#FF7F0E')
+
+    # 年間目標ラインを描画（赤色の太い破線）
+    target_line = ax.plot(x, monthly_cumulative_targets, '--', linewidth=2.5,
+                     label=f'目標累計({int(yearly_target):,}円)', color='red', alpha=0.8)
+
+    # Y軸の範囲を設定（最大値の20%増しで設定）
+    ax.set_ylim(0, max_value * 1.2)
+
+    # グラフのスタイル設定
+    ax.set_title(f'{current_year}年度 vs {compare_year}年度 売上比較(月別・累計)', fontsize=14, fontweight='bold')
+
+    # Y軸の金額フォーマットを整数に設定
+    from matplotlib.ticker import FuncFormatter
+    def currency_formatter(x, pos):
+        return f'¥{int(x):,}'
+    ax.yaxis.set_major_formatter(FuncFormatter(currency_formatter))
+    ax.set_xlabel('月', fontsize=12)
+    ax.set_ylabel('売上金額(円)', fontsize=12)
+    ax.set_xticks(x)
+    ax.set_xticklabels(months)
+    ax.grid(True, linestyle='--', alpha=0.7)
+
+    # X軸の範囲を少し広げてラベル用のスペースを確保
+    ax.set_xlim(-0.5, 11.5)
+
+    # Y軸のフォーマット（通貨表示）
+    ax.get_yaxis().set_major_formatter(
+        matplotlib.ticker.FuncFormatter(lambda x, p: f'{int(x):,}円'))
+
+    # 凡例を表示（適切な位置に）
+    ax.legend(loc='upper left')
+
+    # 目標達成率の表示
+    for i, (target, current) in enumerate(zip(monthly_cumulative_targets, cumulative_data_current)):
+        if i == 11:  # 12月（最終月）の場合
+            achievement_rate = (current / target * 100) if target > 0 else 0
+            ax.annotate(f'達成率 {achievement_rate:.1f}%',
+                       xy=(i, current),
+                       xytext=(0, 10),
+                       textcoords='offset points',
+                       ha='center',
+                       fontsize=10,
+                       color='#1F77B4',
+                       fontweight='bold')
+
+    # ホバー時の詳細表示を追加
+    # 折れ線グラフ（累計）とバー（月別）の両方にカーソルを追加
+    # （カーソルはホバー表示用のキャンバスに切り替えた時に ChartView が設定する）
+    def on_hover(sel):
+        # インデックスの取得方法を修正
+        try:
+            # グラフの種類によって異なる方法でインデックスを取得
+            index = 0  # デフォルト値
+
+            # まず、sel.targetのオブジェクトタイプに基づいて処理
+            if hasattr(sel, 'index'):
+                # 直接インデックスプロパティがある場合
+                index = sel.index
+            elif hasattr(sel.target, 'get_offsets'):
+                # OffsetCollectionの場合
+                offsets = sel.target.get_offsets()
+                if len(offsets) > 0 and sel.index < len(offsets):
+                    index = int(offsets[sel.index][0])
+            elif hasattr(sel, 'target') and hasattr(sel.target, 'get_xdata'):
+                # Lineの場合
+                xdata = sel.target.get_xdata()
+                if len(xdata) > 0 and hasattr(sel, 'index') and sel.index < len(xdata):
+                    index = int(xdata[sel.index])
+            elif hasattr(sel, 'point_index'):
+                # point_indexプロパティがある場合
+                index = sel.point_index
+            elif hasattr(sel, 'dataIdx'):
+                # dataIdxプロパティがある場合
+                index = sel.dataIdx
+            else:
+                # どの方法でもインデックスが取得できない場合、
+                # インデックス0（最初の要素）をデフォルトとして使用
+                index = 0
+
+            # インデックスの範囲を確認し、有効な範囲に収める
+            index = min(max(int(index), 0), len(months) - 1)
+
+            month = months[index]
+
+            if sel.artist == line_current[0]:
+                # 現在年度の累計売上
+                month_value = monthly_data_current[index]
+                cumulative_value = cumulative_data_current[index]
+                target_value = monthly_cumulative_targets[index]
+                achievement_rate = (cumulative_value / target_value * 100) if target_value > 0 else 0
+
+                sel.annotation.set_text(
+                    f"{month} ({current_year}年度)\n"
+                    f"月別売上: {int(month_value):,}円\n"
+                    f"累計売上: {int(cumulative_value):,}円\n"
+                    f"目標累計: {int(target_value):,}円\n"
+                    f"達成率: {achievement_rate:.1f}%"
+                )
+            elif sel.artist == line_compare[0]:
+                # 比較年度の累計売上
+                month_value = monthly_data_compare[index]
+                cumulative_value = cumulative_data_compare[index]
+
+                sel.annotation.set_text(
+                    f"{month} ({compare_year}年度)\n"
+                    f"月別売上: {int(month_value):,}円\n"
+                    f"累計売上: {int(cumulative_value):,}円"
+                )
+            elif sel.artist in bars_current:
+                # 現在年度の月別売上（バーグラフ）
+                month_value = monthly_data_current[index]
+                cumulative_value = cumulative_data_current[index]
+
+                sel.annotation.set_text(
+                    f"{month} ({current_year}年度)\n"
+                    f"月別売上: {int(month_value):,}円\n"
+                    f"累計売上: {int(cumulative_value):,}円"
+                )
+            elif sel.artist in bars_compare:
+                # 比較年度の月別売上（バーグラフ）
+                month_value = monthly_data_compare[index]
+                cumulative_value = cumulative_data_compare[index]
+
+                sel.annotation.set_text(
+                    f"{month} ({compare_year}年度)\n"
+                    f"月別売上: {int(month_value):,}円\n"
+                    f"累計売上: {int(cumulative_value):,}円"
+                )
+            elif sel.artist in bars_target:
+                # 月別目標（バーグラフ）
+                target = monthly_targets[index]
+                cumulative_target = monthly_cumulative_targets[index]
+
+                sel.annotation.set_text(
+                    f"{month} (目標)\n"
+                    f"月別目標: {int(target):,}円\n"
+                    f"累計目標: {int(cumulative_target):,}円"
+                )
+        except Exception as e:
+            # エラーが発生した場合、簡単なメッセージを表示
+            print(f"ホバー表示エラー: {e}")
+            sel.annotation.set_text(f"データ表示エラー")
+
+    return [line_current[0], line_compare[0], bars_current, bars_compare, bars_target], on_hover
 
 
 class BarChartWidget(QWidget):
     """サービス別統計の棒グラフを表示するウィジェット"""
-    def __init__(self, db, parent=None):
+    def __init__(self, db, query_executor, parent=None):
         super().__init__(parent)
         self.db = db
+        # 読み込みは共有の実行器でバックグラウンドに行い、結果が届いてから表示する
+        self.query_executor = query_executor
         self.setup_ui()
 
     def setup_ui(self):
@@ -75,72 +291,62 @@ class BarChartWidget(QWidget):
 
         layout.addLayout(controls_layout)
 
-        # グラフキャンバス
-        self.canvas = MatplotlibCanvas()
-        layout.addWidget(self.canvas)
+        # グラフ（ワーカースレッドで描画した画像を表示する）
+        self.chart_view = ChartView()
+        self.displayed_key = None
+        layout.addWidget(self.chart_view)
 
         # シグナル接続
         self.year_combo.currentIndexChanged.connect(self.update_chart)
-
-        # 初期データでグラフを更新
-        self.update_chart()
+        self.chart_view.resized.connect(self.update_chart)
 
     def update_chart(self):
         """年度を選択してグラフを更新する"""
         year = self.year_combo.currentData()
-        service_stats = self.db.get_service_stats_for_chart(year)
-
-        # グラフをクリア
-        self.canvas.figure.clear()
-        ax = self.canvas.figure.add_subplot(111)
-
-        # データの準備
-        services = [stat['service_name'] for stat in service_stats]
-        amounts = [stat['total_amount'] for stat in service_stats]
-
-        # サービスが0件の場合、空のグラフを表示
-        if not services:
-            ax.text(0.5, 0.5, 'データがありません', ha='center', va='center', fontsize=12)
-            ax.set_axis_off()
-            self.canvas.draw()
+        size = self.chart_view.render_size()
+        key = ('service_chart', year, self.db.query_generation('get_service_stats_for_chart'), size)
+        if key == self.displayed_key:
             return
 
-        # 棒グラフを描画
-        bars = ax.bar(services, amounts, color=StyleManager.get_chart_colors(len(services)))
-
-        # グラフのスタイル設定
-        ax.set_title(f'{year}年度 サービス別売上', fontsize=14, fontweight='bold')
-        ax.set_xlabel('サービス名', fontsize=12)
-        ax.set_ylabel('売上金額(円)', fontsize=12)
-
-        # Y軸のフォーマット（通貨表示）
-        ax.get_yaxis().set_major_formatter(
-            matplotlib.ticker.FuncFormatter(lambda x, p: f'{int(x):,}円'))
+        # 同じ年度・データ・大きさの画像が描画済みであればすぐに表示する
+        cached = chart_image_cache.get(key)
+        if cached is not None:
+            self.query_executor.cancel(self)
+            self.show_chart(key, year, *cached)
+            return
 
-        # X軸ラベルを回転して表示
-        plt.xticks(rotation=45, ha='right')
+        self.query_executor.submit(
+            self, self.render_chart, year, size, self.devicePixelRatioF(),
+            callback=lambda result: self.on_chart_rendered(key, year, *result)
+        )
 
-        # データラベルを表示
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(
-                bar.get_x() + bar.get_width()/2, height + 5,
-                f'{int(height):,}円', ha='center', va='bottom',
-                fontsize=10, rotation=0
-            )
+    @staticmethod
+    def render_chart(db, year, size, device_pixel_ratio):
+        """サービス別統計を取得してグラフを画像に描画する（ワーカースレッドで実行）"""
+        service_stats = db.get_service_stats_for_chart(year)
+        image = render_chart_image(
+            lambda figure: build_service_chart(figure, year, service_stats), size, device_pixel_ratio)
+        return image, service_stats
 
-        # レイアウトの調整
-        self.canvas.figure.tight_layout()
+    def on_chart_rendered(self, key, year, image, service_stats):
+        """描画した画像をキャッシュして表示する"""
+        chart_image_cache.put(key, image, service_stats)
+        self.show_chart(key, year, image, service_stats)
 
-        # グラフを描画
-        self.canvas.draw()
+    def show_chart(self, key, year, image, service_stats):
+        """描画済みの画像を表示する"""
+        self.displayed_key = key
+        # サービス別グラフにはホバー表示が無いため、画像のまま表示する
+        self.chart_view.show_image(image, None)
 
 
 class PriceStatsWidget(QWidget):
     """価格統計情報を表示するウィジェット"""
-    def __init__(self, db, parent=None):
+    def __init__(self, db, query_executor, parent=None):
         super().__init__(parent)
         self.db = db
+        # 読み込みは共有の実行器でバックグラウンドに行い、結果が届いてから表示する
+        self.query_executor = query_executor
         self.setup_ui()
 
     def setup_ui(self):
@@ -200,14 +406,13 @@ class PriceStatsWidget(QWidget):
         # スペーサを追加してウィジェットを上部に配置
         layout.addStretch()
 
-        # 初期データで統計情報を更新
-        self.update_stats()
-
     def update_stats(self):
         """年度を選択して統計情報を更新する"""
         year = self.year_combo.currentData()
-        stats = self.db.get_price_statistics(year)
+        self.query_executor.submit(self, "get_price_statistics", year, callback=self.show_stats)
 
+    def show_stats(self, stats):
+        """取得した価格統計を表示する"""
         # 金額フォーマット関数
         def format_price(price):
             return f"{int(price):,}円" if price else "0円"
@@ -222,9 +427,11 @@ class PriceStatsWidget(QWidget):
 
 class TroubleStatsWidget(QWidget):
     """トラブル統計情報を表示するウィジェット"""
-    def __init__(self, db, parent=None):
+    def __init__(self, db, query_executor, parent=None):
         super().__init__(parent)
         self.db = db
+        # 読み込みは共有の実行器でバックグラウンドに行い、結果が届いてから表示する
+        self.query_executor = query_executor
         self.setup_ui()
 
     def setup_ui(self):
@@ -282,15 +489,24 @@ class TroubleStatsWidget(QWidget):
         # シグナル接続
         self.year_combo.currentIndexChanged.connect(self.update_stats)
 
-        # 初期データで統計情報を更新
-        self.update_stats()
-
     def update_stats(self):
         """年度を選択して統計情報を更新する"""
         year = self.year_combo.currentData()
+        self.query_executor.submit(self, self.load_stats, year, callback=self.show_stats)
+
+    @staticmethod
+    def load_stats(db, year):
+        """作業員別・取引先別のトラブル統計を取得する（ワーカースレッドで実行）"""
+        return (
+            db.get_trouble_statistics_by_worker(year),
+            db.get_trouble_statistics_by_client(year)
+        )
+
+    def show_stats(self, stats):
+        """取得したトラブル統計を表示する"""
+        worker_stats, client_stats = stats
 
         # 作業員別トラブル統計
-        worker_stats = self.db.get_trouble_statistics_by_worker(year)
         worker_data = []
         for stat in worker_stats:
             worker_data.append({
@@ -303,7 +519,6 @@ class TroubleStatsWidget(QWidget):
         self.worker_table.set_data(worker_data)
 
         # 取引先別トラブル統計
-        client_stats = self.db.get_trouble_statistics_by_client(year)
         client_data = []
         for stat in client_stats:
             client_data.append({
@@ -318,9 +533,11 @@ class TroubleStatsWidget(QWidget):
 
 class YearlyComparisonWidget(QWidget):
     """年度間比較グラフを表示するウィジェット"""
-    def __init__(self, db, parent=None):
+    def __init__(self, db, query_executor, parent=None):
         super().__init__(parent)
         self.db = db
+        # 読み込みは共有の実行器でバックグラウンドに行い、結果が届いてから表示する
+        self.query_executor = query_executor
         self.setup_ui()
 
     def setup_ui(self):
@@ -364,236 +581,75 @@ class YearlyComparisonWidget(QWidget):
 
         layout.addLayout(controls_layout)
 
-        # グラフキャンバス
-        self.canvas = MatplotlibCanvas()
-        layout.addWidget(self.canvas)
+        # グラフ（ワーカースレッドで描画した画像を表示する）
+        self.chart_view = ChartView()
+        self.displayed_key = None
+        layout.addWidget(self.chart_view)
 
         # シグナル接続
         self.current_year_combo.currentIndexChanged.connect(self.update_chart)
         self.compare_year_combo.currentIndexChanged.connect(self.update_chart)
-
-        # 初期データでグラフを更新
-        self.update_chart()
+        self.chart_view.resized.connect(self.update_chart)
 
     def update_chart(self):
         """選択した年度で比較グラフを更新する"""
         current_year = self.current_year_combo.currentData()
         compare_year = self.compare_year_combo.currentData()
+        size = self.chart_view.render_size()
+        key = ('yearly_comparison', current_year, compare_year,
+               self.db.query_generation('get_yearly_comparison'), size)
+        if key == self.displayed_key:
+            return
 
-        # 年間目標を取得（売上目標設定タブで設定された値のみを使用）
-        yearly_target = self.db.get_sales_target(current_year, 0)
-
-        # データ取得
-        comparison_data = self.db.get_yearly_comparison_data(current_year, compare_year)
-
-        # グラフをクリア
-        self.canvas.figure.clear()
-        ax = self.canvas.figure.add_subplot(111)
-
-        # X軸の月ラベル
-        months = ['1月', '2月', '3月', '4月', '5月', '6月', '7月', '8月', '9月', '10月', '11月', '12月']
-        x = np.arange(len(months))
-
-        # 現在年度と比較年度のデータ
-        monthly_data_current = comparison_data['current_data']
-        monthly_data_compare = comparison_data['compare_data']
-
-        # 累計データの計算
-        cumulative_data_current = np.cumsum(monthly_data_current)
-        cumulative_data_compare = np.cumsum(monthly_data_compare)
-
-        # 月別目標を取得
-        monthly_targets = []
-        for month in range(1, 13):
-            target = self.db.get_sales_target(current_year, month)
-            monthly_targets.append(target)
-
-        # 月別目標が設定されていない場合、年間目標を按分
-        if sum(monthly_targets) <= 0:
-            monthly_targets = [yearly_target / 12] * 12
-
-        # 月別目標の累積値を計算
-        monthly_cumulative_targets = np.cumsum(monthly_targets)
+        # 同じ年度・データ・大きさの画像が描画済みであればすぐに表示する
+        cached = chart_image_cache.get(key)
+        if cached is not None:
+            self.query_executor.cancel(self)
+            self.show_chart(key, *cached)
+            return
 
-        # データの最大値を取得してY軸の範囲を決定
-        max_value = max(
-            max(cumulative_data_current) if len(cumulative_data_current) > 0 else 0,
-            max(cumulative_data_compare) if len(cumulative_data_compare) > 0 else 0,
-            max(monthly_cumulative_targets) if len(monthly_cumulative_targets) > 0 else yearly_target  # 最大の目標値
+        self.query_executor.submit(
+            self, self.render_chart, current_year, compare_year, size, self.devicePixelRatioF(),
+            callback=lambda result: self.on_chart_rendered(key, *result)
         )
 
-        # 棒グラフ（月別売上）より薄い色で表示
-        bar_width = 0.25  # 棒グラフの幅を小さくして目標バーも表示できるようにする
-        bars_current = ax.bar(x - bar_width, monthly_data_current, bar_width,
-                    label=f'{current_year}年度 月別', color='#1F77B4', alpha=0.3)
-        bars_compare = ax.bar(x, monthly_data_compare, bar_width,
-                    label=f'{compare_year}年度 月別', color='#FF7F0E', alpha=0.3)
-        # 月別目標を棒グラフで表示
-        bars_target = ax.bar(x + bar_width, monthly_targets, bar_width,
-                    label=f'月別目標', color='#FF0000', alpha=0.3)
-
-        # 折れ線グラフ（累計売上）より強調して表示
-        line_current = ax.plot(x, cumulative_data_current, 'o-', linewidth=2.5,
-                     label=f'{current_year}年度 累計', color='#1F77B4')
-        line_compare = ax.plot(x, cumulative_data_compare, 'o--', linewidth=2,
-                     label=f'{compare_year}年度 累計', color='#FF7F0E')
-
-        # 年間目標ラインを描画（赤色の太い破線）
-        target_line = ax.plot(x, monthly_cumulative_targets, '--', linewidth=2.5,
-                         label=f'目標累計({int(yearly_target):,}円)', color='red', alpha=0.8)
-
-        # Y軸の範囲を設定（最大値の20%増しで設定）
-        ax.set_ylim(0, max_value * 1.2)
-
-        # グラフのスタイル設定
-        ax.set_title(f'{current_year}年度 vs {compare_year}年度 売上比較(月別・累計)', fontsize=14, fontweight='bold')
-        
-        # Y軸の金額フォーマットを整数に設定
-        from matplotlib.ticker import FuncFormatter
-        def currency_formatter(x, pos):
-            return f'¥{int(x):,}'
-        ax.yaxis.set_major_formatter(FuncFormatter(currency_formatter))
-        ax.set_xlabel('月', fontsize=12)
-        ax.set_ylabel('売上金額(円)', fontsize=12)
-        ax.set_xticks(x)
-        ax.set_xticklabels(months)
-        ax.grid(True, linestyle='--', alpha=0.7)
-
-        # X軸の範囲を少し広げてラベル用のスペースを確保
-        ax.set_xlim(-0.5, 11.5)
-
-        # Y軸のフォーマット（通貨表示）
-        ax.get_yaxis().set_major_formatter(
-            matplotlib.ticker.FuncFormatter(lambda x, p: f'{int(x):,}円'))
-
-        # 凡例を表示（適切な位置に）
-        ax.legend(loc='upper left')
-
-        # 目標達成率の表示
-        for i, (target, current) in enumerate(zip(monthly_cumulative_targets, cumulative_data_current)):
-            if i == 11:  # 12月（最終月）の場合
-                achievement_rate = (current / target * 100) if target > 0 else 0
-                ax.annotate(f'達成率 {achievement_rate:.1f}%',
-                           xy=(i, current),
-                           xytext=(0, 10),
-                           textcoords='offset points',
-                           ha='center',
-                           fontsize=10,
-                           color='#1F77B4',
-                           fontweight='bold')
-
-        # ホバー時の詳細表示を追加
-        # 折れ線グラフ（累計）とバー（月別）の両方にカーソルを追加
-        cursor = mplcursors.cursor([line_current[0], line_compare[0], bars_current, bars_compare, bars_target], hover=True)
-
-        @cursor.connect("add")
-        def on_hover(sel):
-            # インデックスの取得方法を修正
-            try:
-                # グラフの種類によって異なる方法でインデックスを取得
-                index = 0  # デフォルト値
-
-                # まず、sel.targetのオブジェクトタイプに基づいて処理
-                if hasattr(sel, 'index'):
-                    # 直接インデックスプロパティがある場合
-                    index = sel.index
-                elif hasattr(sel.target, 'get_offsets'):
-                    # OffsetCollectionの場合
-                    offsets = sel.target.get_offsets()
-                    if len(offsets) > 0 and sel.index < len(offsets):
-                        index = int(offsets[sel.index][0])
-                elif hasattr(sel, 'target') and hasattr(sel.target, 'get_xdata'):
-                    # Lineの場合
-                    xdata = sel.target.get_xdata()
-                    if len(xdata) > 0 and hasattr(sel, 'index') and sel.index < len(xdata):
-                        index = int(xdata[sel.index])
-                elif hasattr(sel, 'point_index'):
-                    # point_indexプロパティがある場合
-                    index = sel.point_index
-                elif hasattr(sel, 'dataIdx'):
-                    # dataIdxプロパティがある場合
-                    index = sel.dataIdx
-                else:
-                    # どの方法でもインデックスが取得できない場合、
-                    # インデックス0（最初の要素）をデフォルトとして使用
-                    index = 0
-
-                # インデックスの範囲を確認し、有効な範囲に収める
-                index = min(max(int(index), 0), len(months) - 1)
-
-                month = months[index]
-
-                if sel.artist == line_current[0]:
-                    # 現在年度の累計売上
-                    month_value = monthly_data_current[index]
-                    cumulative_value = cumulative_data_current[index]
-                    target_value = monthly_cumulative_targets[index]
-                    achievement_rate = (cumulative_value / target_value * 100) if target_value > 0 else 0
-
-                    sel.annotation.set_text(
-                        f"{month} ({current_year}年度)\n"
-                        f"月別売上: {int(month_value):,}円\n"
-                        f"累計売上: {int(cumulative_value):,}円\n"
-                        f"目標累計: {int(target_value):,}円\n"
-                        f"達成率: {achievement_rate:.1f}%"
-                    )
-                elif sel.artist == line_compare[0]:
-                    # 比較年度の累計売上
-                    month_value = monthly_data_compare[index]
-                    cumulative_value = cumulative_data_compare[index]
-
-                    sel.annotation.set_text(
-                        f"{month} ({compare_year}年度)\n"
-                        f"月別売上: {int(month_value):,}円\n"
-                        f"累計売上: {int(cumulative_value):,}円"
-                    )
-                elif sel.artist in bars_current:
-                    # 現在年度の月別売上（バーグラフ）
-                    month_value = monthly_data_current[index]
-                    cumulative_value = cumulative_data_current[index]
-
-                    sel.annotation.set_text(
-                        f"{month} ({current_year}年度)\n"
-                        f"月別売上: {int(month_value):,}円\n"
-                        f"累計売上: {int(cumulative_value):,}円"
-                    )
-                elif sel.artist in bars_compare:
-                    # 比較年度の月別売上（バーグラフ）
-                    month_value = monthly_data_compare[index]
-                    cumulative_value = cumulative_data_compare[index]
-
-                    sel.annotation.set_text(
-                        f"{month} ({compare_year}年度)\n"
-                        f"月別売上: {int(month_value):,}円\n"
-                        f"累計売上: {int(cumulative_value):,}円"
-                    )
-                elif sel.artist in bars_target:
-                    # 月別目標（バーグラフ）
-                    target = monthly_targets[index]
-                    cumulative_target = monthly_cumulative_targets[index]
-
-                    sel.annotation.set_text(
-                        f"{month} (目標)\n"
-                        f"月別目標: {int(target):,}円\n"
-                        f"累計目標: {int(cumulative_target):,}円"
-                    )
-            except Exception as e:
-                # エラーが発生した場合、簡単なメッセージを表示
-                print(f"ホバー表示エラー: {e}")
-                sel.annotation.set_text(f"データ表示エラー")
-
-        # レイアウトの調整
-        self.canvas.figure.tight_layout()
-
-        # グラフを描画
-        self.canvas.draw()
-
+    @staticmethod
+    def load_data(db, current_year, compare_year):
+        """比較グラフ用のデータを取得する（ワーカースレッドで実行）"""
+        # 両年度の月別売上と年間・月別目標（売上目標設定タブで設定された値）を1回で取得
+        comparison_data = db.get_yearly_comparison(current_year, compare_year)
+
+        return (current_year, compare_year, comparison_data['yearly_target'],
+                comparison_data, comparison_data['monthly_targets'])
+
+    @staticmethod
+    def render_chart(db, current_year, compare_year, size, device_pixel_ratio):
+        """比較グラフ用のデータを取得して画像に描画する（ワーカースレッドで実行）"""
+        chart_data = YearlyComparisonWidget.load_data(db, current_year, compare_year)
+        image = render_chart_image(
+            lambda figure: build_yearly_comparison_chart(figure, *chart_data), size, device_pixel_ratio)
+        return image, chart_data
+
+    def on_chart_rendered(self, key, image, chart_data):
+        """描画した画像をキャッシュして表示する"""
+        chart_image_cache.put(key, image, chart_data)
+        self.show_chart(key, image, chart_data)
+
+    def show_chart(self, key, image, chart_data):
+        """描画済みの画像を表示する（ホバー表示はマウスが乗った時に設定する）"""
+        self.displayed_key = key
+        self.chart_view.show_image(image, lambda figure: build_yearly_comparison_chart(figure, *chart_data))
 
 class SalesTargetWidget(QWidget):
     """売上目標設定ウィジェット"""
-    def __init__(self, db, parent=None):
+
+    targetsChanged = pyqtSignal()  # 売上目標が保存された時に発行するシグナル
+
+    def __init__(self, db, query_executor, parent=None):
         super().__init__(parent)
         self.db = db
+        # 読み込みは共有の実行器でバックグラウンドに行い、結果が届いてから表示する
+        self.query_executor = query_executor
         self.setup_ui()
 
     def setup_ui(self):
@@ -687,15 +743,21 @@ class SalesTargetWidget(QWidget):
         # シグナル接続
         self.year_combo.currentIndexChanged.connect(self.load_targets)
 
-        # 初期データでターゲットを読み込む
-        self.load_targets()
-
     def load_targets(self):
         """選択した年度の売上目標を読み込む"""
         year = self.year_combo.currentData()
 
+        # 読み込み中は古い値を保存しないよう保存ボタンを無効にする
+        self.save_annual_button.setEnabled(False)
+        self.save_monthly_button.setEnabled(False)
+
         # 全ての目標を取得
-        targets = self.db.get_all_sales_targets(year)
+        self.query_executor.submit(self, "get_all_sales_targets", year, callback=self.show_targets)
+
+    def show_targets(self, targets):
+        """取得した売上目標を入力欄に設定する"""
+        self.save_annual_button.setEnabled(True)
+        self.save_monthly_button.setEnabled(True)
 
         # 年間目標を設定
         self.annual_target_input.setValue(targets.get(0, 0))
@@ -714,6 +776,7 @@ class SalesTargetWidget(QWidget):
 
         success = self.db.set_sales_target(year, 0, target_amount)
         if success:
+            self.targetsChanged.emit()
             QMessageBox.information(self, "保存完了", f"{year}年度の年間売上目標を保存しました。")
         else:
             QMessageBox.warning(self, "保存エラー", "年間売上目標の保存に失敗しました。")
@@ -721,35 +784,38 @@ class SalesTargetWidget(QWidget):
     def save_monthly_targets(self):
         """月別売上目標を保存する"""
         year = self.year_combo.currentData()
-        error_months = []
 
-        # 各月の目標を保存
+        # 各月の目標をまとめて保存（1回のコミット）
+        targets = {}
         for row in range(12):
             month = row + 1
             target_spinbox = self.monthly_table.cellWidget(row, 1)
             if target_spinbox:
-                target_amount = target_spinbox.value()
-                success = self.db.set_sales_target(year, month, target_amount)
-                if not success:
-                    error_months.append(str(month))
-
-        if error_months:
-            QMessageBox.warning(
-                self,
-                "保存エラー",
-                f"以下の月の売上目標保存に失敗しました: {', '.join(error_months)}"
-            )
-        else:
+                targets[month] = target_spinbox.value()
+
+        success = self.db.set_sales_targets(year, targets)
+        if success:
+            self.targetsChanged.emit()
             QMessageBox.information(self, "保存完了", f"{year}年度の月別売上目標を保存しました。")
+        else:
+            QMessageBox.warning(self, "保存エラー", "月別売上目標の保存に失敗しました。")
 
 
 class StatisticsTab(QWidget):
-    """統計情報タブ"""
+    """統計情報タブ
+
+    データ変更時は invalidate() で各ウィジェットを「要更新」にするだけにとどめ、
+    実際の再計算・再描画はそのウィジェットが表示されたときに行う。
+    """
 
-    def __init__(self, db):
+    def __init__(self, db, query_executor):
         super().__init__()
 
         self.db = db
+        # 各ウィジェットの集計はメインウィンドウと共有する実行器でバックグラウンドに行う
+        self.query_executor = query_executor
+        # 再計算が必要なウィジェットの集合
+        self.stale_widgets = set()
         self.setup_ui()
 
     def setup_ui(self):
@@ -766,23 +832,23 @@ class StatisticsTab(QWidget):
         StyleManager.style_tabs(stats_tabs)
 
         # 売上目標設定タブ
-        sales_target_widget = SalesTargetWidget(self.db)
+        sales_target_widget = SalesTargetWidget(self.db, query_executor=self.query_executor)
         stats_tabs.addTab(sales_target_widget, "売上目標設定")
 
         # 前年度比較タブ
-        yearly_comparison_widget = YearlyComparisonWidget(self.db)
+        yearly_comparison_widget = YearlyComparisonWidget(self.db, query_executor=self.query_executor)
         stats_tabs.addTab(yearly_comparison_widget, "前年度比較")
 
         # トラブル統計タブ
-        trouble_stat_widget = TroubleStatsWidget(self.db)
+        trouble_stat_widget = TroubleStatsWidget(self.db, query_executor=self.query_executor)
         stats_tabs.addTab(trouble_stat_widget, "トラブル統計")
 
         # 価格統計タブ
-        price_stat_widget = PriceStatsWidget(self.db)
+        price_stat_widget = PriceStatsWidget(self.db, query_executor=self.query_executor)
         stats_tabs.addTab(price_stat_widget, "価格統計")
 
         # サービス別売上グラフタブ
-        service_stat_widget = BarChartWidget(self.db)
+        service_stat_widget = BarChartWidget(self.db, query_executor=self.query_executor)
         stats_tabs.addTab(service_stat_widget, "サービス別売上")
 
         layout.addWidget(stats_tabs)
@@ -797,24 +863,57 @@ class StatisticsTab(QWidget):
         self.service_stat_widget = service_stat_widget
         self.stats_tabs = stats_tabs
 
-    def update_all_stats(self):
-        """全ての統計情報ウィジェットを更新する"""
-        # 各統計ウィジェットの更新メソッドを呼び出し
-        if hasattr(self, 'sales_target_widget'):
-            self.sales_target_widget.load_targets()
+        # 各ウィジェットの更新メソッド
+        self.refreshers = {
+            sales_target_widget: sales_target_widget.load_targets,
+            yearly_comparison_widget: yearly_comparison_widget.update_chart,
+            trouble_stat_widget: trouble_stat_widget.update_stats,
+            price_stat_widget: price_stat_widget.update_stats,
+            service_stat_widget: service_stat_widget.update_chart,
+        }
+
+        # 案件データを集計するウィジェット（案件の変更時に要更新にする）
+        # 売上目標設定は案件データに依存せず、再読み込みで未保存の入力が消えるため含めない
+        self.project_widgets = [
+            yearly_comparison_widget,
+            trouble_stat_widget,
+            price_stat_widget,
+            service_stat_widget,
+        ]
+
+        # 初回は表示されたウィジェットから順に読み込む
+        self.stale_widgets = set(self.refreshers.keys())
 
-        if hasattr(self, 'yearly_comparison_widget'):
-            self.yearly_comparison_widget.update_chart()
+        # シグナル接続
+        stats_tabs.currentChanged.connect(self.refresh_visible)
+        sales_target_widget.targetsChanged.connect(
+            lambda: self.invalidate([self.yearly_comparison_widget])
+        )
+
+    def invalidate(self, widgets=None):
+        """統計ウィジェットを要更新にする（表示中のものだけ即時に更新する）
 
-        if hasattr(self, 'trouble_stat_widget'):
-            self.trouble_stat_widget.update_stats()
+        widgets を省略した場合は案件データを集計するウィジェットを要更新にする。
+        """
+        if widgets is None:
+            widgets = self.project_widgets
+        self.stale_widgets.update(widgets)
 
-        if hasattr(self, 'price_stat_widget'):
-            self.price_stat_widget.update_stats()
+        if self.isVisible():
+            self.refresh_visible()
 
-        if hasattr(self, 'service_stat_widget'):
-            self.service_stat_widget.update_chart()
+    def refresh_visible(self):
+        """表示中のウィジェットが要更新であれば更新する"""
+        widget = self.stats_tabs.currentWidget()
+        if widget in self.stale_widgets:
+            self.stale_widgets.discard(widget)
+            self.refreshers[widget]()
 
-        # 現在選択されているタブのインデックスを取得して同じタブに戻す
-        current_index = self.stats_tabs.currentIndex()
-        self.stats_tabs.setCurrentIndex(current_index)
+    def showEvent(self, event):
+        """タブが表示された時の処理"""
+        super().showEvent(event)
+        self.refresh_visible()
+
+    def update_all_stats(self):
+        """案件データを集計する統計情報ウィジェットを要更新にする"""
+        self.invalidate()
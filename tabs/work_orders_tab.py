@@ -11,8 +11,8 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from components import (
-    SearchBar, ActionBar, EnhancedTable, ConfirmDialog,
-    EnhancedComboBox, StyleManager
+    SearchBar, ActionBar, EnhancedTable, EnhancedTableView, ConfirmDialog,
+    EnhancedComboBox, StyleManager, FilterController
 )
 from dialogs.work_order_dialog import WorkOrderDialog
 
@@ -61,7 +61,7 @@ class ProjectSelectionDialog(QDialog):
         filter_layout = QHBoxLayout()
 
         # 検索バー
-        self.search_bar = SearchBar("案件タイトルで検索...")
+        self.search_bar = SearchBar("案件タイトル・住所で検索...")
         self.search_bar.searchClicked.connect(self.filter_projects)
         self.search_bar.resetClicked.connect(self.reset_filters)
         filter_layout.addWidget(self.search_bar)
@@ -189,9 +189,10 @@ class ProjectSelectionDialog(QDialog):
         values = []
 
         if search_text:
-            conditions.append("p.title LIKE ? OR p.site_address LIKE ?")
-            values.append(f"%{search_text}%")
-            values.append(f"%{search_text}%")
+            search_condition, search_values = self.db.search_condition(
+                'projects', search_text, alias='p', columns=('title', 'site_address'))
+            conditions.append(search_condition)
+            values.extend(search_values)
 
         if selected_client_id:
             conditions.append("p.client_id = ?")
@@ -249,10 +250,12 @@ class WorkOrdersTab(QWidget):
     # シグナル定義
     ordersChanged = pyqtSignal()  # 業務指示書データが変更された時に発行するシグナル
 
-    def __init__(self, db):
+    def __init__(self, db, query_executor):
         super().__init__()
 
         self.db = db
+        # 一覧の読み込みはメインウィンドウと共有する実行器でバックグラウンドに行う
+        self.query_executor = query_executor
         self.setup_ui()
         self.load_work_orders()
 
@@ -293,7 +296,7 @@ class WorkOrdersTab(QWidget):
         layout.addLayout(preview_layout)
 
         # テーブル
-        self.table = EnhancedTable([
+        self.table = EnhancedTableView([
             "ID", "番号", "作成日", "現場名", "作業期間", "作業内容", "担当者", "作成者", "案件"
         ])
         self.table.setColumnHidden(0, True)  # ID列を非表示
@@ -307,8 +310,12 @@ class WorkOrdersTab(QWidget):
 
         self.setLayout(layout)
 
+        # 入力しながら検索する（連続した入力は1回の検索にまとめる）
+        self.filter_controller = FilterController(self.search_work_orders, parent=self)
+        self.filter_controller.watch(self.search_bar.search_input.textChanged)
+
         # シグナル接続
-        self.search_bar.searchClicked.connect(self.search_work_orders)
+        self.search_bar.searchClicked.connect(self.filter_controller.apply_now)
         self.search_bar.resetClicked.connect(self.load_work_orders)
         self.action_bar.addClicked.connect(self.add_work_order)
         self.action_bar.editClicked.connect(self.edit_work_order)
@@ -317,8 +324,27 @@ class WorkOrdersTab(QWidget):
 
     def load_work_orders(self):
         """業務指示書データをロードする"""
-        work_orders = self.db.get_work_orders()
-        self.set_table_data(work_orders)
+        self.filter_controller.cancel()
+        self.load_work_order_pages()
+        self.filter_controller.remember(None, "")
+
+    def load_work_order_pages(self, condition="", values=()):
+        """業務指示書データを最初のページだけ読み込み、残りはスクロールに応じて読み込む"""
+        # 表示する行が記録済みの検索条件と一致しなくなるため破棄する
+        self.filter_controller.forget()
+
+        # 新しい条件で読み込むと、実行中の古い読み込みは中断される
+        def request_page(cursor, deliver):
+            self.query_executor.submit(
+                "work_orders_page",
+                "get_work_orders_page",
+                condition,
+                values,
+                after=cursor,
+                callback=lambda result: deliver(*result)
+            )
+
+        self.table.set_async_pager(request_page, self.table_columns())
 
     def search_work_orders(self):
         """業務指示書を検索する"""
@@ -327,33 +353,42 @@ class WorkOrdersTab(QWidget):
             self.load_work_orders()
             return
 
-        # 検索条件
-        condition = "wo.site_name LIKE ? OR wo.order_number LIKE ? OR p.title LIKE ?"
-        values = (f"%{search_text}%", f"%{search_text}%", f"%{search_text}%")
+        # 検索テキストを書き足しただけなら、読み込み済みの結果から絞り込む
+        if (self.filter_controller.narrows(None, search_text)
+                and self.table.table_model.filter_rows(
+                    lambda order: FilterController.matches(
+                        search_text, order['order_number'], order['site_name'], order['work_details'],
+                        order['memo'], order['project_title']))):
+            self.filter_controller.remember(None, search_text)
+            return
 
-        work_orders = self.db.get_work_orders(condition, values)
-        self.set_table_data(work_orders)
+        # 検索条件（業務指示書の本文、または紐づく案件のタイトルに一致するもの）
+        order_condition, order_values = self.db.search_condition('work_orders', search_text, alias='wo')
+        project_condition, project_values = self.db.search_condition(
+            'projects', search_text, alias='p', columns=('title',))
+        condition = f"{order_condition} OR {project_condition}"
+        values = order_values + project_values
+
+        self.load_work_order_pages(condition, values)
+        self.filter_controller.remember(None, search_text)
+
+    def table_columns(self):
+        """テーブルの各列の値の取り出し方（表示用の値は表示時に各行から取り出す）"""
+        return {
+            "ID": "id",
+            "番号": "order_number",
+            "作成日": "creation_date",
+            "現場名": "site_name",
+            "作業期間": lambda order: f"{order['start_date']} 〜 {order['end_date']}",
+            "作業内容": "work_content",
+            "担当者": "manager_name",
+            "作成者": "creator_name",
+            "案件": lambda order: order["project_title"] if order["project_title"] else "なし"
+        }
 
     def set_table_data(self, work_orders):
         """テーブルにデータをセットする"""
-        display_data = []
-        for order in work_orders:
-            display_data.append({
-                "ID": order["id"],
-                "番号": order["order_number"],
-                "作成日": order["creation_date"],
-                "現場名": order["site_name"],
-                "作業期間": f"{order['start_date']} 〜 {order['end_date']}",
-                "作業内容": order["work_content"],
-                "担当者": order["manager_name"],
-                "作成者": order["creator_name"],
-                "案件": order["project_title"] if order["project_title"] else "なし"
-            })
-
-        self.table.set_data(display_data)
-
-        # 列幅を調整
-        self.table.resizeColumnsToContents()
+        self.table.set_rows(work_orders, self.table_columns())
 
     def add_work_order(self):
         """新規業務指示書を作成する"""
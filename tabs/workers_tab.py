@@ -4,7 +4,7 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal
 
-from components import SearchBar, ActionBar, EnhancedTable, ConfirmDialog
+from components import SearchBar, ActionBar, EnhancedTableView, ConfirmDialog
 from styles import StyleManager
 
 
@@ -170,7 +170,7 @@ class WorkersTab(QWidget):
         layout.addWidget(self.action_bar)
 
         # テーブル
-        self.table = EnhancedTable(["ID", "作業員名", "住所", "電話番号", "血液型", "緊急連絡先", "緊急連絡先住所", "備考"])
+        self.table = EnhancedTableView(["ID", "作業員名", "住所", "電話番号", "血液型", "緊急連絡先", "緊急連絡先住所", "備考"])
         self.table.setColumnHidden(0, True)  # ID列を非表示
         layout.addWidget(self.table)
 
@@ -195,26 +195,23 @@ class WorkersTab(QWidget):
             self.load_workers()
             return
 
-        workers = self.db.select('workers', condition="name LIKE ?", values=(f"%{search_text}%",))
+        # 関連度の高い順に表示する
+        workers = self.db.search('workers', search_text)
         self.set_table_data(workers)
 
     def set_table_data(self, workers):
         """テーブルにデータをセットする"""
-        # データをテーブル表示用に整形
-        display_data = []
-        for worker in workers:
-            display_data.append({
-                "ID": worker["id"],
-                "作業員名": worker["name"],
-                "住所": worker.get("address", "") or "",
-                "電話番号": worker.get("phone", "") or "",
-                "血液型": worker.get("blood_type", "") or "",
-                "緊急連絡先": worker.get("emergency_contact", "") or "",
-                "緊急連絡先住所": worker.get("emergency_address", "") or "",
-                "備考": worker.get("note", "") or ""
-            })
-
-        self.table.set_data(display_data)
+        # 表示用の値は表示時に各行から取り出す
+        self.table.set_rows(workers, {
+            "ID": "id",
+            "作業員名": "name",
+            "住所": "address",
+            "電話番号": "phone",
+            "血液型": "blood_type",
+            "緊急連絡先": "emergency_contact",
+            "緊急連絡先住所": "emergency_address",
+            "備考": "note"
+        })
 
     def add_worker(self):
         """作業員を追加する"""
@@ -294,11 +291,8 @@ class WorkersTab(QWidget):
                     if not confirm_cascade.exec():
                         return
 
-                # 作業員-案件の関連を先に削除
-                self.db.delete('project_workers', "worker_id = ?", (worker_id,))
-
-                # 作業員を削除
-                self.db.delete('workers', "id = ?", (worker_id,))
+                # 案件との関連を削除し、作業員を削除
+                self.db.delete_worker(worker_id)
                 self.load_workers()
                 QMessageBox.information(self, "成功", "作業員を削除しました。")
             except Exception as e:
@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+
+import pytest
+
+# ルート直下のモジュール（models など）を読み込めるようにする
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 画面の無い環境でも Qt のウィジェットを作成できるようにする
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from models import Database
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """テスト用のデータベースファイルのパス"""
+    return str(tmp_path / "test.db")
+
+
+@pytest.fixture
+def db(db_path):
+    """スキーマを作成したテスト用のデータベース"""
+    database = Database(db_path)
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def master_ids(db):
+    """案件の登録に必要な取引先・サービスを作成する"""
+    client_id = db.insert('clients', {'name': "テスト取引先"})
+    service_id = db.insert('services', {'name': "テストサービス"})
+    return client_id, service_id
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """テスト全体で共有する QApplication"""
+    QApplication = pytest.importorskip("PyQt6.QtWidgets").QApplication
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def wait_until(qapp):
+    """GUI スレッドのイベントを処理しながら条件が満たされるまで待つ関数"""
+    def wait(condition, timeout=10):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            assert time.monotonic() < deadline, "タイムアウトしました"
+            qapp.processEvents()
+            time.sleep(0.001)
+    return wait
+
+
+@pytest.fixture
+def query_executor(qapp, db):
+    """画面で共有するバックグラウンドの問い合わせ実行器"""
+    QueryExecutor = pytest.importorskip("query_executor").QueryExecutor
+    executor = QueryExecutor(db.db_path)
+    # アプリケーションと同じく GUI スレッドで共有の接続を先に開く
+    executor.connections.database()
+    yield executor
+    executor.shutdown()
+    executor.connections.close()
@@ -0,0 +1,95 @@
+import pytest
+
+
+def worker_ids(db, project_id):
+    rows = db.select('project_workers', 'worker_id', 'project_id = ? ORDER BY worker_id', (project_id,))
+    return [row['worker_id'] for row in rows]
+
+
+@pytest.fixture
+def project_id(db, master_ids):
+    client_id, service_id = master_ids
+    return db.insert('projects', {'client_id': client_id, 'service_id': service_id, 'title': "案件", 'price': 0})
+
+
+@pytest.fixture
+def workers(db):
+    db.insert_many('workers', [{'name': f"作業員{index}"} for index in range(4)])
+    return [row['id'] for row in db.select('workers', 'id', condition='1 = 1 ORDER BY id')]
+
+
+def test_insert_many(db):
+    assert db.insert_many('clients', [{'name': "A", 'phone': "1"}, {'name': "B", 'phone': None}]) == 2
+    rows = db.select('clients', 'name, phone', condition='1 = 1 ORDER BY id')
+    assert [(row['name'], row['phone']) for row in rows] == [("A", "1"), ("B", None)]
+    assert db.insert_many('clients', []) == 0
+
+
+def test_bulk_rows_are_validated(db):
+    with pytest.raises(ValueError):
+        db.insert_many('clients', [{'name': "A"}, {'name': "B", 'phone': "1"}])
+    with pytest.raises(ValueError):
+        db.insert_many('clients', [{'name': "A", 'no_such_column': 1}])
+    with pytest.raises(ValueError):
+        db.delete_many('clients', ('no_such_column',), [(1,)])
+    assert db.select('clients') == []
+
+
+def test_upsert_many_updates_conflicting_rows(db):
+    db.set_sales_targets(2024, {0: 1200.0, 1: 100.0})
+    assert db.set_sales_targets(2024, {1: 150.0, 2: 200.0})
+
+    targets = db.get_all_sales_targets(2024)
+    assert (targets[0], targets[1], targets[2], targets[3]) == (1200.0, 150.0, 200.0, 0.0)
+    assert len(db.select('sales_targets')) == 3
+
+
+def test_upsert_many_without_update_columns_keeps_rows(db, project_id, workers):
+    db.add_project_worker(project_id, workers[0])
+    db.add_project_worker(project_id, workers[0])
+
+    assert worker_ids(db, project_id) == [workers[0]]
+
+
+def test_delete_many(db):
+    db.insert_many('clients', [{'name': name} for name in "ABCD"])
+    ids = [row['id'] for row in db.select('clients', 'id', condition='1 = 1 ORDER BY id')]
+
+    assert db.delete_many('clients', ('id',), [(ids[0],), (ids[2],), (-1,)]) == 2
+    assert [row['name'] for row in db.select('clients', 'name', condition='1 = 1 ORDER BY id')] == ["B", "D"]
+    assert db.delete_many('clients', ('id',), []) == 0
+
+
+def test_set_project_workers_replaces_assignment(db, project_id, workers):
+    db.set_project_workers(project_id, workers[:3])
+    assert worker_ids(db, project_id) == workers[:3]
+
+    db.set_project_workers(project_id, [workers[1], workers[3]])
+    assert worker_ids(db, project_id) == [workers[1], workers[3]]
+
+    db.set_project_workers(project_id, [])
+    assert worker_ids(db, project_id) == []
+
+
+def test_bulk_writes_in_transaction_roll_back_together(db):
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.insert_many('clients', [{'name': "A"}, {'name': "B"}])
+            db.upsert_many('sales_targets', [{'year': 2024, 'month': 1, 'target_amount': 1.0}],
+                           conflict_columns=('year', 'month'))
+            raise RuntimeError("中断")
+
+    assert db.select('clients') == []
+    assert db.select('sales_targets') == []
+
+
+def test_set_project_workers_reads_assignment_inside_transaction(db, project_id, workers, monkeypatch):
+    db.set_project_workers(project_id, workers[:2])
+
+    reads = []
+    select = db.select
+    monkeypatch.setattr(db, 'select', lambda *args, **kwargs: reads.append(db.in_transaction()) or select(*args, **kwargs))
+
+    db.set_project_workers(project_id, workers[1:])
+    assert reads == [True]
+    assert worker_ids(db, project_id) == workers[1:]
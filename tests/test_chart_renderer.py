@@ -0,0 +1,85 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("PyQt6")
+pytest.importorskip("matplotlib")
+pytest.importorskip("mplcursors")
+
+from chart_renderer import ChartImageCache, ChartView, render_chart_image
+
+
+def build_bar_chart(figure):
+    ax = figure.add_subplot(111)
+    bars = ax.bar(["A", "B"], [1, 2])
+    return list(bars), lambda sel: None
+
+
+def test_render_chart_image_size(qapp):
+    image = render_chart_image(build_bar_chart, (200, 100), device_pixel_ratio=2.0)
+
+    assert (image.width(), image.height()) == (400, 200)
+    assert image.devicePixelRatio() == 2.0
+
+
+def test_image_cache_is_lru():
+    cache = ChartImageCache(max_size=2)
+    cache.put("a", "画像A", None)
+    cache.put("b", "画像B", None)
+    assert cache.get("a") == ("画像A", None)
+
+    cache.put("c", "画像C", None)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_chart_without_hover_stays_an_image(qapp):
+    view = ChartView()
+    view.show_image(render_chart_image(build_bar_chart, (200, 100)), None)
+
+    view.show_live()
+    assert view.currentWidget() is view.image_label
+    assert view.canvas is None
+
+
+def test_chart_with_hover_switches_to_canvas(qapp):
+    view = ChartView()
+    view.show_image(render_chart_image(build_bar_chart, (200, 100)), build_bar_chart)
+
+    view.show_live()
+    assert view.currentWidget() is view.canvas
+    assert view._cursor is not None
+
+    # 新しい画像を表示するとホバー表示を取り除く
+    view.show_image(render_chart_image(build_bar_chart, (200, 100)), build_bar_chart)
+    assert view.currentWidget() is view.image_label
+    assert view._cursor is None
+
+
+def test_live_canvas_does_not_wait_for_worker_render(qapp):
+    rendering = threading.Event()
+    release = threading.Event()
+
+    def slow_build(figure):
+        rendering.set()
+        release.wait(5)
+        build_bar_chart(figure)
+
+    view = ChartView()
+    view.show_image(render_chart_image(build_bar_chart, (200, 100)), build_bar_chart)
+
+    worker = threading.Thread(target=render_chart_image, args=(slow_build, (200, 100)))
+    worker.start()
+    try:
+        assert rendering.wait(5)
+
+        # ワーカースレッドの描画中でも GUI スレッドのキャンバスはすぐに描画できる
+        started = time.monotonic()
+        view.show_live()
+        assert time.monotonic() - started < 2
+        assert not release.is_set()
+    finally:
+        release.set()
+        worker.join()
@@ -0,0 +1,78 @@
+import os
+import threading
+
+import pytest
+
+from connection_manager import ConnectionManager
+from models import Database
+
+
+@pytest.fixture
+def manager(db_path):
+    connections = ConnectionManager(db_path)
+    yield connections
+    connections.close()
+
+
+def run_in_thread(func):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(func()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+def test_one_manager_per_database_file(db_path, monkeypatch):
+    monkeypatch.setattr(ConnectionManager, '_instances', {})
+    manager = ConnectionManager.get(db_path)
+    try:
+        assert ConnectionManager.get(os.path.relpath(db_path)) is manager
+    finally:
+        ConnectionManager.close_all()
+    assert ConnectionManager._instances == {}
+
+
+def test_schema_is_prepared_once(manager, monkeypatch):
+    db = manager.open()
+    calls = []
+    ensure_schema = db.ensure_schema
+    monkeypatch.setattr(db, 'ensure_schema', lambda: calls.append(1) or ensure_schema())
+
+    assert manager.database() is db
+    assert manager.database() is db
+    assert calls == [1]
+
+
+def test_current_schema_skips_table_creation(db_path, db, monkeypatch):
+    # 既に最新のスキーマであればテーブル作成と移行を行わない
+    monkeypatch.setattr(Database, 'create_tables', lambda self: pytest.fail("create_tables が呼ばれました"))
+    monkeypatch.setattr(Database, 'apply_migrations', lambda self: pytest.fail("apply_migrations が呼ばれました"))
+
+    manager = ConnectionManager(db_path)
+    try:
+        manager.database()
+    finally:
+        manager.close()
+
+
+def test_each_thread_gets_its_own_connection(manager):
+    main_db = manager.database()
+    assert manager.connection() is main_db
+
+    worker_db = run_in_thread(manager.connection)
+    other_db = run_in_thread(manager.thread_database)
+    assert worker_db is not main_db
+    assert other_db is not worker_db
+    assert run_in_thread(lambda: manager.thread_database() is manager.thread_database())
+
+
+def test_close_closes_every_connection(manager):
+    main_db = manager.database()
+    worker_db = run_in_thread(manager.thread_database)
+
+    manager.close()
+    assert main_db.conn is None
+    assert worker_db.conn is None
+
+    # 閉じた後に再び開くことができる
+    assert manager.database().conn is not None
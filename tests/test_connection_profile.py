@@ -0,0 +1,82 @@
+import sqlite3
+
+import pytest
+
+from models import Database
+
+
+@pytest.fixture
+def project(db, master_ids):
+    """作業員・写真・業務指示書から参照される案件"""
+    client_id, service_id = master_ids
+    worker_id = db.insert('workers', {'name': "作業員"})
+    project_id = db.insert('projects', {'client_id': client_id, 'service_id': service_id, 'title': "案件",
+                                        'price': 0, 'trouble_worker_id': worker_id})
+    db.add_project_worker(project_id, worker_id)
+    db.add_project_photo(project_id, "photo.jpg")
+    order_id = db.insert('work_orders', {'project_id': project_id, 'order_number': "202501-0001",
+                                         'manager_id': worker_id, 'creator_id': worker_id})
+    return {'id': project_id, 'client_id': client_id, 'worker_id': worker_id, 'order_id': order_id}
+
+
+def test_connection_profile_is_applied(db):
+    assert db.check_connection_settings() == []
+
+    settings = db.get_connection_settings()
+    assert settings['journal_mode'] == 'WAL'
+    assert settings['synchronous'] == 'NORMAL'
+    assert settings['foreign_keys'] is True
+
+
+def test_profile_can_be_overridden(db_path, db):
+    other = Database(db_path, init_schema=False, profile={'synchronous': 'FULL', 'mmap_size': None})
+    try:
+        assert other.get_connection_settings()['synchronous'] == 'FULL'
+        assert other.check_connection_settings() == []
+        # 設定できなかった項目は (名前, 指定値, 実際の値) として返す
+        other.cursor.execute("PRAGMA synchronous = OFF")
+        assert other.check_connection_settings() == [('synchronous', 'FULL', 'OFF')]
+    finally:
+        other.close()
+
+
+def test_invalid_profile_values_are_rejected(db_path):
+    with pytest.raises(ValueError):
+        Database(db_path, init_schema=False, profile={'journal_mode': "WAL; DROP TABLE clients"})
+    with pytest.raises(ValueError):
+        Database(db_path, init_schema=False, profile={'page_size': 4096})
+
+
+def test_foreign_keys_are_enforced(db, project):
+    with pytest.raises(sqlite3.IntegrityError):
+        db.insert('projects', {'client_id': -1, 'service_id': -1, 'title': "存在しない取引先"})
+    with pytest.raises(sqlite3.IntegrityError):
+        db.delete('projects', "id = ?", (project['id'],))
+
+
+def test_delete_project_removes_related_rows(db, project):
+    db.delete_project(project['id'])
+
+    assert db.select('projects') == []
+    assert db.select('project_workers') == []
+    assert db.select('project_photos') == []
+    # 業務指示書は案件との関連だけを外して残す
+    assert db.select('work_orders', 'project_id')[0]['project_id'] is None
+
+
+def test_delete_worker_keeps_references_as_null(db, project):
+    db.delete_worker(project['worker_id'])
+
+    assert db.select('workers') == []
+    assert db.select('project_workers') == []
+    assert db.select('projects', 'trouble_worker_id')[0]['trouble_worker_id'] is None
+    order = db.select('work_orders', 'manager_id, creator_id')[0]
+    assert (order['manager_id'], order['creator_id']) == (None, None)
+
+
+def test_delete_client_removes_its_projects(db, project):
+    db.delete_client(project['client_id'])
+
+    assert db.select('clients') == []
+    assert db.select('projects') == []
+    assert db.select('project_photos') == []
@@ -0,0 +1,50 @@
+def add_project(db, master_ids, **values):
+    client_id, service_id = master_ids
+    data = {'client_id': client_id, 'service_id': service_id, 'title': "案件", 'price': 1000}
+    data.update(values)
+    return db.insert('projects', data)
+
+
+def effective_date(db, project_id):
+    row = db.select('projects', "effective_year, effective_month", "id = ?", (project_id,))[0]
+    return row['effective_year'], row['effective_month']
+
+
+def test_insert_uses_completion_date(db, master_ids):
+    project_id = add_project(db, master_ids, completion_date='2023-11-30', created_at='2023-10-01 09:00:00')
+    assert effective_date(db, project_id) == (2023, 11)
+
+
+def test_insert_falls_back_to_created_at(db, master_ids):
+    project_id = add_project(db, master_ids, created_at='2022-02-15 09:00:00')
+    assert effective_date(db, project_id) == (2022, 2)
+
+
+def test_update_of_completion_date_moves_project(db, master_ids):
+    project_id = add_project(db, master_ids, created_at='2022-02-15 09:00:00')
+
+    db.update('projects', {'completion_date': '2024-01-05'}, "id = ?", (project_id,))
+    assert effective_date(db, project_id) == (2024, 1)
+
+    # 完了日を消すと登録日に戻る
+    db.update('projects', {'completion_date': None}, "id = ?", (project_id,))
+    assert effective_date(db, project_id) == (2022, 2)
+
+
+def test_other_updates_keep_effective_date(db, master_ids):
+    project_id = add_project(db, master_ids, completion_date='2023-11-30')
+
+    db.update('projects', {'title': "名称変更"}, "id = ?", (project_id,))
+    assert effective_date(db, project_id) == (2023, 11)
+
+
+def test_price_statistics_filter_on_effective_year(db, master_ids):
+    add_project(db, master_ids, price=1000, completion_date='2023-12-31', created_at='2023-01-10 09:00:00')
+    add_project(db, master_ids, price=3000, created_at='2023-06-01 09:00:00')
+    # 登録は2023年でも完了が2024年の案件は2024年に集計される
+    add_project(db, master_ids, price=5000, completion_date='2024-01-01', created_at='2023-12-20 09:00:00')
+
+    stats = db.get_price_statistics(2023)
+    assert stats['total_count'] == 2
+    assert stats['total_price'] == 4000
+    assert db.get_price_statistics(2024)['total_price'] == 5000
@@ -0,0 +1,68 @@
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from components import FilterController
+
+
+@pytest.fixture
+def controller():
+    controller = FilterController(lambda: None)
+    controller.remember("key", "ab")
+    return controller
+
+
+def test_appended_ascii_text_narrows(controller):
+    assert controller.narrows("key", "abc")
+    assert controller.narrows("key", "ABC")
+
+
+def test_other_conditions_or_wildcards_do_not_narrow(controller):
+    assert not controller.narrows("other", "abc")
+    assert not controller.narrows("key", "ab%")
+    assert not controller.narrows("key", "xy")
+
+
+def test_caseless_japanese_text_narrows():
+    controller = FilterController(lambda: None)
+    controller.remember("key", "テスト")
+    assert controller.narrows("key", "テスト案件")
+
+
+def test_cased_non_ascii_text_requeries():
+    controller = FilterController(lambda: None)
+    controller.remember("key", "ab")
+    assert not controller.narrows("key", "abＣ")
+    assert not controller.narrows("key", "abß")
+
+
+SEARCH_TITLES = ["ＡＢＣ工事", "ａｂｃ工事", "ABC工事", "abcd工事", "テスト案件", "てすと案件"]
+
+
+def add_projects(db, master_ids):
+    client_id, service_id = master_ids
+    for title in SEARCH_TITLES:
+        db.insert('projects', {'client_id': client_id, 'service_id': service_id,
+                               'title': title, 'price': 1000})
+
+
+def search_titles(db, search_text):
+    condition, values = db.search_condition('projects', search_text, alias='p')
+    return sorted(project['title'] for project in db.get_projects(condition, values))
+
+
+@pytest.mark.parametrize("search_text", ["ab", "abc", "ABC", "bc工", "テスト案", "案件"])
+def test_narrowing_matches_database_search(db, master_ids, search_text):
+    add_projects(db, master_ids)
+
+    assert FilterController.foldable(search_text)
+    actual = sorted(title for title in SEARCH_TITLES if FilterController.matches(search_text, title))
+    assert actual == search_titles(db, search_text)
+
+
+def test_full_width_search_is_case_insensitive_in_database(db, master_ids):
+    add_projects(db, master_ids)
+
+    # 全文検索は全角英字の大文字小文字を区別しないため、メモリ上では絞り込まない
+    assert search_titles(db, "ａｂｃ") == ["ＡＢＣ工事", "ａｂｃ工事"]
+    assert not FilterController.foldable("ａｂｃ")
@@ -0,0 +1,74 @@
+import threading
+
+from models import Database
+
+
+def names(rows):
+    return [row['name'] for row in rows]
+
+
+def test_master_data_is_sorted_and_copied(db):
+    db.insert('clients', {'name': "B社"})
+    db.insert('clients', {'name': "A社"})
+
+    clients = db.get_clients()
+    assert names(clients) == ["A社", "B社"]
+
+    clients[0]['name'] = "変更"
+    assert names(db.get_clients()) == ["A社", "B社"]
+
+
+def test_master_data_invalidated_by_write_from_other_instance(db_path, db):
+    db.insert('workers', {'name': "作業員1"})
+    assert names(db.get_workers()) == ["作業員1"]
+
+    other = Database(db_path, init_schema=False)
+    try:
+        other.insert('workers', {'name': "作業員2"})
+    finally:
+        other.close()
+
+    assert names(db.get_workers()) == ["作業員1", "作業員2"]
+
+
+def test_master_data_read_during_open_transaction_is_not_kept(db_path, db):
+    db.insert('services', {'name': "サービス1"})
+    reader = Database(db_path, init_schema=False, check_same_thread=False)
+    assert names(reader.get_services()) == ["サービス1"]
+
+    writing = threading.Event()
+    read_done = threading.Event()
+    results = []
+
+    def read():
+        writing.wait(5)
+        results.append(names(reader.get_services()))
+        read_done.set()
+
+    thread = threading.Thread(target=read)
+    thread.start()
+    with db.transaction():
+        db.insert('services', {'name': "サービス2"})
+        writing.set()
+        assert read_done.wait(5)
+    thread.join()
+
+    assert results == [["サービス1"]]
+    try:
+        assert names(reader.get_services()) == ["サービス1", "サービス2"]
+    finally:
+        reader.close()
+
+
+def test_master_data_not_cached_from_rolled_back_transaction(db):
+    db.insert('clients', {'name': "A社"})
+
+    try:
+        with db.transaction():
+            db.insert('clients', {'name': "B社"})
+            assert names(db.get_clients()) == ["A社", "B社"]
+            raise RuntimeError("取り消し")
+    except RuntimeError:
+        pass
+
+    assert names(db.get_clients()) == ["A社"]
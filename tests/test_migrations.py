@@ -0,0 +1,161 @@
+import sqlite3
+
+import models
+from models import Database, SCHEMA_VERSION
+
+
+def create_legacy_database(path):
+    """スキーマ移行を導入する前（user_version = 0）の形式でデータベースを作成する"""
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+    CREATE TABLE clients (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE services (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE projects (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        client_id INTEGER NOT NULL,
+        service_id INTEGER NOT NULL,
+        title TEXT NOT NULL,
+        description TEXT,
+        site_address TEXT,
+        price REAL NOT NULL,
+        labor_cost REAL DEFAULT 0,
+        status TEXT DEFAULT '作業中',
+        start_date DATE,
+        end_date DATE,
+        completion_date DATE,
+        has_trouble INTEGER DEFAULT 0,
+        trouble_worker_id INTEGER,
+        has_photos INTEGER DEFAULT 0,
+        photo_count INTEGER DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE work_orders (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        project_id INTEGER,
+        order_number TEXT,
+        site_name TEXT,
+        site_address TEXT,
+        work_content TEXT,
+        work_details TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    INSERT INTO clients (id, name) VALUES (1, '既存取引先');
+    INSERT INTO services (id, name) VALUES (1, '既存サービス');
+    INSERT INTO projects (client_id, service_id, title, price, has_trouble, completion_date, created_at)
+    VALUES (1, 1, '既存の完了案件', 1000, 1, '2023-04-10', '2023-03-01 09:00:00');
+    INSERT INTO projects (client_id, service_id, title, price, created_at)
+    VALUES (1, 1, '既存の作業中案件', 500, '2023-05-20 09:00:00');
+    INSERT INTO work_orders (order_number, site_name) VALUES ('WO-0001', '既存現場');
+    ''')
+    conn.commit()
+    conn.close()
+
+
+def index_names(db):
+    rows = db.execute_query("SELECT name FROM sqlite_master WHERE type = 'index'")
+    return {row['name'] for row in rows}
+
+
+def test_new_database_is_created_at_latest_version(db):
+    assert db.get_schema_version() == SCHEMA_VERSION
+    assert {
+        'idx_projects_client_id',
+        'idx_projects_service_id',
+        'idx_projects_status_completion',
+        'idx_project_workers_worker_id',
+        'idx_project_photos_project_created',
+        'idx_work_orders_order_number',
+        'idx_projects_effective',
+        'idx_projects_created_at',
+        'idx_work_orders_created_at',
+    } <= index_names(db)
+
+
+def test_current_schema_skips_table_creation(db_path, db, monkeypatch):
+    def fail():
+        raise AssertionError("最新のスキーマでテーブル作成が実行された")
+
+    reopened = Database(db_path, init_schema=False)
+    try:
+        monkeypatch.setattr(reopened, 'create_tables', fail)
+        monkeypatch.setattr(reopened, 'apply_migrations', fail)
+        reopened.ensure_schema()
+    finally:
+        reopened.close()
+
+
+def test_legacy_database_is_migrated(db_path):
+    create_legacy_database(db_path)
+
+    db = Database(db_path)
+    try:
+        assert db.get_schema_version() == SCHEMA_VERSION
+        assert {'effective_year', 'effective_month'} <= set(db.get_table_columns('projects'))
+        assert 'memo' in db.get_table_columns('work_orders')
+        assert 'idx_projects_effective' in index_names(db)
+
+        # 既存の案件に集計基準の年月が設定される（完了日、なければ登録日）
+        rows = db.execute_query(
+            "SELECT title, effective_year, effective_month FROM projects ORDER BY id"
+        )
+        assert [(row['effective_year'], row['effective_month']) for row in rows] == [(2023, 4), (2023, 5)]
+
+        # 既存の案件から売上集計が作成される
+        rollup = db.execute_query(
+            "SELECT year, month, total_price, project_count, trouble_count "
+            "FROM monthly_sales_rollup ORDER BY year, month"
+        )
+        assert [tuple(row.values()) for row in rollup] == [(2023, 4, 1000, 1, 1), (2023, 5, 500, 1, 0)]
+
+        # 既存のデータが検索インデックスに登録される
+        assert [row['title'] for row in db.search('projects', "完了案件")] == ["既存の完了案件"]
+        assert [row['order_number'] for row in db.search('work_orders', "既存現場")] == ["WO-0001"]
+    finally:
+        db.close()
+
+
+def test_migrations_resume_from_stored_version(db_path):
+    create_legacy_database(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA user_version = 3")
+    conn.close()
+
+    db = Database(db_path)
+    try:
+        assert db.get_schema_version() == SCHEMA_VERSION
+        # v2・v3 は適用済みとして扱われるため、集計基準の列は追加されない
+        assert 'effective_year' not in db.get_table_columns('projects')
+        assert 'idx_projects_created_at' in index_names(db)
+    finally:
+        db.close()
+
+
+def test_missing_search_index_is_created_on_startup(db_path, db, master_ids):
+    client_id, service_id = master_ids
+    db.insert('projects', {'client_id': client_id, 'service_id': service_id, 'title': "配管工事", 'price': 0})
+
+    # FTS5 が使えない SQLite で v5 に移行した状態にする
+    for table, (fts_table, _) in models.SEARCH_INDEXES.items():
+        for action in ("insert", "update", "delete"):
+            db.cursor.execute(f"DROP TRIGGER trg_{table}_fts_{action}")
+        db.cursor.execute(f"DROP TABLE {fts_table}")
+    db.conn.commit()
+
+    reopened = Database(db_path)
+    try:
+        assert reopened.get_schema_version() == SCHEMA_VERSION
+        assert all(reopened.has_search_index(table) for table in models.SEARCH_INDEXES)
+        condition, _ = reopened.search_condition('projects', "配管工事")
+        assert "MATCH" in condition
+        assert [row['title'] for row in reopened.search('projects', "配管工事")] == ["配管工事"]
+    finally:
+        reopened.close()
@@ -0,0 +1,85 @@
+import gc
+
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage
+
+from thumbnail_cache import PhotoImageLoader
+
+
+@pytest.fixture
+def image_paths(tmp_path):
+    paths = []
+    for index in range(10):
+        image = QImage(800, 600, QImage.Format.Format_RGB32)
+        image.fill(Qt.GlobalColor.green)
+        path = str(tmp_path / f"photo{index:02d}.jpg")
+        assert image.save(path, "JPEG")
+        paths.append(path)
+    return paths
+
+
+@pytest.fixture
+def loader(qapp):
+    image_loader = PhotoImageLoader(max_images=4, max_threads=2)
+    image_loader.ready = []
+    image_loader.imageReady.connect(lambda path, pixmap: image_loader.ready.append(path))
+    yield image_loader
+    image_loader.shutdown()
+
+
+def test_request_loads_image_at_display_size(loader, image_paths, wait_until):
+    loader.request(image_paths[0], 400, 400, prefetch_paths=image_paths[1:3])
+    wait_until(lambda: not loader._active)
+
+    assert set(loader.ready) == set(image_paths[:3])
+    pixmap = loader.get(image_paths[0], 400, 400)
+    assert (pixmap.width(), pixmap.height()) == (400, 300)
+    # 別の表示サイズは別に読み込む
+    assert loader.get(image_paths[0], 200, 200) is None
+
+
+def test_cache_keeps_most_recent_images(loader, image_paths, wait_until):
+    for path in image_paths[:6]:
+        loader.request(path, 100, 100)
+        wait_until(lambda: not loader._active)
+
+    assert loader.get(image_paths[0], 100, 100) is None
+    assert loader.get(image_paths[5], 100, 100) is not None
+    assert len(loader._images) == 4
+
+
+def test_loaded_image_is_not_requested_again(loader, image_paths, wait_until):
+    loader.request(image_paths[0], 100, 100)
+    wait_until(lambda: not loader._active)
+
+    loader.request(image_paths[0], 100, 100)
+    assert not loader._tasks
+    assert loader.ready == [image_paths[0]]
+
+
+def test_remove_discards_all_sizes(loader, image_paths, wait_until):
+    loader.request(image_paths[0], 100, 100)
+    loader.request(image_paths[0], 200, 200)
+    wait_until(lambda: not loader._active)
+
+    loader.remove(image_paths[0])
+    assert loader.get(image_paths[0], 100, 100) is None
+    assert loader.get(image_paths[0], 200, 200) is None
+
+
+def test_switching_photos_keeps_started_tasks_until_finished(loader, image_paths, wait_until):
+    for _ in range(10):
+        for index, path in enumerate(image_paths):
+            loader.request(path, 300, 300, prefetch_paths=image_paths[index + 1:index + 3])
+            # 待ち行列から取り除かれなかったタスクは通知を受け取るまで参照を保持する
+            assert set(loader._tasks.values()) <= loader._active
+            gc.collect()
+        loader.remove(image_paths[-1])
+    wait_until(lambda: not loader._active)
+
+    assert not loader._tasks
+    assert loader.get(image_paths[-1], 300, 300) is not None
@@ -0,0 +1,97 @@
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+from PyQt6.QtGui import QImage
+
+import dialogs.photo_viewer_dialog as photo_viewer_dialog
+from dialogs.photo_viewer_dialog import PhotoThumbnailModel
+
+
+class FakeLoader(QObject):
+    """読み込みの依頼を記録するだけのサムネイル読み込み"""
+
+    thumbnailReady = pyqtSignal(str, QImage)
+
+    def __init__(self):
+        super().__init__()
+        self.requested = []
+
+    def request(self, image_paths, priority=0):
+        self.requested.extend(image_paths)
+
+    def cancel(self):
+        self.requested.clear()
+
+
+def image(width=40, height=30):
+    result = QImage(width, height, QImage.Format.Format_RGB32)
+    result.fill(Qt.GlobalColor.blue)
+    return result
+
+
+@pytest.fixture
+def model(qapp):
+    thumbnail_model = PhotoThumbnailModel(FakeLoader())
+    thumbnail_model.set_photos([{'id': index, 'photo_path': f"photo{index}.jpg"} for index in range(1000)])
+    return thumbnail_model
+
+
+def decoration(model, row):
+    return model.data(model.index(row), Qt.ItemDataRole.DecorationRole)
+
+
+def test_only_displayed_rows_are_requested(model):
+    assert model.rowCount() == 1000
+    assert model.loader.requested == []
+
+    decoration(model, 0)
+    decoration(model, 5)
+    assert model.loader.requested == ["photo0.jpg", "photo5.jpg"]
+
+
+def test_ready_thumbnail_updates_its_row(model):
+    changed = []
+    model.dataChanged.connect(lambda first, last, roles: changed.append(first.row()))
+    placeholder = decoration(model, 3)
+
+    model.loader.thumbnailReady.emit("photo3.jpg", image())
+    pixmap = decoration(model, 3)
+    assert changed == [3]
+    assert pixmap is not placeholder
+    assert pixmap.width() <= model.thumbnail_size().width()
+
+    # 読み込み済みのサムネイルは再度依頼しない
+    model.loader.requested.clear()
+    decoration(model, 3)
+    assert model.loader.requested == []
+
+
+def test_thumbnails_in_memory_are_limited(model, monkeypatch):
+    monkeypatch.setattr(photo_viewer_dialog, 'THUMBNAIL_MODEL_CACHE_SIZE', 2)
+    for row in range(3):
+        model.loader.thumbnailReady.emit(f"photo{row}.jpg", image())
+
+    # 最も古く使われたものから破棄し、次に表示される時に読み込み直す
+    assert list(model._pixmaps) == ["photo1.jpg", "photo2.jpg"]
+    decoration(model, 0)
+    assert model.loader.requested == ["photo0.jpg"]
+
+
+def test_unreadable_thumbnail_uses_placeholder(model):
+    model.loader.thumbnailReady.emit("photo1.jpg", QImage())
+    assert decoration(model, 1) is model._broken
+
+
+def test_remove_rows_keeps_other_thumbnails(model):
+    model.loader.thumbnailReady.emit("photo4.jpg", image())
+    model.remove_rows([1, 2, 7])
+
+    assert model.rowCount() == 997
+    assert model.data(model.index(1), PhotoThumbnailModel.PhotoRole)['id'] == 3
+    # 行番号がずれても読み込み済みのサムネイルはそのまま使う
+    model.loader.requested.clear()
+    assert decoration(model, 2) is model._pixmaps["photo4.jpg"]
+    assert model.loader.requested == []
+    assert "photo1.jpg" not in model._rows
@@ -0,0 +1,82 @@
+import pytest
+
+import models
+
+
+@pytest.fixture
+def project_ids(db, master_ids):
+    client_id, service_id = master_ids
+    return [
+        db.insert('projects', {'client_id': client_id, 'service_id': service_id, 'title': f"案件{index}", 'price': 0})
+        for index in range(2)
+    ]
+
+
+def photo_info(db, project_id):
+    row = db.select('projects', 'photo_count, has_photos', 'id = ?', (project_id,))[0]
+    return row['photo_count'], row['has_photos']
+
+
+def photo_ids(db, project_id):
+    return [row['id'] for row in db.get_project_photos(project_id)]
+
+
+def test_add_project_photos_updates_counters(db, project_ids):
+    assert db.add_project_photos(project_ids[0], ["a.jpg", "b.jpg", "c.jpg"]) == 3
+    db.add_project_photo(project_ids[0], "d.jpg")
+
+    assert photo_info(db, project_ids[0]) == (4, 1)
+    assert photo_info(db, project_ids[1]) == (0, 0)
+    assert db.add_project_photos(project_ids[0], []) == 0
+
+
+def test_delete_project_photos_across_projects(db, project_ids):
+    db.add_project_photos(project_ids[0], ["a.jpg", "b.jpg", "c.jpg"])
+    db.add_project_photos(project_ids[1], ["d.jpg", "e.jpg"])
+    first, second = photo_ids(db, project_ids[0]), photo_ids(db, project_ids[1])
+
+    assert db.delete_project_photos(first[:2] + second) == 4
+
+    assert photo_ids(db, project_ids[0]) == first[2:]
+    assert photo_info(db, project_ids[0]) == (1, 1)
+    assert photo_ids(db, project_ids[1]) == []
+    assert photo_info(db, project_ids[1]) == (0, 0)
+
+
+def test_delete_project_photos_ignores_duplicates_and_missing_ids(db, project_ids):
+    db.add_project_photos(project_ids[0], ["a.jpg", "b.jpg"])
+    ids = photo_ids(db, project_ids[0])
+
+    assert db.delete_project_photos([ids[0], ids[0], -1]) == 1
+    assert photo_info(db, project_ids[0]) == (1, 1)
+
+    assert db.delete_project_photos([-1]) == 0
+    assert db.delete_project_photos([]) == 0
+    assert photo_info(db, project_ids[0]) == (1, 1)
+
+
+def test_delete_project_photo(db, project_ids):
+    db.add_project_photo(project_ids[0], "a.jpg")
+
+    db.delete_project_photo(photo_ids(db, project_ids[0])[0])
+    assert photo_info(db, project_ids[0]) == (0, 0)
+
+
+def test_delete_project_photos_in_chunks(db, project_ids, monkeypatch):
+    monkeypatch.setattr(models, 'SQL_IN_CHUNK_SIZE', 2)
+    db.add_project_photos(project_ids[0], [f"{index}.jpg" for index in range(5)])
+    db.add_project_photos(project_ids[1], [f"{index}.jpg" for index in range(3)])
+
+    ids = photo_ids(db, project_ids[0]) + photo_ids(db, project_ids[1])[:2]
+    assert db.delete_project_photos(ids) == 7
+
+    assert photo_info(db, project_ids[0]) == (0, 0)
+    assert photo_info(db, project_ids[1]) == (1, 1)
+
+
+def test_delete_project_photos_invalidates_project_queries(db, project_ids):
+    db.add_project_photos(project_ids[0], ["a.jpg"])
+    generation = db.table_generation('projects')
+
+    db.delete_project_photos(photo_ids(db, project_ids[0]))
+    assert db.table_generation('projects') > generation
@@ -0,0 +1,35 @@
+import pytest
+
+
+@pytest.fixture
+def projects(db, master_ids):
+    """担当作業員が2人・0人の案件"""
+    client_id, service_id = master_ids
+    worker_ids = [db.insert('workers', {'name': name}) for name in ("佐藤", "鈴木")]
+    staffed = db.insert('projects', {'client_id': client_id, 'service_id': service_id, 'title': "担当あり", 'price': 0})
+    unstaffed = db.insert('projects', {'client_id': client_id, 'service_id': service_id, 'title': "担当なし", 'price': 0})
+    db.set_project_workers(staffed, worker_ids)
+    return staffed, unstaffed
+
+
+def test_worker_names_are_aggregated(db, projects):
+    staffed, unstaffed = projects
+    rows = {row['id']: row for row in db.get_projects(include_workers=True)}
+
+    assert sorted(rows[staffed]['worker_names'].split(", ")) == ["佐藤", "鈴木"]
+    assert rows[unstaffed]['worker_names'] is None
+    assert 'worker_names' not in db.get_projects()[0]
+
+
+def test_worker_names_take_one_query(db, projects, monkeypatch):
+    queries = []
+    execute_query = db.execute_query
+    monkeypatch.setattr(db, 'execute_query',
+                        lambda query, values=(): queries.append(query) or execute_query(query, values))
+
+    rows = db.get_projects(include_workers=True)
+    page, _ = db.get_projects_page(include_workers=True)
+
+    # 案件ごとに担当作業員を問い合わせない
+    assert len(queries) == 2
+    assert {row['id']: row['worker_names'] for row in page} == {row['id']: row['worker_names'] for row in rows}
@@ -0,0 +1,83 @@
+import pytest
+
+
+@pytest.fixture
+def project_ids(db, master_ids):
+    """並び替え列に重複と NULL を含む案件を作成する"""
+    client_id, service_id = master_ids
+    completion_dates = [None, '2024-01-10', None, '2024-01-10', '2023-12-01', None, '2024-02-01']
+    ids = []
+    with db.transaction():
+        for index in range(21):
+            ids.append(db.insert('projects', {
+                'client_id': client_id,
+                'service_id': service_id,
+                'title': f"案件{index:02d}",
+                'price': (index % 4) * 1000,
+                'completion_date': completion_dates[index % len(completion_dates)],
+                'created_at': f"2024-03-{index % 5 + 1:02d} 09:00:00",
+            }))
+    return ids
+
+
+def all_pages(db, page_size, **kwargs):
+    pages = list(db.iter_projects(page_size=page_size, **kwargs))
+    assert all(0 < len(page) <= page_size for page in pages)
+    return [row['id'] for page in pages for row in page]
+
+
+@pytest.mark.parametrize("sort_column", ["completion_date", "created_at", "price", "title"])
+@pytest.mark.parametrize("sort_order", ["ASC", "DESC"])
+@pytest.mark.parametrize("page_size", [1, 4, 50])
+def test_pages_return_every_row_once_in_order(db, project_ids, sort_column, sort_order, page_size):
+    paged = all_pages(db, page_size, sort_column=sort_column, sort_order=sort_order)
+
+    assert sorted(paged) == sorted(project_ids)
+
+    # 並び順は (並び替え列, ID) の順で、NULL は昇順では先頭、降順では末尾になる
+    rows = {row['id']: row for row in db.get_projects()}
+    keys = []
+    for project_id in paged:
+        value = rows[project_id][sort_column]
+        keys.append((value is not None, '' if value is None else value, project_id))
+    assert keys == sorted(keys, reverse=(sort_order == "DESC"))
+
+
+def test_pages_apply_condition(db, project_ids):
+    paged = all_pages(db, 2, condition="p.completion_date IS NULL", sort_column="completion_date")
+
+    expected = [row['id'] for row in db.get_projects("p.completion_date IS NULL")]
+    assert sorted(paged) == sorted(expected)
+    assert len(paged) == 9
+
+
+def test_last_page_has_no_cursor(db, project_ids):
+    rows, cursor = db.get_projects_page(limit=len(project_ids))
+    assert len(rows) == len(project_ids)
+    assert cursor is None
+
+    rows, cursor = db.get_projects_page(sort_column="completion_date", sort_order="ASC", limit=3)
+    # NULL の行のカーソルは NULL のまま次の区間に引き継ぐ
+    assert cursor == (None, rows[-1]['id'])
+
+
+def test_invalid_sort_falls_back_to_created_at(db, project_ids):
+    assert all_pages(db, 5, sort_column="id; DROP TABLE projects", sort_order="sideways") == \
+        all_pages(db, 5, sort_column="created_at", sort_order="DESC")
+
+
+@pytest.mark.parametrize("sort_column", ["created_at", "price", "title"])
+@pytest.mark.parametrize("sort_order", ["ASC", "DESC"])
+def test_page_query_uses_index_for_order(db, project_ids, monkeypatch, sort_column, sort_order):
+    queries = []
+    execute_query = db.execute_query
+    monkeypatch.setattr(db, 'execute_query',
+                        lambda query, params=(): queries.append((query, params)) or execute_query(query, params))
+
+    rows, cursor = db.get_projects_page(sort_column=sort_column, sort_order=sort_order, limit=3)
+    db.get_projects_page(sort_column=sort_column, sort_order=sort_order, after=cursor, limit=3)
+
+    # 並び替え列のインデックスを順に読むため、全件を一時的に並べ替えない
+    for query, params in queries:
+        plan = " ".join(row[-1] for row in db.conn.execute("EXPLAIN QUERY PLAN " + query, params))
+        assert "TEMP B-TREE" not in plan
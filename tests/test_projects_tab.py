@@ -0,0 +1,48 @@
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from tabs.projects_tab import ProjectsTab
+
+
+@pytest.fixture
+def completion_dates(db, master_ids):
+    """完了日（時刻付きを含む）ごとの案件ID"""
+    client_id, service_id = master_ids
+    dates = ['2025-01-01', '2025-06-30 18:00', '2025-07-01', '2025-12-31 10:00', '2026-01-01', None]
+    return {date: db.insert('projects', {'client_id': client_id, 'service_id': service_id,
+                                         'title': f"案件{index}", 'price': 0, 'completion_date': date})
+            for index, date in enumerate(dates)}
+
+
+@pytest.fixture
+def tab(db, query_executor, wait_until):
+    projects_tab = ProjectsTab(db, query_executor)
+    wait_until(lambda: projects_tab.table.table_model.is_fully_loaded())
+    yield projects_tab
+    projects_tab.deleteLater()
+
+
+def shown_ids(tab):
+    model = tab.table.table_model
+    return {model.rows[row]['id'] for row in range(model.rowCount())}
+
+
+def select(combo, value):
+    combo.setCurrentIndex(combo.findData(value))
+
+
+def test_year_filter_includes_dates_with_time(tab, completion_dates, wait_until):
+    select(tab.year_combo, 2025)
+    expected = {completion_dates[date] for date in
+                ('2025-01-01', '2025-06-30 18:00', '2025-07-01', '2025-12-31 10:00')}
+    wait_until(lambda: shown_ids(tab) == expected)
+
+
+def test_year_and_month_filter_includes_last_day_with_time(tab, completion_dates, wait_until):
+    select(tab.year_combo, 2025)
+    select(tab.month_combo, 6)
+    wait_until(lambda: shown_ids(tab) == {completion_dates['2025-06-30 18:00']})
+
+    select(tab.month_combo, 12)
+    wait_until(lambda: shown_ids(tab) == {completion_dates['2025-12-31 10:00']})
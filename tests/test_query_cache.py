@@ -0,0 +1,88 @@
+import threading
+
+from models import Database
+
+
+def test_cached_query_returns_copies(db):
+    db.set_sales_targets(2024, {0: 1200.0, 1: 100.0})
+
+    targets = db.get_all_sales_targets(2024)
+    targets[1] = -1
+    assert db.get_all_sales_targets(2024)[1] == 100.0
+
+
+def test_write_invalidates_cached_query(db):
+    db.set_sales_target(2024, 1, 100.0)
+    assert db.get_sales_target(2024, 1) == 100.0
+
+    db.set_sales_target(2024, 1, 200.0)
+    assert db.get_sales_target(2024, 1) == 200.0
+
+
+def test_generation_advances_only_after_commit(db):
+    before = db.table_generation('sales_targets')
+    with db.transaction():
+        db.set_sales_target(2024, 1, 100.0)
+        assert db.table_generation('sales_targets') == before
+    assert db.table_generation('sales_targets') > before
+
+
+def test_read_during_open_transaction_is_not_cached(db_path, db):
+    db.set_sales_target(2024, 1, 100.0)
+
+    writing = threading.Event()
+    read_done = threading.Event()
+    results = []
+
+    def read():
+        reader = Database(db_path, init_schema=False)
+        try:
+            writing.wait(5)
+            # 書き込み中のトランザクションの変更前の値が読まれる
+            results.append(reader.get_sales_target(2024, 1))
+        finally:
+            reader.close()
+            read_done.set()
+
+    thread = threading.Thread(target=read)
+    thread.start()
+    with db.transaction():
+        db.set_sales_target(2024, 1, 200.0)
+        writing.set()
+        assert read_done.wait(5)
+    thread.join()
+
+    assert results == [100.0]
+
+    # コミット後は変更前の結果がキャッシュから返されない
+    reader = Database(db_path, init_schema=False)
+    try:
+        assert reader.get_sales_target(2024, 1) == 200.0
+    finally:
+        reader.close()
+
+
+def test_uncommitted_read_on_same_connection_is_not_cached(db):
+    db.set_sales_target(2024, 1, 100.0)
+
+    try:
+        with db.transaction():
+            db.set_sales_target(2024, 1, 200.0)
+            assert db.get_sales_target(2024, 1) == 200.0
+            raise RuntimeError("取り消し")
+    except RuntimeError:
+        pass
+
+    assert db.get_sales_target(2024, 1) == 100.0
+
+
+def test_rollup_query_invalidated_by_project_write(db, master_ids):
+    client_id, service_id = master_ids
+    assert db.get_total_stats_by_service(2024) == []
+
+    db.insert('projects', {
+        'client_id': client_id, 'service_id': service_id, 'title': "案件",
+        'price': 1000, 'completion_date': "2024-04-01",
+    })
+    stats = db.get_total_stats_by_service(2024)
+    assert [row['total_amount'] for row in stats] == [1000]
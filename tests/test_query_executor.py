@@ -0,0 +1,104 @@
+import sqlite3
+import threading
+
+import pytest
+
+pytest.importorskip("PyQt6")
+
+
+def test_result_is_delivered_on_gui_thread(db, query_executor, wait_until):
+    db.insert('clients', {'name': "取引先"})
+    results = []
+
+    def query(worker_db):
+        return worker_db, threading.get_ident(), worker_db.get_clients()
+
+    query_executor.submit("clients", query, callback=lambda result: results.append((result, threading.get_ident())))
+    wait_until(lambda: results)
+
+    (worker_db, worker_thread, clients), callback_thread = results[0]
+    # 問い合わせはワーカースレッドの専用の接続で実行し、結果は GUI スレッドで受け取る
+    assert worker_thread != threading.get_ident()
+    assert callback_thread == threading.get_ident()
+    assert worker_db is not db
+    assert [client['name'] for client in clients] == ["取引先"]
+
+
+def test_method_name_is_called_on_worker_database(db, query_executor, wait_until):
+    db.insert('workers', {'name': "作業員"})
+    results = []
+
+    query_executor.submit("workers", "get_workers", callback=results.append)
+    wait_until(lambda: results)
+    assert [worker['name'] for worker in results[0]] == ["作業員"]
+
+
+def test_newer_query_supersedes_older_one(query_executor, wait_until):
+    started = threading.Event()
+    release = threading.Event()
+    results = []
+
+    def slow(worker_db):
+        started.set()
+        release.wait(5)
+        return "古い"
+
+    query_executor.submit("page", slow, callback=results.append)
+    assert started.wait(5)
+    query_executor.submit("page", lambda worker_db: "新しい", callback=results.append)
+    release.set()
+
+    wait_until(lambda: results)
+    query_executor.pool.waitForDone()
+    wait_until(lambda: not query_executor._pending)
+    # 置き換えられた問い合わせの結果は捨てる
+    assert results == ["新しい"]
+
+
+def test_running_sql_is_interrupted_when_superseded(query_executor, wait_until):
+    running = threading.Event()
+    errors = []
+    results = []
+
+    def endless(worker_db):
+        worker_db.conn.set_progress_handler(lambda: running.set() or 0, 1000)
+        try:
+            worker_db.cursor.execute(
+                "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) SELECT COUNT(*) FROM n"
+            )
+        finally:
+            worker_db.conn.set_progress_handler(None, 0)
+
+    query_executor.submit("count", endless, callback=results.append, error_callback=errors.append)
+    assert running.wait(5)
+    query_executor.submit("count", lambda worker_db: "新しい", callback=results.append)
+
+    # 実行中の問い合わせは中断され、終わらない問い合わせでもスレッドが解放される
+    assert query_executor.pool.waitForDone(5000)
+    wait_until(lambda: results)
+    assert results == ["新しい"]
+    assert errors == []
+
+
+def test_errors_go_to_error_callback(query_executor, wait_until):
+    errors = []
+
+    def broken(worker_db):
+        worker_db.cursor.execute("SELECT * FROM no_such_table")
+
+    query_executor.submit("broken", broken, callback=pytest.fail, error_callback=errors.append)
+    wait_until(lambda: errors)
+    assert isinstance(errors[0], sqlite3.OperationalError)
+
+
+def test_cancel_drops_result(query_executor, wait_until):
+    release = threading.Event()
+    results = []
+
+    query_executor.submit("page", lambda worker_db: release.wait(5), callback=results.append)
+    query_executor.cancel("page")
+    release.set()
+
+    query_executor.pool.waitForDone()
+    wait_until(lambda: not query_executor._pending)
+    assert results == []
@@ -0,0 +1,80 @@
+ROLLUP_QUERY = """
+SELECT year, month, client_id, service_id, total_price, project_count, trouble_count
+FROM monthly_sales_rollup
+ORDER BY year, month, client_id, service_id
+"""
+
+
+def rollup_rows(db):
+    return [tuple(row.values()) for row in db.execute_query(ROLLUP_QUERY)]
+
+
+def assert_matches_rebuild(db):
+    """トリガーで更新した集計が案件データからの再集計と一致することを確認する"""
+    incremental = rollup_rows(db)
+    db.rebuild_sales_rollup()
+    assert rollup_rows(db) == incremental
+
+
+def add_project(db, client_id, service_id, **values):
+    data = {'client_id': client_id, 'service_id': service_id, 'title': "案件", 'price': 1000}
+    data.update(values)
+    return db.insert('projects', data)
+
+
+def test_insert_adds_to_rollup(db, master_ids):
+    client_id, service_id = master_ids
+    add_project(db, client_id, service_id, price=1000, completion_date='2024-03-10')
+    add_project(db, client_id, service_id, price=500, has_trouble=1, completion_date='2024-03-20')
+
+    assert rollup_rows(db) == [(2024, 3, client_id, service_id, 1500, 2, 1)]
+    assert_matches_rebuild(db)
+
+
+def test_update_moves_project_between_rows(db, master_ids):
+    client_id, service_id = master_ids
+    other_client_id = db.insert('clients', {'name': "別の取引先"})
+    project_id = add_project(db, client_id, service_id, price=1000, completion_date='2024-03-10')
+    add_project(db, client_id, service_id, price=200, completion_date='2024-03-15')
+
+    db.update('projects', {'price': 1200, 'has_trouble': 1}, "id = ?", (project_id,))
+    assert rollup_rows(db) == [(2024, 3, client_id, service_id, 1400, 2, 1)]
+
+    db.update('projects', {'completion_date': '2024-04-01'}, "id = ?", (project_id,))
+    assert rollup_rows(db) == [
+        (2024, 3, client_id, service_id, 200, 1, 0),
+        (2024, 4, client_id, service_id, 1200, 1, 1),
+    ]
+
+    db.update('projects', {'client_id': other_client_id}, "id = ?", (project_id,))
+    assert rollup_rows(db) == [
+        (2024, 3, client_id, service_id, 200, 1, 0),
+        (2024, 4, other_client_id, service_id, 1200, 1, 1),
+    ]
+    assert_matches_rebuild(db)
+
+
+def test_delete_removes_empty_rows(db, master_ids):
+    client_id, service_id = master_ids
+    first_id = add_project(db, client_id, service_id, price=1000, completion_date='2024-03-10')
+    second_id = add_project(db, client_id, service_id, price=300, completion_date='2024-03-11')
+
+    db.delete('projects', "id = ?", (first_id,))
+    assert rollup_rows(db) == [(2024, 3, client_id, service_id, 300, 1, 0)]
+
+    db.delete('projects', "id = ?", (second_id,))
+    assert rollup_rows(db) == []
+
+
+def test_bulk_writes_keep_rollup_in_sync(db, master_ids):
+    client_id, service_id = master_ids
+    with db.transaction():
+        for month in range(1, 13):
+            add_project(db, client_id, service_id, price=month * 100, completion_date=f'2023-{month:02d}-01')
+        db.update('projects', {'completion_date': '2024-01-15'}, "price >= ?", (1000,))
+        db.delete('projects', "price < ?", (300,))
+
+    assert_matches_rebuild(db)
+    stats = {row['client_id']: row for row in db.get_total_stats_by_client(2024)}
+    assert stats[client_id]['total_amount'] == 1000 + 1100 + 1200
+    assert stats[client_id]['project_count'] == 3
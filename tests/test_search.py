@@ -0,0 +1,82 @@
+import pytest
+
+CLIENT_NAMES = ["東京水道", "水道サービス東京", "大阪設備", "Tokyo Water", "\"引用\" OR 記号*"]
+
+
+@pytest.fixture
+def client_ids(db):
+    return {name: db.insert('clients', {'name': name}) for name in CLIENT_NAMES}
+
+
+def searched_names(db, text, **kwargs):
+    return [row['name'] for row in db.search('clients', text, **kwargs)]
+
+
+def condition_names(db, text, columns=None):
+    condition, values = db.search_condition('clients', text, alias="c", columns=columns)
+    rows = db.execute_query(f"SELECT c.name FROM clients c WHERE {condition} ORDER BY c.id", values)
+    return [row['name'] for row in rows]
+
+
+def test_long_text_uses_search_index(db):
+    condition, values = db.search_condition('projects', "水道工事", alias="p")
+    assert "MATCH" in condition
+    assert values == ('{title description site_address} : "水道工事"',)
+
+
+def test_short_text_falls_back_to_like(db):
+    condition, values = db.search_condition('projects', "水道", alias="p", columns=('title',))
+    assert condition == "(p.title LIKE ?)"
+    assert values == ("%水道%",)
+
+
+@pytest.mark.parametrize("text", ["水道", "東京", "水道サ", "Tokyo", "tokyo", "ter", "\"引用\"", "OR 記号*", "該当なし"])
+def test_index_and_like_find_same_rows(db, client_ids, text):
+    expected = [name for name in CLIENT_NAMES if text.lower() in name.lower()]
+    assert condition_names(db, text) == expected
+    assert sorted(searched_names(db, text)) == sorted(expected)
+
+    # インデックスが使えない場合も同じ行が見つかる
+    db._search_index_available['clients'] = False
+    assert condition_names(db, text) == expected
+    assert sorted(searched_names(db, text)) == sorted(expected)
+
+
+def test_short_text_ranks_exact_and_prefix_matches_first(db):
+    for name in ["新水道", "水道局", "水道"]:
+        db.insert('clients', {'name': name})
+
+    assert searched_names(db, "水道") == ["水道", "水道局", "新水道"]
+    assert searched_names(db, "水道", limit=2) == ["水道", "水道局"]
+
+
+def test_index_follows_updates_and_deletes(db, client_ids):
+    db.update('clients', {'name': "名古屋設備"}, "id = ?", (client_ids["大阪設備"],))
+    assert searched_names(db, "大阪設備") == []
+    assert searched_names(db, "名古屋") == ["名古屋設備"]
+
+    db.delete('clients', "id = ?", (client_ids["東京水道"],))
+    assert searched_names(db, "東京水") == []
+    assert searched_names(db, "水道サービス") == ["水道サービス東京"]
+
+
+def test_index_follows_bulk_writes(db):
+    with db.transaction():
+        db.insert_many('clients', [{'name': f"一括取引先{index}"} for index in range(5)])
+    db.delete('clients', "name = ?", ("一括取引先3",))
+
+    assert sorted(searched_names(db, "一括取引先")) == [f"一括取引先{index}" for index in (0, 1, 2, 4)]
+
+
+def test_columns_restrict_search(db, master_ids):
+    client_id, service_id = master_ids
+    db.insert('projects', {
+        'client_id': client_id, 'service_id': service_id, 'price': 0,
+        'title': "配管工事", 'site_address': "東京都港区",
+    })
+
+    condition, values = db.search_condition('projects', "東京都", alias="p", columns=('title',))
+    assert db.execute_query(f"SELECT p.id FROM projects p WHERE {condition}", values) == []
+
+    condition, values = db.search_condition('projects', "東京都", alias="p")
+    assert len(db.execute_query(f"SELECT p.id FROM projects p WHERE {condition}", values)) == 1
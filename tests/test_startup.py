@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from startup import StartupProfiler
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_nested_phases_are_reported_in_order(capsys):
+    profiler = StartupProfiler()
+    with profiler.phase("外側"):
+        with profiler.phase("内側"):
+            pass
+    profiler.mark("計測点")
+
+    assert [(name, depth) for name, _, depth in profiler.phases] == [("外側", 0), ("内側", 1), ("計測点", 0)]
+
+    profiler.report()
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[1].startswith("  外側:")
+    assert lines[2].startswith("    内側:")
+    assert lines[-1].startswith("  合計:")
+
+    # 表示後に計測したフェーズ（遅延作成したタブなど）はその都度表示する
+    with profiler.phase("タブ作成"):
+        pass
+    assert capsys.readouterr().out.startswith("起動後の読み込み: タブ作成")
+
+
+def test_lazy_tab_builds_once_on_demand(qapp):
+    from PyQt6.QtWidgets import QLabel
+
+    from components import LazyTab
+
+    built = []
+    tab = LazyTab(lambda: built.append(1) or QLabel("中身"))
+    assert not tab.is_loaded()
+    assert built == []
+
+    widget = tab.widget()
+    assert tab.widget() is widget
+    assert tab.is_loaded()
+    assert built == [1]
+
+
+def test_main_window_import_defers_heavy_modules():
+    pytest.importorskip("PyQt6")
+    code = ("import sys, main_window; "
+            "print(sorted(name for name in ('matplotlib', 'reportlab', 'tabs.statistics_tab') if name in sys.modules))")
+    env = {**os.environ, "QT_QPA_PLATFORM": "offscreen"}
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env,
+                            capture_output=True, text=True, timeout=60)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == "[]"
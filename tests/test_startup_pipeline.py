@@ -0,0 +1,79 @@
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from PyQt6.QtGui import QPixmap
+from PyQt6.QtWidgets import QMessageBox, QSplashScreen
+
+from connection_manager import ConnectionManager
+from main_window import StartupPipeline
+
+
+@pytest.fixture
+def splash(qapp):
+    splash_screen = QSplashScreen(QPixmap(100, 100))
+    splash_screen.show()
+    yield splash_screen
+    splash_screen.close()
+
+
+@pytest.fixture
+def connections(db_path):
+    manager = ConnectionManager(db_path)
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def pipeline(qapp, splash, connections):
+    startup_pipeline = StartupPipeline(splash, connections)
+    startup_pipeline.events = []
+    startup_pipeline.finished.connect(lambda: startup_pipeline.events.append(('finished', splash.isVisible())))
+    startup_pipeline.failed.connect(lambda message: startup_pipeline.events.append(('failed', message)))
+    return startup_pipeline
+
+
+def test_finished_is_emitted_after_every_step(pipeline, splash, connections, wait_until):
+    pipeline.start()
+    wait_until(lambda: pipeline.events)
+
+    # ログイン画面はスプラッシュ画面を表示したまま全段階が終わってから表示する
+    assert pipeline.events == [('finished', True)]
+    assert pipeline._index == len(pipeline.steps)
+    assert splash.message().endswith(f"({len(pipeline.steps)}/{len(pipeline.steps)})")
+    assert connections.database().get_clients() == []
+
+
+def test_failed_step_can_be_retried(pipeline, monkeypatch, wait_until):
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("一時的なエラー")
+
+    pipeline.steps[2] = ("テスト", "テスト", flaky)
+    monkeypatch.setattr(QMessageBox, 'question', lambda *args: QMessageBox.StandardButton.Retry)
+
+    pipeline.start()
+    wait_until(lambda: pipeline.events)
+
+    assert len(attempts) == 2
+    assert pipeline.events == [('finished', True)]
+
+
+def test_canceled_step_stops_pipeline(pipeline, monkeypatch, wait_until):
+    later_steps = []
+
+    def failing():
+        raise RuntimeError("起動できません")
+
+    pipeline.steps[1] = ("テスト", "テスト", failing)
+    pipeline.steps[3] = ("テスト", "テスト", lambda: later_steps.append(1))
+    monkeypatch.setattr(QMessageBox, 'question', lambda *args: QMessageBox.StandardButton.Cancel)
+
+    pipeline.start()
+    wait_until(lambda: pipeline.events)
+
+    assert pipeline.events == [('failed', "起動できません")]
+    assert later_steps == []
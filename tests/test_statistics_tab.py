@@ -0,0 +1,93 @@
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from tabs.statistics_tab import StatisticsTab
+
+
+@pytest.fixture
+def tab(db, query_executor):
+    """各ウィジェットの更新回数を記録する統計タブ"""
+    statistics_tab = StatisticsTab(db, query_executor)
+    statistics_tab.refresh_counts = {widget: 0 for widget in statistics_tab.refreshers}
+
+    def recorder(widget):
+        def refresh():
+            statistics_tab.refresh_counts[widget] += 1
+        return refresh
+
+    for widget in statistics_tab.refreshers:
+        statistics_tab.refreshers[widget] = recorder(widget)
+
+    yield statistics_tab
+    statistics_tab.hide()
+    statistics_tab.deleteLater()
+
+
+def refreshed(tab):
+    return {widget for widget, count in tab.refresh_counts.items() if count}
+
+
+def test_widgets_share_the_executor(tab, query_executor):
+    # ウィジェットごとにスレッドプールを作らず、渡された実行器を使う
+    assert {widget.query_executor for widget in tab.refreshers} == {query_executor}
+
+
+def test_hidden_tab_does_not_refresh(tab):
+    tab.invalidate()
+    assert refreshed(tab) == set()
+    assert tab.stale_widgets == set(tab.refreshers)
+
+
+def test_project_change_keeps_sales_targets(tab):
+    tab.show()
+    tab.stats_tabs.setCurrentWidget(tab.sales_target_widget)
+    assert tab.refresh_counts[tab.sales_target_widget] == 1
+
+    # 案件の変更で売上目標の入力欄を読み直さない（未保存の入力が消えないように）
+    tab.invalidate()
+    assert tab.refresh_counts[tab.sales_target_widget] == 1
+    assert tab.stale_widgets == set(tab.project_widgets)
+
+
+def test_show_refreshes_only_current_widget(tab):
+    tab.show()
+
+    current = tab.stats_tabs.currentWidget()
+    assert refreshed(tab) == {current}
+    assert current not in tab.stale_widgets
+
+    # 要更新でなければ再表示しても更新しない
+    tab.hide()
+    tab.show()
+    assert tab.refresh_counts[current] == 1
+
+
+def test_switching_sub_tab_refreshes_stale_widget_once(tab):
+    tab.show()
+
+    tab.stats_tabs.setCurrentWidget(tab.price_stat_widget)
+    tab.stats_tabs.setCurrentIndex(0)
+    tab.stats_tabs.setCurrentWidget(tab.price_stat_widget)
+    assert tab.refresh_counts[tab.price_stat_widget] == 1
+    assert tab.refresh_counts[tab.trouble_stat_widget] == 0
+
+
+def test_invalidate_while_visible_refreshes_current_widget(tab):
+    tab.show()
+    tab.stats_tabs.setCurrentWidget(tab.price_stat_widget)
+
+    tab.invalidate()
+    assert tab.refresh_counts[tab.price_stat_widget] == 2
+    assert tab.price_stat_widget not in tab.stale_widgets
+    assert tab.service_stat_widget in tab.stale_widgets
+
+
+def test_targets_changed_invalidates_yearly_comparison(tab):
+    tab.show()
+    tab.stats_tabs.setCurrentWidget(tab.yearly_comparison_widget)
+    tab.stats_tabs.setCurrentWidget(tab.sales_target_widget)
+    tab.stale_widgets.clear()
+
+    tab.sales_target_widget.targetsChanged.emit()
+    assert tab.stale_widgets == {tab.yearly_comparison_widget}
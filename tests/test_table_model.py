@@ -0,0 +1,102 @@
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from PyQt6.QtCore import Qt
+
+from components import EnhancedTableView, TableModel
+
+
+def make_pager(rows, page_size):
+    """rows を page_size 件ずつ返すページ取得関数"""
+    def pager(cursor):
+        start = cursor or 0
+        end = start + page_size
+        return rows[start:end], (end if end < len(rows) else None)
+    return pager
+
+
+def column_values(model, column=0):
+    return [model.value(row, column) for row in range(model.rowCount())]
+
+
+
+
+def test_set_rows_publishes_rows_in_batches():
+    model = TableModel(["値"], batch_size=2)
+    model.set_rows([{"値": value} for value in range(5)])
+    assert model.rowCount() == 2
+
+    while model.canFetchMore():
+        model.fetchMore()
+    assert column_values(model) == [0, 1, 2, 3, 4]
+
+
+def test_columns_map_headers_to_keys_or_functions():
+    model = TableModel(["ID", "名前", "金額"])
+    model.set_rows([{'id': 1, 'name': "案件", 'price': 1200}, {'id': 2, 'name': None, 'price': 0}],
+                   columns={"ID": 'id', "名前": 'name', "金額": lambda row: f"{row['price']:,}円"})
+
+    assert model.row_data(0) == {"ID": 1, "名前": "案件", "金額": "1,200円"}
+    # 表示用の文字列は None を空にし、元の値は UserRole で取り出せる
+    assert model.data(model.index(1, 1)) == ""
+    assert model.data(model.index(0, 0)) == "1"
+    assert model.data(model.index(0, 0), Qt.ItemDataRole.UserRole) == 1
+    assert model.headerData(2, Qt.Orientation.Horizontal) == "金額"
+
+
+def test_filter_rows_only_when_fully_loaded():
+    rows = [{"値": value} for value in range(4)]
+    model = TableModel(["値"], batch_size=2)
+    model.set_pager(make_pager(rows, 2))
+    assert not model.filter_rows(lambda row: row["値"] % 2 == 0)
+
+    while model.canFetchMore():
+        model.fetchMore()
+    assert model.filter_rows(lambda row: row["値"] % 2 == 0)
+    assert column_values(model) == [0, 2]
+
+
+def test_view_returns_selected_row_data(qapp):
+    view = EnhancedTableView(["ID", "名前"])
+    view.set_data([{"ID": 1, "名前": "A"}, {"ID": 2, "名前": "B"}])
+    assert view.get_selected_row_data() is None
+
+    view.selectRow(1)
+    assert view.get_selected_row_data() == {"ID": 2, "名前": "B"}
+    assert view.horizontalHeaderLabels() == ["ID", "名前"]
+
+
+def test_pages_are_appended_in_database_order():
+    rows = [{"値": value} for value in (5, 4, 3, 2, 1)]
+    model = TableModel(["値"], batch_size=2)
+    model.set_pager(make_pager(rows, 2))
+    assert column_values(model) == [5, 4]
+
+    # 並び順は問い合わせの ORDER BY で決まり、後のページはそのまま追加される
+    while model.canFetchMore():
+        model.fetchMore()
+    assert column_values(model) == [5, 4, 3, 2, 1]
+    assert model.is_fully_loaded()
+
+
+def test_async_pager_ignores_stale_pages():
+    requests = []
+    model = TableModel(["値"], batch_size=2)
+    model.set_async_pager(lambda cursor, receive: requests.append((cursor, receive)))
+    stale_receive = requests[-1][1]
+
+    # 条件が変わった後に前の条件の結果が届いても捨てる
+    model.set_async_pager(lambda cursor, receive: requests.append((cursor, receive)))
+    stale_receive([{"値": "古い"}], None)
+    assert column_values(model) == []
+
+    requests[-1][1]([{"値": 1}, {"値": 2}], "次")
+    assert column_values(model) == [1, 2]
+    assert model.canFetchMore()
+
+    model.fetchMore()
+    assert requests[-1][0] == "次"
+    requests[-1][1]([{"値": 3}], None)
+    assert column_values(model) == [1, 2, 3]
+    assert model.is_fully_loaded()
@@ -0,0 +1,143 @@
+import os
+
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage
+
+from thumbnail_cache import ThumbnailCache, read_scaled_image
+
+
+def save_image(path, width, height, color=Qt.GlobalColor.red, fmt="PNG"):
+    image = QImage(width, height, QImage.Format.Format_ARGB32)
+    image.fill(color)
+    assert image.save(str(path), fmt)
+    return str(path)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ThumbnailCache(cache_dir=str(tmp_path / "thumbnails"), thumbnail_size=64)
+
+
+def cached_files(cache):
+    return [os.path.join(root, name) for root, _, files in os.walk(cache.cache_dir) for name in files]
+
+
+def test_read_scaled_image_keeps_aspect_ratio(tmp_path):
+    path = save_image(tmp_path / "wide.png", 400, 100)
+
+    image = read_scaled_image(path, 200)
+    assert (image.width(), image.height()) == (200, 50)
+
+    # 指定より小さい画像は拡大しない
+    image = read_scaled_image(path, 1000, 1000)
+    assert (image.width(), image.height()) == (400, 100)
+
+
+def test_read_scaled_image_returns_null_for_unreadable_file(tmp_path):
+    path = tmp_path / "broken.jpg"
+    path.write_bytes(b"not an image")
+    assert read_scaled_image(str(path), 100).isNull()
+    assert read_scaled_image(str(tmp_path / "missing.jpg"), 100).isNull()
+
+
+def test_get_or_create_saves_thumbnail(cache, tmp_path):
+    path = save_image(tmp_path / "photo.png", 300, 150)
+    assert cache.get(path) is None
+
+    image = cache.get_or_create(path)
+    assert (image.width(), image.height()) == (64, 32)
+    assert cached_files(cache) == [cache.thumbnail_path(path)]
+
+    # 2回目は保存済みのサムネイルを読み込む
+    cached = cache.get(path)
+    assert (cached.width(), cached.height()) == (64, 32)
+
+
+def test_replaced_source_changes_cache_key(cache, tmp_path):
+    path = save_image(tmp_path / "photo.png", 300, 150)
+    key = cache.cache_key(path)
+
+    save_image(tmp_path / "photo.png", 100, 300)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert cache.cache_key(path) != key
+    assert cache.get(path) is None
+    assert cache.cache_key(str(tmp_path / "missing.png")) is None
+
+
+def test_transparent_image_is_saved_on_white(cache, tmp_path):
+    path = save_image(tmp_path / "transparent.png", 64, 64, color=Qt.GlobalColor.transparent)
+
+    cache.get_or_create(path)
+    thumbnail = cache.get(path)
+    assert thumbnail.pixelColor(32, 32).lightness() > 250
+
+
+def test_remove_deletes_thumbnail(cache, tmp_path):
+    path = save_image(tmp_path / "photo.png", 100, 100)
+    cache.get_or_create(path)
+
+    cache.remove(path)
+    assert cached_files(cache) == []
+    # 無いサムネイルの削除は何もしない
+    cache.remove(path)
+
+
+def test_total_size_is_counted_once_and_tracked(cache, tmp_path, monkeypatch):
+    paths = [save_image(tmp_path / f"photo{index}.png", 100, 100) for index in range(3)]
+    scans = []
+    scan = cache._scan
+    monkeypatch.setattr(cache, '_scan', lambda: scans.append(1) or scan())
+
+    for path in paths:
+        cache.get_or_create(path)
+    cache.remove(paths[0])
+
+    # ディレクトリを数えるのは最初の1回だけで、以降は作成・削除の度に増減する
+    assert len(scans) == 1
+    assert cache._total_bytes == sum(os.path.getsize(path) for path in cached_files(cache))
+
+
+def test_create_evicts_only_when_limit_is_crossed(cache, tmp_path, monkeypatch):
+    paths = [save_image(tmp_path / f"photo{index}.png", 100, 100, fmt="JPEG") for index in range(4)]
+    cache.get_or_create(paths[0])
+    size = os.path.getsize(cache.thumbnail_path(paths[0]))
+    cache.max_bytes = size * 3
+
+    evictions = []
+    evict = cache.evict
+    monkeypatch.setattr(cache, 'evict', lambda: evictions.append(evict()))
+
+    cache.get_or_create(paths[1])
+    cache.get_or_create(paths[2])
+    assert evictions == []
+
+    # 上限を超えた時に上限の9割まで古いものから削除する
+    cache.get_or_create(paths[3])
+    assert evictions == [2]
+    assert len(cached_files(cache)) == 2
+    assert cache._total_bytes == size * 2
+
+
+def test_evict_removes_least_recently_used(cache, tmp_path):
+    paths = [save_image(tmp_path / f"photo{index}.png", 100, 100, fmt="JPEG") for index in range(4)]
+    for index, path in enumerate(paths):
+        cache.get_or_create(path)
+        os.utime(cache.thumbnail_path(path), (1000 + index, 1000 + index))
+
+    # 最も古い photo0 を使うと、次に古い photo1 から削除される
+    assert cache.get(paths[0]) is not None
+    size = os.path.getsize(cache.thumbnail_path(paths[0]))
+    cache.max_bytes = size * 3
+
+    assert cache.evict() == 2
+    remaining = {path for path in paths if os.path.exists(cache.thumbnail_path(path))}
+    assert remaining == {paths[0], paths[3]}
+
+    # 上限以内であれば削除しない
+    assert cache.evict() == 0
@@ -0,0 +1,77 @@
+import gc
+
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage
+
+from thumbnail_cache import ThumbnailCache, ThumbnailLoader
+
+
+@pytest.fixture
+def image_paths(tmp_path):
+    paths = []
+    for index in range(20):
+        image = QImage(200, 150, QImage.Format.Format_RGB32)
+        image.fill(Qt.GlobalColor.blue)
+        path = str(tmp_path / f"photo{index:02d}.jpg")
+        assert image.save(path, "JPEG")
+        paths.append(path)
+    return paths
+
+
+@pytest.fixture
+def loader(qapp, tmp_path):
+    thumbnail_loader = ThumbnailLoader(ThumbnailCache(cache_dir=str(tmp_path / "thumbnails"), thumbnail_size=64),
+                                       max_threads=2)
+    thumbnail_loader.ready = {}
+    thumbnail_loader.thumbnailReady.connect(
+        lambda path, image: thumbnail_loader.ready.__setitem__(path, image)
+    )
+    yield thumbnail_loader
+    thumbnail_loader.shutdown()
+
+
+def test_request_loads_each_thumbnail_once(loader, image_paths, wait_until):
+    loader.request(image_paths)
+    loader.request(image_paths[:5], ThumbnailLoader.PRIORITY_VISIBLE)
+    wait_until(lambda: not loader._active)
+
+    assert set(loader.ready) == set(image_paths)
+    assert all((image.width(), image.height()) == (64, 48) for image in loader.ready.values())
+    assert not any(loader.is_pending(path) for path in image_paths)
+
+
+def test_unreadable_image_is_reported_as_null(loader, tmp_path, wait_until):
+    missing = str(tmp_path / "missing.jpg")
+    loader.request([missing])
+    wait_until(lambda: not loader._active)
+
+    assert loader.ready[missing].isNull()
+
+
+def test_cancel_queued_keeps_started_tasks_until_finished(loader, image_paths, wait_until):
+    for _ in range(20):
+        loader.request(image_paths)
+        loader.cancel_queued()
+        # 実行中のタスクは通知を受け取るまで参照を保持する
+        assert set(loader._tasks.values()) <= loader._active
+        gc.collect()
+    wait_until(lambda: not loader._active)
+
+    assert not loader._tasks
+    # 取り消されなかった読み込みの結果だけが通知される
+    assert set(loader.ready) <= set(image_paths)
+
+
+def test_cancel_drops_results(loader, image_paths, wait_until):
+    for _ in range(20):
+        loader.request(image_paths)
+        loader.cancel()
+        gc.collect()
+    wait_until(lambda: not loader._active)
+
+    assert not loader._tasks
+    assert loader.ready == {}
@@ -0,0 +1,80 @@
+import sqlite3
+
+import pytest
+
+from models import Database
+
+
+def client_names(db):
+    return [row['name'] for row in db.select('clients', 'name', condition='1 = 1 ORDER BY id')]
+
+
+def test_block_commits_once_at_the_end(db_path, db):
+    other = Database(db_path, init_schema=False)
+    try:
+        with db.transaction():
+            assert db.in_transaction()
+            db.insert('clients', {'name': "取引先A"})
+            db.insert('clients', {'name': "取引先B"})
+            # ブロック内の書き込みは他の接続からはまだ見えない
+            assert client_names(other) == []
+        assert not db.in_transaction()
+        assert client_names(other) == ["取引先A", "取引先B"]
+    finally:
+        other.close()
+
+
+def test_exception_rolls_back_block(db):
+    db.insert('clients', {'name': "既存"})
+
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.insert('clients', {'name': "取り消される"})
+            raise RuntimeError("中断")
+
+    assert client_names(db) == ["既存"]
+    assert not db.in_transaction()
+
+
+def test_failed_write_rolls_back_whole_block(db):
+    with pytest.raises(sqlite3.Error):
+        with db.transaction():
+            db.insert('clients', {'name': "取り消される"})
+            db.insert('clients', {'name': None})
+
+    assert client_names(db) == []
+
+
+def test_nested_block_rolls_back_only_inner_changes(db):
+    with db.transaction():
+        db.insert('clients', {'name': "外側"})
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                db.insert('clients', {'name': "内側"})
+                raise RuntimeError("内側で中断")
+        assert db.in_transaction()
+        db.insert('clients', {'name': "外側2"})
+
+    assert client_names(db) == ["外側", "外側2"]
+
+
+def test_nested_block_commits_with_outer_block(db):
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            with db.transaction():
+                db.insert('clients', {'name': "内側"})
+            raise RuntimeError("外側で中断")
+
+    assert client_names(db) == []
+
+
+def test_block_refuses_pending_implicit_transaction(db):
+    # ブロックの外でコミットされていない変更を勝手にコミットしない
+    db.cursor.execute("INSERT INTO clients (name) VALUES ('未コミット')")
+    with pytest.raises(sqlite3.ProgrammingError):
+        with db.transaction():
+            db.insert('clients', {'name': "実行されない"})
+
+    assert not db.in_transaction()
+    db.conn.rollback()
+    assert client_names(db) == []
@@ -0,0 +1,37 @@
+import datetime
+
+
+def add_orders(db, numbers):
+    db.insert_many('work_orders', [{'order_number': number} for number in numbers])
+
+
+def test_next_order_number_counts_up_within_month(db):
+    year_month = datetime.datetime.now().strftime("%Y%m")
+    assert db.get_next_order_number() == f"{year_month}-0001"
+
+    add_orders(db, [f"{year_month}-0001", f"{year_month}-0007", "200001-0100"])
+    assert db.get_next_order_number() == f"{year_month}-0008"
+
+
+def test_next_order_number_keeps_prefix_semantics(db):
+    year_month = datetime.datetime.now().strftime("%Y%m")
+    # 4桁でない番号も「YYYYMM-」で始まれば LIKE による前方一致と同じく対象にする
+    add_orders(db, [f"{year_month}-0007", f"{year_month}-99999", f"{year_month}0-0500"])
+
+    like = db.execute_query("SELECT MAX(order_number) AS max_number FROM work_orders WHERE order_number LIKE ?",
+                            (f"{year_month}-%",))
+    assert like[0]['max_number'] == f"{year_month}-99999"
+    assert db.get_next_order_number() == f"{year_month}-10000"
+
+
+def test_next_order_number_uses_index(db, monkeypatch):
+    queries = []
+    execute_query = db.execute_query
+    monkeypatch.setattr(db, 'execute_query',
+                        lambda query, values=(): queries.append((query, values)) or execute_query(query, values))
+
+    db.get_next_order_number()
+
+    query, values = queries[-1]
+    plan = " ".join(row[-1] for row in db.conn.execute("EXPLAIN QUERY PLAN " + query, values))
+    assert "idx_work_orders_order_number" in plan
@@ -0,0 +1,41 @@
+import pytest
+
+
+@pytest.fixture
+def sales(db, master_ids):
+    """2025年と2024年の売上と2025年の目標"""
+    client_id, service_id = master_ids
+    rows = [(1000, '2025-01-10'), (500, '2025-01-20'), (700, '2025-12-31'), (300, '2024-01-05'), (900, '2023-06-01')]
+    db.insert_many('projects', [{'client_id': client_id, 'service_id': service_id, 'title': "案件",
+                                 'price': price, 'completion_date': date} for price, date in rows])
+    db.set_sales_targets(2025, {0: 12000.0, 1: 1000.0, 12: 800.0})
+    db.set_sales_targets(2024, {0: 9999.0, 1: 9999.0})
+
+
+def test_comparison_combines_sales_and_targets(db, sales):
+    data = db.get_yearly_comparison(2025, 2024)
+
+    assert data['months'] == [f"{month:02d}" for month in range(1, 13)]
+    assert data['current_data'] == [1500] + [0] * 10 + [700]
+    assert data['compare_data'] == [300] + [0] * 11
+    # 目標は現在年度のもののみ
+    assert data['yearly_target'] == 12000.0
+    assert data['monthly_targets'] == [1000.0] + [0.0] * 10 + [800.0]
+    assert data['monthly_targets'] == [db.get_sales_target(2025, month) for month in range(1, 13)]
+
+
+def test_comparison_is_one_query(db, sales, monkeypatch):
+    queries = []
+    execute_query = db.execute_query
+    monkeypatch.setattr(db, 'execute_query',
+                        lambda query, values=(): queries.append(query) or execute_query(query, values))
+
+    db.get_yearly_comparison(2025, 2023)
+    assert len(queries) == 1
+
+
+def test_comparison_data_keeps_its_shape(db, sales):
+    data = db.get_yearly_comparison_data(2025, 2024)
+
+    assert set(data) == {'months', 'current_year', 'compare_year', 'current_data', 'compare_data'}
+    assert data['current_data'][0] == 1500
@@ -0,0 +1,425 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QImage, QImageIOHandler, QImageReader, QPainter, QPixmap
+
+# サムネイルの保存先
+THUMBNAIL_CACHE_DIR = os.path.join("resources", "thumbnails")
+
+# 保存するサムネイルの長辺（ピクセル、高DPI画面でも粗くならないよう表示サイズより大きくする）
+THUMBNAIL_SIZE = 256
+
+# サムネイルの JPEG 品質
+THUMBNAIL_QUALITY = 85
+
+# キャッシュ全体の上限（バイト）。超えた場合は最も古く使われたサムネイルから削除する
+THUMBNAIL_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+# ビューアーで保持する表示サイズに縮小済みの写真の枚数（表示中と前後の写真）
+PHOTO_IMAGE_CACHE_SIZE = 8
+
+# ビューアーの写真を読み込むスレッド数
+PHOTO_IMAGE_THREADS = 2
+
+
+def read_scaled_image(image_path, max_width, max_height=None):
+    """画像を max_width × max_height 以内に収まるよう縮小しながら読み込む
+
+    QImageReader に縮小後の大きさを指定するため、JPEG などは元の解像度で
+    展開せずに読み込める。max_height を省略した場合は max_width と同じ。
+    読み込めない場合は null の QImage を返す。
+    """
+    if max_height is None:
+        max_height = max_width
+
+    reader = QImageReader(image_path)
+    reader.setAutoTransform(True)
+
+    # 縮小は回転前の画像に対して行われるため、縦横を入れ替えて判定する
+    rotated = bool(reader.transformation() & QImageIOHandler.Transformation.TransformationRotate90)
+    if rotated:
+        max_width, max_height = max_height, max_width
+
+    size = reader.size()
+    if size.isValid() and (size.width() > max_width or size.height() > max_height):
+        reader.setScaledSize(size.scaled(max_width, max_height, Qt.AspectRatioMode.KeepAspectRatio))
+
+    image = reader.read()
+    if image.isNull():
+        print(f"画像読み込みエラー: {image_path} ({reader.errorString()})")
+    return image
+
+
+class ThumbnailCache:
+    """写真のサムネイルをディスクに保存して再利用するキャッシュ
+
+    サムネイルのファイル名は元画像のパス・更新日時・ファイルサイズから求めるため、
+    元画像が置き換えられた場合は自動的に作り直される。サムネイルは写真の表示時に
+    初めて作成する。保存したサムネイルの合計サイズは作成・削除の度に増減して
+    管理し、上限を超えた時だけ最も古く使われたものから削除する。
+    """
+
+    def __init__(self, cache_dir=THUMBNAIL_CACHE_DIR, max_bytes=THUMBNAIL_CACHE_MAX_BYTES,
+                 thumbnail_size=THUMBNAIL_SIZE):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.thumbnail_size = thumbnail_size
+        self._lock = threading.Lock()
+        # 保存済みサムネイルの合計サイズ（バイト。初めて必要になった時に1度だけ数える）
+        self._total_bytes = None
+
+    def cache_key(self, image_path):
+        """元画像のパス・更新日時・サイズからキャッシュキーを求める（元画像が無い場合は None）"""
+        try:
+            stat = os.stat(image_path)
+        except OSError:
+            return None
+
+        source = f"{os.path.abspath(image_path)}|{stat.st_mtime_ns}|{stat.st_size}|{self.thumbnail_size}"
+        return hashlib.sha1(source.encode('utf-8')).hexdigest()
+
+    def thumbnail_path(self, image_path):
+        """サムネイルの保存先パスを取得する（元画像が無い場合は None）"""
+        key = self.cache_key(image_path)
+        if key is None:
+            return None
+        return os.path.join(self.cache_dir, key[:2], f"{key}.jpg")
+
+    def get(self, image_path):
+        """保存済みのサムネイルを取得する（無い場合は None）"""
+        path = self.thumbnail_path(image_path)
+        if path is None or not os.path.exists(path):
+            return None
+
+        image = QImage(path)
+        if image.isNull():
+            return None
+
+        # 最近使われたサムネイルとして更新日時を進める（削除の順番に使う）
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return image
+
+    def create(self, image_path):
+        """元画像からサムネイルを作成して保存する（作成できない場合は None）"""
+        path = self.thumbnail_path(image_path)
+        if path is None:
+            return None
+
+        image = read_scaled_image(image_path, self.thumbnail_size)
+        if image.isNull():
+            return None
+
+        # 透過部分を白にして JPEG で保存する
+        if image.hasAlphaChannel():
+            background = QImage(image.size(), QImage.Format.Format_RGB32)
+            background.fill(Qt.GlobalColor.white)
+            painter = QPainter(background)
+            painter.drawImage(0, 0, image)
+            painter.end()
+            image = background
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        if image.save(temp_path, "JPEG", THUMBNAIL_QUALITY):
+            try:
+                # 同じサムネイルを別のスレッドが先に保存していた場合は差分だけ増やす
+                old_size = os.path.getsize(path) if os.path.exists(path) else 0
+                os.replace(temp_path, path)
+                self._add_bytes(os.path.getsize(path) - old_size)
+            except OSError as e:
+                print(f"サムネイル保存エラー: {e}")
+        else:
+            print(f"サムネイル保存エラー: {path}")
+        return image
+
+    def get_or_create(self, image_path):
+        """サムネイルを取得する（無い場合は作成する）"""
+        image = self.get(image_path)
+        if image is None:
+            image = self.create(image_path)
+        return image
+
+    def remove(self, image_path):
+        """写真のサムネイルを削除する（元画像を削除する前に呼び出す）"""
+        path = self.thumbnail_path(image_path)
+        if path is not None and os.path.exists(path):
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+                self._add_bytes(-size)
+            except OSError as e:
+                print(f"サムネイル削除エラー: {e}")
+
+    def _scan(self):
+        """保存済みのサムネイルを (更新日時, サイズ, パス) のリストで取得する"""
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _add_bytes(self, size):
+        """合計サイズを増減し、上限を超えた場合は古く使われたサムネイルを削除する"""
+        with self._lock:
+            if self._total_bytes is None:
+                # 初回はディレクトリを数える（保存・削除したばかりのファイルも反映される）
+                self._total_bytes = sum(entry[1] for entry in self._scan())
+            else:
+                self._total_bytes += size
+            over_limit = self._total_bytes > self.max_bytes
+
+        if over_limit:
+            self.evict()
+
+    def evict(self):
+        """合計サイズが上限を超えている場合、古く使われたサムネイルから削除する
+
+        Returns:
+            削除したサムネイルの数
+        """
+        with self._lock:
+            entries = self._scan()
+            total = sum(entry[1] for entry in entries)
+            self._total_bytes = total
+
+            if total <= self.max_bytes:
+                return 0
+
+            # 削除を繰り返さないよう、上限の9割まで減らす
+            target = self.max_bytes * 0.9
+            removed = 0
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+
+            self._total_bytes = total
+            return removed
+
+
+# アプリケーション全体で共有するサムネイルキャッシュ
+thumbnail_cache = ThumbnailCache()
+
+
+class _ImageTask(QRunnable):
+    """スレッドプール上で1枚の画像を読み込むタスク
+
+    プールには削除させず、読み込みクラスが終了の通知を GUI スレッドで
+    受け取るまで参照を保持する（実行中に Python 側で破棄されないように）。
+    取り消されたタスクも、読み込みを行わずに終了を通知する。
+    """
+
+    def __init__(self, loader, key, image_path):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.loader = loader
+        self.key = key
+        self.image_path = image_path
+        self.canceled = False
+
+    def run(self):
+        image = None
+        if not self.canceled:
+            image = self.loader.load(self)
+        try:
+            self.loader._task_finished.emit(self, image if image is not None else QImage())
+        except RuntimeError:
+            # 読み込み中にダイアログと一緒に読み込みクラスが破棄された
+            pass
+
+
+class _ImageTaskLoader(QObject):
+    """画像の読み込みをキーごとに1つのタスクにしてスレッドプールで実行する基底クラス
+
+    予約・取り消し・終了の処理はすべて GUI スレッドで行う。サブクラスは
+    load()（ワーカースレッドでの読み込み）と finish()（GUI スレッドでの
+    結果の受け取り）を実装する。
+    """
+
+    # (タスク, 画像) - ワーカースレッドから発行される
+    _task_finished = pyqtSignal(object, QImage)
+
+    def __init__(self, max_threads=None, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        if max_threads:
+            self.pool.setMaxThreadCount(max_threads)
+
+        self._tasks = {}  # キー -> 読み込み中・待ち行列のタスク
+        self._active = set()  # プールに渡して終了の通知をまだ受け取っていないタスク
+
+        self._task_finished.connect(self._on_task_finished)
+
+    def load(self, task):
+        """ワーカースレッドで画像を読み込む（読み込めない場合は None または null の QImage）"""
+        raise NotImplementedError
+
+    def finish(self, task, image):
+        """取り消されていないタスクの結果を GUI スレッドで受け取る"""
+        raise NotImplementedError
+
+    def cancel_queued(self):
+        """まだ読み込みを始めていない予約を取り消す（読み込み中のものは通知する）"""
+        for key, task in list(self._tasks.items()):
+            if self._take(task):
+                del self._tasks[key]
+
+    def cancel(self):
+        """予約済みの読み込みを取り消す（読み込み中のものの結果も通知しない）"""
+        for task in self._tasks.values():
+            task.canceled = True
+            self._take(task)
+        self._tasks.clear()
+
+    def shutdown(self):
+        """予約済みの読み込みを取り消し、読み込み中のものが終わるのを待つ"""
+        self.cancel()
+        self.pool.waitForDone()
+
+    def is_pending(self, key):
+        """読み込み中・予約済みかどうか"""
+        return key in self._tasks
+
+    def _start(self, key, image_path, priority):
+        """読み込みを予約する（読み込み中・予約済みのものは無視する）"""
+        if key in self._tasks:
+            return
+        task = _ImageTask(self, key, image_path)
+        self._tasks[key] = task
+        self._active.add(task)
+        self.pool.start(task, priority)
+
+    def _take(self, task):
+        """待ち行列からタスクを取り除く（既にスレッドが実行を始めていれば False）
+
+        実行を始めたタスクは、終了の通知を受け取るまで参照を保持する。
+        """
+        if not self.pool.tryTake(task):
+            return False
+        self._active.discard(task)
+        return True
+
+    def _on_task_finished(self, task, image):
+        """タスクの終了を GUI スレッドで受け取る"""
+        self._active.discard(task)
+        if self._tasks.get(task.key) is task:
+            del self._tasks[task.key]
+        if task.canceled:
+            return
+        self.finish(task, image)
+
+
+class ThumbnailLoader(_ImageTaskLoader):
+    """サムネイルをバックグラウンドのスレッドプールで並列に読み込むクラス
+
+    読み込み終わったサムネイルから thumbnailReady で GUI スレッドに通知する。
+    表示中の範囲のサムネイルは優先度を上げて先に読み込む。
+    スクロールで表示範囲から外れた写真の予約は cancel_queued() で取り消し、
+    新しく表示された写真の読み込みが後回しにならないようにする。
+    """
+
+    # (元画像のパス, サムネイル) - 読み込めなかった場合は null の QImage
+    thumbnailReady = pyqtSignal(str, QImage)
+
+    # 表示中の範囲のサムネイルの優先度
+    PRIORITY_VISIBLE = 10
+    PRIORITY_NORMAL = 0
+
+    def __init__(self, cache=None, max_threads=None, parent=None):
+        super().__init__(max_threads, parent)
+        self.cache = cache or thumbnail_cache
+
+    def request(self, image_paths, priority=PRIORITY_NORMAL):
+        """サムネイルの読み込みを予約する（読み込み中・予約済みのものは無視する）"""
+        for image_path in image_paths:
+            self._start(image_path, image_path, priority)
+
+    def load(self, task):
+        return self.cache.get_or_create(task.image_path)
+
+    def finish(self, task, image):
+        self.thumbnailReady.emit(task.image_path, image)
+
+
+class PhotoImageLoader(_ImageTaskLoader):
+    """ビューアーに表示する写真を表示サイズで読み込み、前後の写真を先読みするクラス
+
+    写真は QImageReader で表示サイズに縮小しながらバックグラウンドで読み込み、
+    読み込んだ画像は (パス, 幅, 高さ) をキーとした LRU に保持する。
+    キャッシュと予約の管理は GUI スレッドからのみ行う。
+    """
+
+    # (元画像のパス, 画像) - 読み込めなかった場合は null の QPixmap
+    imageReady = pyqtSignal(str, QPixmap)
+
+    # 表示する写真と先読みする写真の優先度
+    PRIORITY_CURRENT = 10
+    PRIORITY_PREFETCH = 0
+
+    def __init__(self, max_images=PHOTO_IMAGE_CACHE_SIZE, max_threads=PHOTO_IMAGE_THREADS, parent=None):
+        super().__init__(max_threads, parent)
+        self.max_images = max_images
+        self._images = OrderedDict()  # (パス, 幅, 高さ) -> QPixmap
+
+    def get(self, image_path, width, height):
+        """読み込み済みの画像を取得する（無い場合は None）"""
+        key = (image_path, width, height)
+        pixmap = self._images.get(key)
+        if pixmap is not None:
+            self._images.move_to_end(key)
+        return pixmap
+
+    def request(self, image_path, width, height, prefetch_paths=()):
+        """写真の読み込みと前後の写真の先読みを予約する
+
+        前回の要求で待ち行列に残っている読み込みは取り消すため、
+        連続して写真を切り替えても表示する写真が後回しにならない。
+        """
+        self.cancel_queued()
+        self._start_image(image_path, width, height, self.PRIORITY_CURRENT)
+        for path in prefetch_paths:
+            self._start_image(path, width, height, self.PRIORITY_PREFETCH)
+
+    def remove(self, image_path):
+        """写真の読み込み済み画像を破棄する（写真を削除した時に使用）"""
+        for key in [key for key in self._images if key[0] == image_path]:
+            del self._images[key]
+
+    def _start_image(self, image_path, width, height, priority):
+        key = (image_path, width, height)
+        if key not in self._images:
+            self._start(key, image_path, priority)
+
+    def load(self, task):
+        _, width, height = task.key
+        image = read_scaled_image(task.image_path, width, height)
+        if not image.isNull() and image.width() < width and image.height() < height:
+            # 表示サイズより小さい画像は従来どおり拡大して表示する
+            image = image.scaled(width, height,
+                                 Qt.AspectRatioMode.KeepAspectRatio,
+                                 Qt.TransformationMode.SmoothTransformation)
+        return image
+
+    def finish(self, task, image):
+        pixmap = QPixmap.fromImage(image)
+        if not pixmap.isNull():
+            self._images[task.key] = pixmap
+            while len(self._images) > self.max_images:
+                self._images.popitem(last=False)
+        self.imageReady.emit(task.image_path, pixmap)